@@ -73,23 +73,33 @@ def restore():
     from kioku.pipeline.keyword_writer import KeywordIndex
     keyword_index = KeywordIndex(fts_db)
     
-    for md_file in md_files:
-        date_str = md_file.stem
-        entries = read_entries(target_memory_dir, date=date_str)
+    entries_by_date = {
+        md_file.stem: read_entries(target_memory_dir, date=md_file.stem) for md_file in md_files
+    }
+
+    # Index to SQLite Full-text search in one transaction
+    ids = keyword_index.index_many(
+        (
+            {
+                "content": e.text,
+                "date": date_str,
+                "timestamp": e.timestamp,
+                "mood": e.mood,
+                "tags": e.tags,
+                "content_hash": hashlib.sha256(e.text.encode()).hexdigest(),
+            }
+            for date_str, entries in entries_by_date.items()
+            for e in entries
+        ),
+        defer_fts=True,
+    )
+    print(f"SQLite: indexed {sum(i != -1 for i in ids)} entries, skipped {ids.count(-1)} duplicates")
+
+    for date_str, entries in entries_by_date.items():
         print(f"Re-indexing {len(entries)} entries for date {date_str}...")
         
         for idx, e in enumerate(entries):
             print(f"  -> Processing entry {idx+1}/{len(entries)}")
-            content_hash = hashlib.sha256(e.text.encode()).hexdigest()
-            
-            # Index to SQLite Full-text search
-            keyword_index.index(
-                content=e.text,
-                date=date_str,
-                timestamp=e.timestamp,
-                mood=e.mood,
-                content_hash=content_hash
-            )
             
             # Index to ChromaDB Vector Store
             svc.vector_store.add(
@@ -68,17 +68,19 @@ from kioku.pipeline.keyword_writer import KeywordIndex
 keyword_index = KeywordIndex(fts_db)
 
 print("Starting background re-indexing into DBs (this will hit LLM for extraction)...")
+keyword_index.index_many(
+    {
+        "content": e.text,
+        "date": date,
+        "timestamp": e.timestamp,
+        "mood": e.mood,
+        "content_hash": hashlib.sha256(e.text.encode()).hexdigest(),
+    }
+    for e in good_entries
+)
+
 for idx, e in enumerate(good_entries):
     print(f"Reindexing {idx+1}/{len(good_entries)}...")
-    content_hash = hashlib.sha256(e.text.encode()).hexdigest()
-    
-    keyword_index.index(
-        content=e.text,
-        date=date,
-        timestamp=e.timestamp,
-        mood=e.mood,
-        content_hash=content_hash
-    )
     
     vector_store.add(
         content=e.text,
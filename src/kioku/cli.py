@@ -17,6 +17,8 @@ except ImportError:
         "Typer is required to run the CLI. Install it with: pip install kioku-agent-kit[cli]"
     )
 
+from kioku.search.output import to_json
+
 app = typer.Typer(
     name="kioku",
     help="Personal memory agent — save and search your life memories with tri-hybrid search.",
@@ -37,10 +39,15 @@ def _get_svc():
     return _svc
 
 
-def _output(data: dict | str) -> None:
-    """Print JSON output to stdout (ensure_ascii=False for Vietnamese)."""
+def _output(data: dict | str, compact: bool = False) -> None:
+    """Print JSON output to stdout (ensure_ascii=False for Vietnamese).
+
+    `compact` prints the serialization `--max-bytes` is measured on.
+    """
     if isinstance(data, str):
         typer.echo(data)
+    elif compact:
+        typer.echo(to_json(data))
     else:
         typer.echo(json.dumps(data, ensure_ascii=False, indent=2))
 
@@ -68,12 +75,80 @@ def search(
     date_from: Optional[str] = typer.Option(None, "--from", help="Start date filter (YYYY-MM-DD)."),
     date_to: Optional[str] = typer.Option(None, "--to", help="End date filter (YYYY-MM-DD)."),
     entities: Optional[str] = typer.Option(None, "--entities", "-e", help="Comma-separated entity names for KG search (e.g. 'Mẹ,Hùng')."),
+    deadline_ms: Optional[int] = typer.Option(None, "--deadline-ms", help="Latency budget in ms; slower stages are skipped once it is spent."),
+    detail: str = typer.Option("full", "--detail", help="Output detail: 'full', 'snippet' or 'ids'."),
+    fields: Optional[str] = typer.Option(None, "--fields", help="Comma-separated result keys to keep (e.g. 'content,date')."),
+    max_bytes: Optional[int] = typer.Option(None, "--max-bytes", help="Cap on response size; lower-ranked items are dropped."),
+    pages: int = typer.Option(1, "--pages", help="Return this many pages of --limit results, paged from one search."),
+    tags: Optional[str] = typer.Option(None, "--tags", "-t", help="Comma-separated tags; only memories with any of them."),
+    mood: Optional[str] = typer.Option(None, "--mood", "-m", help="Only memories with this mood."),
 ) -> None:
     """Search through all saved memories using tri-hybrid search (BM25 + Vector + KG)."""
     entity_list = [e.strip() for e in entities.split(",")] if entities else None
-    result = _get_svc().search_memories(query, limit=limit, date_from=date_from, date_to=date_to, entities=entity_list)
+    field_list = [f.strip() for f in fields.split(",")] if fields else None
+    tag_list = [t.strip() for t in tags.split(",")] if tags else None
+    svc = _get_svc()
+    kwargs = {
+        "limit": limit,
+        "date_from": date_from,
+        "date_to": date_to,
+        "entities": entity_list,
+        "deadline_ms": deadline_ms,
+        "detail": detail,
+        "fields": field_list,
+        "max_bytes": max_bytes,
+        "tags": tag_list,
+        "mood": mood,
+    }
+    compact = max_bytes is not None
+    if pages <= 1:
+        _output(svc.search_memories(query, **kwargs), compact=compact)
+        return
+
+    # Cursors live in this process, so the CLI walks the pages itself
+    results = [svc.search_memories(query, paginate=True, **kwargs)]
+    while len(results) < pages and results[-1]["next_cursor"]:
+        results.append(svc.search_memories(query, cursor=results[-1]["next_cursor"], **kwargs))
+    _output({"query": query, "pages": results}, compact=compact)
+
+
+@app.command("resolve-search")
+def resolve_search(
+    query: str = typer.Argument(..., help="The question to answer."),
+    limit: int = typer.Option(10, "--limit", "-l", help="Max results to return."),
+    date_from: Optional[str] = typer.Option(None, "--from", help="Start date filter (YYYY-MM-DD)."),
+    date_to: Optional[str] = typer.Option(None, "--to", help="End date filter (YYYY-MM-DD)."),
+    deadline_ms: Optional[int] = typer.Option(None, "--deadline-ms", help="Latency budget in ms; slower stages are skipped once it is spent."),
+    detail: str = typer.Option("full", "--detail", help="Output detail: 'full', 'snippet' or 'ids'."),
+    max_bytes: Optional[int] = typer.Option(None, "--max-bytes", help="Cap on response size; lower-ranked items are dropped."),
+) -> None:
+    """Resolve the entities in a question and search for them in one step."""
+    result = _get_svc().resolve_and_search(
+        query,
+        limit=limit,
+        date_from=date_from,
+        date_to=date_to,
+        deadline_ms=deadline_ms,
+        detail=detail,
+        max_bytes=max_bytes,
+    )
+    _output(result, compact=max_bytes is not None)
+
+
+@app.command("search-many")
+def search_many(
+    queries: list[str] = typer.Argument(..., help="Queries to search for, run as one batch."),
+    limit: int = typer.Option(10, "--limit", "-l", help="Max results per query."),
+    date_from: Optional[str] = typer.Option(None, "--from", help="Start date filter (YYYY-MM-DD)."),
+    date_to: Optional[str] = typer.Option(None, "--to", help="End date filter (YYYY-MM-DD)."),
+) -> None:
+    """Run several searches at once with a shared embedding batch and hydration."""
+    result = _get_svc().search_memories_many(
+        queries, limit=limit, date_from=date_from, date_to=date_to
+    )
     _output(result)
 
+
 @app.command()
 def entities(
     limit: int = typer.Option(50, "--limit", "-l", help="Max entities to return."),
@@ -94,14 +169,41 @@ def timeline(
         "-s",
         help="Sort by 'processing_time' (default) or 'event_time'.",
     ),
+    cursor: Optional[str] = typer.Option(None, "--cursor", help="next_cursor from a previous page (older entries)."),
+    ndjson: bool = typer.Option(False, "--ndjson", help="Stream every entry in the range as NDJSON, oldest first (ignores --limit)."),
+    tags: Optional[str] = typer.Option(None, "--tags", "-t", help="Comma-separated tags; only memories with any of them."),
+    mood: Optional[str] = typer.Option(None, "--mood", "-m", help="Only memories with this mood."),
 ) -> None:
     """Get a chronologically ordered sequence of memories."""
-    result = _get_svc().get_timeline(
-        start_date=start_date, end_date=end_date, limit=limit, sort_by=sort_by
+    svc = _get_svc()
+    filters = {"tags": [t.strip() for t in tags.split(",")] if tags else None, "mood": mood}
+    if ndjson:
+        for entry in svc.iter_timeline(
+            start_date=start_date, end_date=end_date, sort_by=sort_by, **filters
+        ):
+            typer.echo(json.dumps(entry, ensure_ascii=False))
+        return
+    result = svc.get_timeline(
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        sort_by=sort_by,
+        cursor=cursor,
+        **filters,
     )
     _output(result)
 
 
+@app.command()
+def facets(
+    start_date: Optional[str] = typer.Option(None, "--from", help="Start date (YYYY-MM-DD)."),
+    end_date: Optional[str] = typer.Option(None, "--to", help="End date (YYYY-MM-DD)."),
+    limit: int = typer.Option(50, "--limit", "-l", help="Max values per facet."),
+) -> None:
+    """Count memories per tag and per mood."""
+    _output(_get_svc().get_facets(start_date=start_date, end_date=end_date, limit=limit))
+
+
 @app.command()
 def setup(
     user_id: Optional[str] = typer.Option(
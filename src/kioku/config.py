@@ -23,6 +23,8 @@ class Settings(BaseSettings):
     def sqlite_path(self) -> Path:
         return Path(str(self.data_dir)) / "kioku_fts.db"
 
+    sqlite_read_connections: int = 4  # read-only connections pooled next to the single writer
+
     @property
     def chroma_collection(self) -> str:
         return "memories" if self.user_id == "default" else f"memories_{self.user_id}"
@@ -40,6 +42,8 @@ class Settings(BaseSettings):
     # FalkorDB (Phase 3)
     falkordb_host: str = "localhost"
     falkordb_port: int = 6379
+    # Seconds before the in-process canonical entity snapshot is re-scanned from the graph
+    entity_snapshot_ttl: float = 300.0
 
     # Ollama (Phase 2)
     ollama_host: str = "http://localhost:11434"
@@ -52,6 +56,53 @@ class Settings(BaseSettings):
     # e.g. "Nguyễn Trọng Phúc, also known as phuc-nt, anh"
     user_identity: str = ""
 
+    # Search fan-out — BM25, vector and graph legs run concurrently.
+    # Each leg has its own timeout (seconds); a slow or failed leg is dropped.
+    search_workers: int = 8
+    search_timeout_bm25: float = 2.0
+    search_timeout_vector: float = 5.0
+    search_timeout_graph: float = 5.0
+    # Start the query-text BM25 and vector legs while query entities are still being resolved
+    search_speculative: bool = True
+
+    # Weighted RRF fusion of the legs (weight 0 drops a leg from the ranking)
+    search_rrf_k: int = 60
+    search_weight_bm25: float = 1.0
+    search_weight_vector: float = 1.0
+    search_weight_graph: float = 1.0
+
+    # Adaptive router: run BM25 first and skip the vector/graph legs for decisive keyword
+    # lookups (top-two BM25 score margin ≥ search_router_margin) and the graph leg for
+    # temporal queries. Off by default until tuned against the benchmark set.
+    search_router: bool = False
+    search_router_margin: float = 0.5
+
+    # Query entity resolution: "hybrid" (local dictionary match, LLM fallback), "local", or "llm"
+    query_entity_mode: str = "hybrid"
+    query_entity_vocab_size: int = 1000  # canonical entities loaded into the local matcher
+
+    # Cache for LLM query → entity extraction (LRU + TTL seconds; size 0 disables)
+    query_entity_cache_size: int = 512
+    query_entity_cache_ttl: float = 600.0
+
+    # Opt-in search_memories response cache (size 0 = off). Entries are keyed on the
+    # SQLite write generation, so any save — from this process or the CLI — invalidates them.
+    search_cache_size: int = 0
+    search_cache_ttl: float = 300.0
+
+    # Paged search: the first page fuses up to search_page_pool candidates and keeps
+    # the ranking under an opaque cursor; later pages are sliced from it
+    search_page_pool: int = 50
+    search_cursor_cache_size: int = 256
+    search_cursor_ttl: float = 600.0
+
+    # Length of memory bodies in detail="snippet" search responses
+    search_snippet_chars: int = 200
+
+    # The BM25 leg reads an FTS5 snippet() of this many tokens per hit instead of the
+    # whole body; full text is hydrated for the final top-k only (0 = read full bodies)
+    search_bm25_snippet_tokens: int = 32
+
     model_config = {"env_prefix": "KIOKU_", "env_file": ".env", "extra": "ignore"}
 
     def model_post_init(self, __context) -> None:
@@ -11,6 +11,8 @@ class EmbeddingProvider(Protocol):
 
     def embed(self, text: str) -> list[float]: ...
 
+    def embed_batch(self, texts: list[str]) -> list[list[float]]: ...
+
 
 class OllamaEmbedder:
     """Ollama-based local embedding provider."""
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Protocol
 from dataclasses import dataclass, field
@@ -34,6 +36,7 @@ class GraphEdge:
     weight: float = 0.5
     evidence: str = ""
     source_hash: str = ""  # content_hash linking back to SQLite for O(1) hydration
+    event_time: str = ""  # YYYY-MM-DD — when the evidenced event happened
 
 
 @dataclass
@@ -48,25 +51,160 @@ class GraphSearchResult:
 class GraphStore(Protocol):
     """Protocol for graph stores."""
 
+    # Bumped whenever the canonical entity set may have changed (cache version stamp)
+    version: int
+
     def upsert(
         self, extraction: ExtractionResult, date: str, timestamp: str, source_hash: str = ""
     ) -> None: ...
     def search_entities(self, query: str, limit: int = 10) -> list[GraphNode]: ...
+    def search_entities_many(
+        self, terms: list[str], limit: int = 10
+    ) -> dict[str, list[GraphNode]]: ...
     def traverse(
-        self, entity_name: str, max_hops: int = 2, limit: int = 20
+        self,
+        entity_name: str,
+        max_hops: int = 2,
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
     ) -> GraphSearchResult: ...
+    def traverse_many(
+        self,
+        seeds: list[str],
+        max_hops: int = 2,
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> dict[str, GraphSearchResult]: ...
     def find_path(self, source: str, target: str) -> GraphSearchResult: ...
-    def get_canonical_entities(self, limit: int = 50) -> list[str]: ...
+    def get_canonical_entities(self, limit: int = 50) -> list[dict]: ...
+    def merge_entity_aliases(self, canonical: str, aliases: list[str]) -> None: ...
+
+
+def _rank_entity_match(node: GraphNode, query: str) -> tuple:
+    """Sort key for entity-name matches: exact, then word-boundary, then substring.
+
+    Ties are broken by mention_count (descending).
+    """
+    q_lower = query.lower()
+    q_is_single_word = " " not in q_lower.strip()
+    name_lower = node.name.lower()
+    if name_lower == q_lower:
+        priority = 0  # exact match
+    elif name_lower.startswith(q_lower + " ") or (
+        not q_is_single_word and name_lower.endswith(" " + q_lower)
+    ):
+        # For single-word queries, ends-with is weaker (e.g. "Nhật" in "Sinh nhật")
+        priority = 1
+    elif q_lower + " " in name_lower or " " + q_lower in name_lower:
+        priority = 2  # query is a whole word within a longer name
+    elif q_is_single_word and name_lower.endswith(" " + q_lower):
+        priority = 2  # single-word ends-with: deprioritize ("Sinh nhật" for "Nhật")
+    else:
+        priority = 3  # pure substring (lowest)
+    return (priority, -node.mention_count)
+
+
+class CanonicalEntitySnapshot:
+    """In-process copy of the canonical entity list (name, type, mentions, aliases).
+
+    Loaded once from a full graph scan, then kept current by write-through
+    updates from `upsert` and `merge_entity_aliases`, so reads no longer scan
+    the graph. The ranked view is recomputed only after a write.
+    """
+
+    def __init__(self) -> None:
+        # Keyed on the exact name: MERGE (e:Entity {name: $name}) is case-sensitive,
+        # so "Hùng" and "hùng" are separate graph nodes
+        self._entities: dict[str, dict] = {}  # name → row
+        self._ranked: list[dict] | None = None
+        self._lock = threading.Lock()
+        self.loaded_at: float | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def load(self, rows: list[dict]) -> bool:
+        """Replace the snapshot with `rows` from a full scan. Returns True if it changed."""
+        with self._lock:
+            entities = {
+                r["name"]: {
+                    "name": r["name"],
+                    "type": r.get("type", "") or "",
+                    "mentions": r.get("mentions", 0) or 0,
+                    "aliases": list(r.get("aliases", [])),
+                }
+                for r in rows
+                if r.get("name")
+            }
+            changed = entities != self._entities
+            self._entities = entities
+            self._ranked = None
+            self.loaded_at = time.monotonic()
+            return changed
+
+    def _ensure(self, name: str, type_: str, mentions: int = 0) -> dict:
+        row = self._entities.get(name)
+        if row is None:
+            row = {"name": name, "type": type_, "mentions": mentions, "aliases": []}
+            self._entities[name] = row
+        return row
+
+    def apply_extraction(self, extraction: ExtractionResult) -> None:
+        """Mirror an upsert: new entities start at 1 mention, existing ones +1."""
+        if not extraction.entities:
+            return
+        with self._lock:
+            for entity in extraction.entities:
+                if entity.name in self._entities:
+                    self._entities[entity.name]["mentions"] += 1
+                else:
+                    self._ensure(entity.name, entity.type, mentions=1)
+            self._ranked = None
+
+    def apply_aliases(self, canonical: str, aliases: list[str]) -> None:
+        """Mirror merge_entity_aliases: ensure nodes exist and record alias → canonical."""
+        with self._lock:
+            row = self._ensure(canonical, "PERSON")
+            for alias in aliases:
+                if alias == canonical:
+                    continue
+                self._ensure(alias, "PERSON")
+                if alias not in row["aliases"]:
+                    row["aliases"].append(alias)
+            self._ranked = None
+
+    def top(self, limit: int = 50) -> list[dict]:
+        """Top entities by mention count (copies — callers may mutate them)."""
+        with self._lock:
+            if self._ranked is None:
+                self._ranked = sorted(
+                    self._entities.values(), key=lambda r: r["mentions"], reverse=True
+                )
+            return [{**r, "aliases": list(r["aliases"])} for r in self._ranked[:limit]]
 
 
 class FalkorGraphStore:
     """FalkorDB-backed knowledge graph store."""
 
-    def __init__(self, host: str = "localhost", port: int = 6379, graph_name: str = "kioku"):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        graph_name: str = "kioku",
+        snapshot_ttl: float = 300.0,
+    ):
         self.host = host
         self.port = port
         self.graph_name = graph_name
         self._graph = None
+        self.version = 0
+        # Canonical entity snapshot; re-scanned after `snapshot_ttl` seconds to pick up
+        # writes from other processes (e.g. a CLI save while the MCP server runs)
+        self._snapshot = CanonicalEntitySnapshot()
+        self.snapshot_ttl = snapshot_ttl
 
     @property
     def graph(self):
@@ -109,6 +247,9 @@ class FalkorGraphStore:
                                 e.mention_count = e.mention_count + 1""",
                 {"name": entity.name, "type": entity.type, "date": date},
             )
+        if extraction.entities:
+            self._snapshot.apply_extraction(extraction)
+            self.version += 1
 
         for rel in extraction.relationships:
             self.graph.query(
@@ -138,15 +279,24 @@ class FalkorGraphStore:
 
         Returns list of {"name": ..., "type": ..., "mentions": ..., "aliases": [...]} ordered by mention_count desc.
         Includes SAME_AS aliases so LLM can map synonyms to canonical names.
+
+        Served from the in-process snapshot; the graph is only scanned on first
+        use and when the snapshot is older than `snapshot_ttl`.
         """
+        snap = self._snapshot
+        stale = not snap.loaded or time.monotonic() - snap.loaded_at > self.snapshot_ttl
+        if stale and snap.load(self._scan_canonical_entities()):
+            self.version += 1
+        return snap.top(limit)
+
+    def _scan_canonical_entities(self) -> list[dict]:
+        """Full scan of all entities with their SAME_AS aliases."""
         result = self.graph.query(
             """MATCH (e:Entity)
                OPTIONAL MATCH (alias:Entity)-[:SAME_AS]->(e)
                WITH e, collect(alias.name) AS aliases
                RETURN e.name, e.type, e.mention_count, aliases
-               ORDER BY e.mention_count DESC
-               LIMIT $limit""",
-            {"limit": limit},
+               ORDER BY e.mention_count DESC"""
         )
         return [
             {
@@ -206,6 +356,8 @@ class FalkorGraphStore:
                    MERGE (alias)-[:SAME_AS]->(canon)""",
                 {"alias": alias, "canonical": canonical},
             )
+        self._snapshot.apply_aliases(canonical, aliases)
+        self.version += 1
         log.info("Linked aliases %s → canonical '%s'", aliases, canonical)
 
     def search_entities(self, query: str, limit: int = 10) -> list[GraphNode]:
@@ -218,84 +370,143 @@ class FalkorGraphStore:
 
         This prevents "Nhật" from matching "sinh nhật" ahead of "Nhật Bản".
         """
+        return self.search_entities_many([query], limit=limit)[query]
+
+    def search_entities_many(self, terms: list[str], limit: int = 10) -> dict[str, list[GraphNode]]:
+        """Resolve several search terms in one query (a single pass over Entity nodes).
+
+        Each term gets the same candidate fetch (limit * 3 by mention_count) and
+        exact/word-boundary re-ranking as `search_entities`.
+        Returns {term: [GraphNode, ...]} with an entry for every term.
+        """
+        results: dict[str, list[GraphNode]] = {term: [] for term in terms}
+        if not terms:
+            return results
+
+        # Terms are sent raw and lowered by Cypher, so the returned key is the
+        # caller's exact term (Python and FalkorDB case-folding need not agree).
+        unique_terms = list(dict.fromkeys(terms))
         result = self.graph.query(
             """MATCH (e:Entity)
-               WHERE toLower(e.name) CONTAINS toLower($query)
-               RETURN e.name, e.type, e.mention_count, e.first_seen, e.last_seen
+               WITH e, toLower(e.name) AS lname
+               UNWIND $terms AS term
+               WITH term, e, lname
+               WHERE lname CONTAINS toLower(term)
+               WITH term, e
                ORDER BY e.mention_count DESC
-               LIMIT $limit""",
-            {"query": query, "limit": limit * 3},  # fetch more for re-ranking
+               WITH term, collect([e.name, e.type, e.mention_count, e.first_seen, e.last_seen])[..$fetch] AS hits
+               RETURN term, hits""",
+            {"terms": unique_terms, "fetch": limit * 3},  # fetch more for re-ranking
         )
-        nodes = [
-            GraphNode(
-                name=row[0],
-                type=row[1],
-                mention_count=row[2] or 0,
-                first_seen=row[3] or "",
-                last_seen=row[4] or "",
-            )
-            for row in result.result_set
-        ]
-
-        q_lower = query.lower()
-        q_is_single_word = " " not in q_lower.strip()
-
-        def _rank(node: GraphNode) -> tuple:
-            name_lower = node.name.lower()
-            if name_lower == q_lower:
-                priority = 0  # exact match
-            elif name_lower.startswith(q_lower + " ") or (
-                not q_is_single_word and name_lower.endswith(" " + q_lower)
-            ):
-                # For single-word queries, ends-with is weaker (e.g. "Nhật" in "Sinh nhật")
-                priority = 1
-            elif q_lower + " " in name_lower or " " + q_lower in name_lower:
-                priority = 2  # query is a whole word within a longer name
-            elif q_is_single_word and name_lower.endswith(" " + q_lower):
-                priority = 2  # single-word ends-with: deprioritize ("Sinh nhật" for "Nhật")
-            else:
-                priority = 3  # pure substring (lowest)
-            return (priority, -node.mention_count)
-
-        nodes.sort(key=_rank)
-        return nodes[:limit]
+        hits_by_term = {row[0]: row[1] or [] for row in result.result_set}
+
+        for term in terms:
+            nodes = [
+                GraphNode(
+                    name=hit[0],
+                    type=hit[1],
+                    mention_count=hit[2] or 0,
+                    first_seen=hit[3] or "",
+                    last_seen=hit[4] or "",
+                )
+                for hit in hits_by_term.get(term, [])
+            ]
+            nodes.sort(key=lambda node: _rank_entity_match(node, term))
+            results[term] = nodes[:limit]
+        return results
 
-    def traverse(self, entity_name: str, max_hops: int = 2, limit: int = 20) -> GraphSearchResult:
+    def traverse(
+        self,
+        entity_name: str,
+        max_hops: int = 2,
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> GraphSearchResult:
         """Multi-hop traversal from a seed entity.
 
         Phase 9: Also follows SAME_AS edges to collect evidence from aliased entities.
         If entity_name is an alias, traverses from the canonical node too.
+
+        date_from/date_to (YYYY-MM-DD, inclusive) filter on the `event_time` of the
+        reported (last) edge of each path, inside the Cypher query.
         """
-        nodes_map: dict[str, GraphNode] = {}
-        edges: list[GraphEdge] = []
-        seen_edge_keys: set[str] = set()
+        return self.traverse_many(
+            [entity_name], max_hops=max_hops, limit=limit, date_from=date_from, date_to=date_to
+        )[entity_name]
+
+    def traverse_many(
+        self,
+        seeds: list[str],
+        max_hops: int = 2,
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> dict[str, GraphSearchResult]:
+        """Traverse from several seeds in a single Cypher round trip.
+
+        SAME_AS resolution (alias → canonical and canonical → aliases) happens in
+        the same query. Each start node (seed or alias) contributes at most
+        `limit` paths; the per-start subquery stops expanding once it has them,
+        so hub entities are not fully expanded. Returns {seed: GraphSearchResult}
+        with an entry for every seed, empty when it is not in the graph.
+        """
+        results = {seed: GraphSearchResult() for seed in seeds}
+        if not seeds:
+            return results
 
-        def _run_traverse(name: str) -> None:
-            result = self.graph.query(
-                """MATCH (start:Entity)
-                   WHERE toLower(start.name) = toLower($name)
-                   MATCH path = (start)-[r:RELATES*1.."""
-                + str(max_hops)
-                + """]-(connected:Entity)
-                   RETURN start.name, start.type,
-                          connected.name, connected.type,
-                          [rel IN relationships(path) | rel.type] AS rel_types,
-                          [rel IN relationships(path) | rel.weight] AS weights,
-                          [rel IN relationships(path) | rel.evidence] AS evidences,
-                          [rel IN relationships(path) | rel.source_hash] AS source_hashes
-                   LIMIT $limit""",
-                {"name": name, "limit": limit},
-            )
-            for row in result.result_set:
-                src_name, src_type = row[0], row[1]
-                tgt_name, tgt_type = row[2], row[3]
-                rel_types, weights, evidences, source_hashes = row[4], row[5], row[6], row[7]
-                nodes_map[src_name] = GraphNode(name=src_name, type=src_type)
+        result = self.graph.query(
+            """UNWIND $seeds AS seed
+               MATCH (s:Entity)
+               WHERE toLower(s.name) = toLower(seed)
+               OPTIONAL MATCH (s)-[:SAME_AS]-(alias:Entity)
+               WITH seed, s, collect(DISTINCT alias) AS aliases
+               WITH seed, [s] + aliases AS starts
+               UNWIND starts AS start
+               CALL {
+                 WITH start
+                 MATCH path = (start)-[r:RELATES*1.."""
+            + str(max_hops)
+            + """]-(connected:Entity)
+                 WHERE ($date_from IS NULL OR last(relationships(path)).event_time >= $date_from)
+                   AND ($date_to IS NULL OR last(relationships(path)).event_time <= $date_to)
+                 RETURN [
+                   connected.name, connected.type,
+                   [rel IN relationships(path) | rel.type],
+                   [rel IN relationships(path) | rel.weight],
+                   [rel IN relationships(path) | rel.evidence],
+                   [rel IN relationships(path) | rel.source_hash],
+                   [rel IN relationships(path) | rel.event_time]
+                 ] AS hit
+                 LIMIT $limit
+               }
+               WITH seed, start, collect(hit) AS hits
+               RETURN seed, start.name, start.type, hits""",
+            {
+                "seeds": list(seeds),
+                "limit": limit,
+                "date_from": date_from,
+                "date_to": date_to,
+            },
+        )
+
+        nodes_maps: dict[str, dict[str, GraphNode]] = {seed: {} for seed in seeds}
+        seen_edge_keys: dict[str, set[str]] = {seed: set() for seed in seeds}
+        for row in result.result_set:
+            seed, src_name, src_type, hits = row[0], row[1], row[2], row[3]
+            if seed not in results:
+                continue
+            nodes_map = nodes_maps[seed]
+            edges = results[seed].edges
+            nodes_map[src_name] = GraphNode(name=src_name, type=src_type)
+            for hit in hits or []:
+                tgt_name, tgt_type = hit[0], hit[1]
+                rel_types, weights, evidences, source_hashes, event_times = hit[2:7]
                 nodes_map[tgt_name] = GraphNode(name=tgt_name, type=tgt_type)
                 if rel_types:
                     key = f"{src_name}|{tgt_name}|{source_hashes[-1] if source_hashes else ''}"
-                    if key not in seen_edge_keys:
-                        seen_edge_keys.add(key)
+                    if key not in seen_edge_keys[seed]:
+                        seen_edge_keys[seed].add(key)
                         edges.append(GraphEdge(
                             source=src_name,
                             target=tgt_name,
@@ -303,35 +514,12 @@ class FalkorGraphStore:
                             weight=weights[-1] if weights else 0.5,
                             evidence=evidences[-1] if evidences else "",
                             source_hash=source_hashes[-1] if source_hashes else "",
+                            event_time=(event_times[-1] or "") if event_times else "",
                         ))
 
-        # Primary traversal
-        _run_traverse(entity_name)
-
-        # Follow SAME_AS: if alias → canonical, also traverse canonical
-        try:
-            same_as = self.graph.query(
-                """MATCH (alias:Entity)-[:SAME_AS]->(canon:Entity)
-                   WHERE toLower(alias.name) = toLower($name)
-                   RETURN canon.name""",
-                {"name": entity_name},
-            )
-            for row in same_as.result_set:
-                _run_traverse(row[0])
-
-            # Also: if canonical, collect all aliases' traversals
-            all_aliases = self.graph.query(
-                """MATCH (alias:Entity)-[:SAME_AS]->(canon:Entity)
-                   WHERE toLower(canon.name) = toLower($name)
-                   RETURN alias.name""",
-                {"name": entity_name},
-            )
-            for row in all_aliases.result_set:
-                _run_traverse(row[0])
-        except Exception as e:
-            log.debug("SAME_AS traversal failed (non-critical): %s", e)
-
-        return GraphSearchResult(nodes=list(nodes_map.values()), edges=edges)
+        for seed in seeds:
+            results[seed].nodes = list(nodes_maps[seed].values())
+        return results
 
     def find_path(self, source: str, target: str) -> GraphSearchResult:
         """Find shortest path between two entities."""
@@ -389,6 +577,8 @@ class InMemoryGraphStore:
     def __init__(self):
         self.nodes: dict[str, GraphNode] = {}
         self.edges: list[GraphEdge] = []
+        self.aliases: dict[str, str] = {}  # lower(alias) → canonical name (SAME_AS)
+        self.version = 0
 
     def upsert(
         self, extraction: ExtractionResult, date: str, timestamp: str, source_hash: str = ""
@@ -406,7 +596,10 @@ class InMemoryGraphStore:
                     first_seen=date,
                     last_seen=date,
                 )
+        if extraction.entities:
+            self.version += 1
 
+        event_time = extraction.event_time or date
         for rel in extraction.relationships:
             self.edges.append(
                 GraphEdge(
@@ -416,25 +609,119 @@ class InMemoryGraphStore:
                     weight=rel.weight,
                     evidence=rel.evidence,
                     source_hash=source_hash,
+                    event_time=event_time,
                 )
             )
 
-    def get_canonical_entities(self, limit: int = 50) -> list[str]:
-        """Get top canonical entity names sorted by mention count."""
+    def get_canonical_entities(self, limit: int = 50) -> list[dict]:
+        """Get top canonical entities sorted by mention count (same shape as FalkorGraphStore)."""
         sorted_nodes = sorted(self.nodes.values(), key=lambda n: n.mention_count, reverse=True)
-        return [n.name for n in sorted_nodes[:limit]]
+        aliases_of: dict[str, list[str]] = {}
+        for alias_key, canonical in self.aliases.items():
+            alias_node = self.nodes.get(alias_key)
+            aliases_of.setdefault(canonical.lower(), []).append(
+                alias_node.name if alias_node else alias_key
+            )
+        return [
+            {
+                "name": n.name,
+                "type": n.type,
+                "mentions": n.mention_count,
+                "aliases": aliases_of.get(n.name.lower(), []),
+            }
+            for n in sorted_nodes[:limit]
+        ]
+
+    def merge_entity_aliases(self, canonical: str, aliases: list[str]) -> None:
+        """Link alias names to a canonical entity (in-memory SAME_AS)."""
+        for name in [canonical, *aliases]:
+            if name.lower() not in self.nodes:
+                self.nodes[name.lower()] = GraphNode(name=name, type="PERSON")
+        for alias in aliases:
+            if alias.lower() != canonical.lower():
+                self.aliases[alias.lower()] = canonical
+        self.version += 1
 
     def search_entities(self, query: str, limit: int = 10) -> list[GraphNode]:
-        q = query.lower()
-        matches = [n for n in self.nodes.values() if q in n.name.lower()]
-        matches.sort(key=lambda n: n.mention_count, reverse=True)
-        return matches[:limit]
+        return self.search_entities_many([query], limit=limit)[query]
+
+    def search_entities_many(self, terms: list[str], limit: int = 10) -> dict[str, list[GraphNode]]:
+        """Resolve several terms in one pass over the nodes (same ranking as FalkorGraphStore)."""
+        results: dict[str, list[GraphNode]] = {term: [] for term in terms}
+        lowered = {term: term.lower() for term in terms}
+        for node in self.nodes.values():
+            name_lower = node.name.lower()
+            for term, q in lowered.items():
+                if q in name_lower:
+                    results[term].append(node)
+        for term, matches in results.items():
+            matches.sort(key=lambda n: n.mention_count, reverse=True)
+            candidates = matches[: limit * 3]
+            candidates.sort(key=lambda n: _rank_entity_match(n, term))
+            results[term] = candidates[:limit]
+        return results
 
-    def traverse(self, entity_name: str, max_hops: int = 2, limit: int = 20) -> GraphSearchResult:
+    def traverse(
+        self,
+        entity_name: str,
+        max_hops: int = 2,
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> GraphSearchResult:
+        return self.traverse_many(
+            [entity_name], max_hops=max_hops, limit=limit, date_from=date_from, date_to=date_to
+        )[entity_name]
+
+    def traverse_many(
+        self,
+        seeds: list[str],
+        max_hops: int = 2,
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> dict[str, GraphSearchResult]:
+        """Traverse from each seed plus its SAME_AS aliases/canonical (mirrors FalkorGraphStore)."""
+        results = {}
+        for seed in seeds:
+            key = seed.lower()
+            starts = [seed]
+            if key in self.aliases:
+                starts.append(self.aliases[key])
+            starts.extend(a for a, canon in self.aliases.items() if canon.lower() == key)
+
+            nodes: dict[str, GraphNode] = {}
+            edges: list[GraphEdge] = []
+            seen_edges: set[int] = set()
+            for start in starts:
+                walked = self._walk_from(start, max_hops, limit, date_from, date_to)
+                for n in walked.nodes:
+                    nodes.setdefault(n.name.lower(), n)
+                for e in walked.edges:
+                    if id(e) not in seen_edges:
+                        seen_edges.add(id(e))
+                        edges.append(e)
+            results[seed] = GraphSearchResult(nodes=list(nodes.values()), edges=edges)
+        return results
+
+    def _walk_from(
+        self,
+        entity_name: str,
+        max_hops: int,
+        limit: int,
+        date_from: str | None,
+        date_to: str | None,
+    ) -> GraphSearchResult:
+        """Depth-first walk from a single node."""
         visited = set()
         result_nodes = {}
         result_edges = []
 
+        def _in_range(edge: GraphEdge) -> bool:
+            return (not date_from or edge.event_time >= date_from) and (
+                not date_to or edge.event_time <= date_to
+            )
+
         def _walk(name: str, depth: int):
             if depth > max_hops or name.lower() in visited:
                 return
@@ -443,6 +730,8 @@ class InMemoryGraphStore:
                 result_nodes[name.lower()] = self.nodes[name.lower()]
 
             for edge in self.edges:
+                if not _in_range(edge):
+                    continue
                 if edge.source.lower() == name.lower() and edge.target.lower() not in visited:
                     result_edges.append(edge)
                     if edge.target.lower() in self.nodes:
@@ -2,10 +2,76 @@
 
 from __future__ import annotations
 
+import json
+import queue
 import sqlite3
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
 from pathlib import Path
 from dataclasses import dataclass
 
+# Lookups by content_hash pad their IN (...) list to a power-of-two bucket so the
+# sqlite3 statement cache sees a handful of distinct SQL strings instead of one per size.
+_HASH_BUCKET_MIN = 8
+_HASH_BUCKET_MAX = 512
+# SQLITE_MAX_VARIABLE_NUMBER on builds older than 3.32; no statement may bind more
+_MAX_VARIABLES = 999
+
+# How long a connection waits on a lock held by another process before SQLITE_BUSY
+_BUSY_TIMEOUT_S = 5.0
+
+# Keeps memory_fts in sync on insert; index_many(defer_fts=True) suspends it for a batch
+_FTS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+        INSERT INTO memory_fts(rowid, content, date, mood)
+        VALUES (new.id, new.content, new.date, new.mood);
+    END
+"""
+
+# Schema migrations, applied in order when the index is opened. PRAGMA user_version
+# records how many have run, so each one executes once per database file.
+_MIGRATIONS: tuple[tuple[str, ...], ...] = (
+    # 1: timeline and date access paths (get_by_date, get_dates, get_timeline)
+    (
+        "CREATE INDEX IF NOT EXISTS idx_memories_date_ts ON memories(date, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_memories_timestamp ON memories(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_memories_event_time ON memories(event_time)",
+    ),
+    # 2: normalized tags (one row per memory and tag, kept in sync by triggers) and moods
+    (
+        """
+        CREATE TABLE IF NOT EXISTS memory_tags (
+            tag TEXT NOT NULL,
+            memory_id INTEGER NOT NULL,
+            PRIMARY KEY (tag, memory_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_memory_tags_memory ON memory_tags(memory_id)",
+        """
+        CREATE TRIGGER IF NOT EXISTS memories_tags_ai AFTER INSERT ON memories BEGIN
+            INSERT OR IGNORE INTO memory_tags (tag, memory_id)
+            SELECT value, new.id FROM json_each(new.tags)
+            WHERE json_valid(new.tags) AND type = 'text' AND value != '';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS memories_tags_ad AFTER DELETE ON memories BEGIN
+            DELETE FROM memory_tags WHERE memory_id = old.id;
+        END
+        """,
+        """
+        INSERT OR IGNORE INTO memory_tags (tag, memory_id)
+        SELECT j.value, m.id FROM memories m, json_each(m.tags) j
+        WHERE json_valid(m.tags) AND j.type = 'text' AND j.value != ''
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_memories_mood ON memories(mood)",
+    ),
+)
+
+# FTS5 snippet() accepts at most 64 tokens per window
+_SNIPPET_MAX_TOKENS = 64
+
 
 @dataclass
 class FTSResult:
@@ -17,17 +83,171 @@ class FTSResult:
     mood: str
     timestamp: str
     rank: float
+    content_hash: str = ""
+
+
+class MemoryRow(Mapping):
+    """Read-only hydrated memory row; `tags` JSON is only decoded when accessed."""
+
+    __slots__ = ("_row", "_tags")
+    _KEYS = ("text", "date", "mood", "timestamp", "tags", "event_time")
+
+    def __init__(self, row: tuple):
+        # row = (content, date, mood, timestamp, tags_json, event_time)
+        self._row = row
+        self._tags: list | None = None
+
+    def __getitem__(self, key: str):
+        if key == "tags":
+            if self._tags is None:
+                raw = self._row[4]
+                self._tags = json.loads(raw) if raw else []
+            return self._tags
+        if key == "event_time":
+            return self._row[5] or ""
+        try:
+            return self._row[self._KEYS.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f"MemoryRow({dict(self)!r})"
+
+
+def _hash_bucket(n: int) -> int:
+    size = _HASH_BUCKET_MIN
+    while size < n:
+        size *= 2
+    return size
+
+
+def _hash_chunks(hashes: list[str], reserved: int = 0) -> Iterator[tuple[str, list]]:
+    """Split hashes into padded IN (...) lists. Yields (placeholders, params) per chunk.
+
+    Each chunk is padded with NULLs to a power-of-two bucket. `reserved` is the
+    number of other variables the statement binds, so the whole statement stays
+    within `_MAX_VARIABLES`.
+    """
+    limit = max(1, min(_HASH_BUCKET_MAX, _MAX_VARIABLES - reserved))
+    for start in range(0, len(hashes), limit):
+        chunk = hashes[start : start + limit]
+        size = min(_hash_bucket(len(chunk)), limit)
+        yield ",".join("?" * size), chunk + [None] * (size - len(chunk))
+
+
+class _ReadPool:
+    """Bounded pool of read-only connections, checked out for one query at a time.
+
+    Connections are opened lazily up to `size`; when all are in use, callers
+    wait for one to be returned.
+    """
+
+    def __init__(self, db_path: Path, size: int):
+        self._uri = f"{db_path.resolve().as_uri()}?mode=ro"
+        self._size = max(1, size)
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._uri, uri=True, check_same_thread=False, timeout=_BUSY_TIMEOUT_S
+        )
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                conn = self._open() if len(self._all) < self._size else None
+                if conn is not None:
+                    self._all.append(conn)
+            if conn is None:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+
+
+def _facet_conditions(
+    tags: list[str] | None, mood: str | None, id_col: str, mood_col: str
+) -> tuple[list[str], list]:
+    """SQL conditions for the tag (any of) and mood filters, answered from indexes."""
+    conditions: list[str] = []
+    params: list = []
+    if tags:
+        conditions.append(
+            f"{id_col} IN (SELECT memory_id FROM memory_tags "
+            f"WHERE tag IN ({','.join('?' * len(tags))}))"
+        )
+        params.extend(tags)
+    if mood:
+        conditions.append(f"{mood_col} = ?")
+        params.append(mood)
+    return conditions, params
+
+
+def _timeline_entry(r: tuple) -> dict:
+    return {
+        "text": r[0],
+        "date": r[1],
+        "mood": r[2],
+        "timestamp": r[3],
+        "tags": json.loads(r[4]) if r[4] else [],
+        "event_time": r[5] or "",
+    }
+
+
+def _encode_timeline_cursor(row: tuple) -> str:
+    # "<id>:<sort value>" — the sort value (a timestamp) may itself contain ':'
+    return f"{row[7]}:{row[6]}"
+
+
+def _decode_timeline_cursor(cursor: str) -> tuple[str, int]:
+    rowid, sep, value = cursor.partition(":")
+    if not sep or not rowid.isdigit():
+        raise ValueError(f"Invalid timeline cursor: {cursor!r}")
+    return value, int(rowid)
 
 
 class KeywordIndex:
-    """SQLite FTS5 keyword index for memory entries."""
+    """SQLite FTS5 keyword index for memory entries.
 
-    def __init__(self, db_path: Path):
+    The database runs in WAL mode. Writes go through one writer connection
+    (`conn`) serialized by a lock; reads use a pool of read-only connections,
+    so searches on FastMCP worker threads run in parallel with each other and
+    with a commit — from this process or another one, such as the CLI.
+    """
+
+    def __init__(self, db_path: Path, read_connections: int = 4):
         self.db_path = db_path
         db_path.parent.mkdir(parents=True, exist_ok=True)
         # FastMCP Async Server calls synchronous tools in a background worker thread.
-        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn = sqlite3.connect(
+            str(db_path), check_same_thread=False, timeout=_BUSY_TIMEOUT_S
+        )
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self._write_lock = threading.Lock()
         self._create_tables()
+        self._migrate()
+        self._readers = _ReadPool(db_path, read_connections)
 
     def _create_tables(self) -> None:
         """Create FTS5 virtual table and metadata table."""
@@ -64,20 +284,77 @@ class KeywordIndex:
             )
         """)
         # Triggers to keep FTS in sync
-        cur.execute("""
-            CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
-                INSERT INTO memory_fts(rowid, content, date, mood)
-                VALUES (new.id, new.content, new.date, new.mood);
-            END
-        """)
+        cur.execute(_FTS_INSERT_TRIGGER)
         cur.execute("""
             CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
                 INSERT INTO memory_fts(memory_fts, rowid, content, date, mood)
                 VALUES ('delete', old.id, old.content, old.date, old.mood);
             END
         """)
+        # Write generation — bumped on every insert/delete, shared by all processes
+        # using this database, so response caches can tell when results may change
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS kioku_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cur.execute("INSERT OR IGNORE INTO kioku_meta (key, value) VALUES ('generation', 0)")
+        cur.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_gen_ai AFTER INSERT ON memories BEGIN
+                UPDATE kioku_meta SET value = value + 1 WHERE key = 'generation';
+            END
+        """)
+        cur.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_gen_ad AFTER DELETE ON memories BEGIN
+                UPDATE kioku_meta SET value = value + 1 WHERE key = 'generation';
+            END
+        """)
         self.conn.commit()
 
+    def _migrate(self) -> None:
+        """Apply the schema migrations this database has not seen yet."""
+        with self._write_lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Read inside the write transaction: another process may have migrated
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                for number in range(version, len(_MIGRATIONS)):
+                    for statement in _MIGRATIONS[number]:
+                        conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {number + 1}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def schema_version(self) -> int:
+        """Number of schema migrations applied to this database."""
+        return self._read("PRAGMA user_version")[0][0]
+
+    def _read(self, sql: str, params: tuple | list = ()) -> list[tuple]:
+        """Run a SELECT on a pooled read-only connection and fetch all rows."""
+        with self._readers.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def generation(self) -> int:
+        """Return the write generation (monotonic, persisted in SQLite)."""
+        rows = self._read("SELECT value FROM kioku_meta WHERE key = 'generation'")
+        return rows[0][0] if rows else 0
+
+    def bump_generation(self) -> int:
+        """Advance the write generation, e.g. after a save touched the other stores."""
+        with self._write_lock:
+            cur = self.conn.cursor()
+            try:
+                cur.execute("UPDATE kioku_meta SET value = value + 1 WHERE key = 'generation'")
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+        return self.generation()
+
     def index(
         self,
         content: str,
@@ -93,55 +370,181 @@ class KeywordIndex:
         Skips duplicates based on content_hash.
         """
         import hashlib
-        import json
 
         if not content_hash:
             content_hash = hashlib.sha256(content.encode()).hexdigest()
 
         tags_str = json.dumps(tags or [])
 
-        cur = self.conn.cursor()
-        try:
-            cur.execute(
-                "INSERT INTO memories (content, date, mood, timestamp, content_hash, tags, event_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (content, date, mood, timestamp, content_hash, tags_str, event_time or ""),
+        with self._write_lock:
+            cur = self.conn.cursor()
+            try:
+                cur.execute(
+                    "INSERT INTO memories (content, date, mood, timestamp, content_hash, tags, event_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (content, date, mood, timestamp, content_hash, tags_str, event_time or ""),
+                )
+                self.conn.commit()
+                return cur.lastrowid  # type: ignore
+            except sqlite3.IntegrityError:
+                # Duplicate content_hash — skip, closing the implicit transaction
+                self.conn.rollback()
+                return -1
+            except BaseException:
+                self.conn.rollback()
+                raise
+
+    def index_many(self, entries: Iterable[Mapping], defer_fts: bool = False) -> list[int]:
+        """Index a batch of memory entries in one transaction. Returns a row id per entry.
+
+        Each entry is a mapping with the keyword arguments of `index` (`content`,
+        `date`, `timestamp` and optionally `mood`, `content_hash`, `tags`,
+        `event_time`). The result lists the new row id for each inserted entry
+        and -1 for entries skipped as duplicates, either of a stored memory or of
+        an earlier entry in the same batch.
+
+        With `defer_fts`, the FTS insert trigger is suspended for the batch and
+        the new rows are added to `memory_fts` with one INSERT ... SELECT before
+        commit. This is faster for large restores. Other connections never see
+        the trigger missing, because the whole batch is one write transaction.
+        """
+        import hashlib
+
+        rows = []
+        for e in entries:
+            content = e["content"]
+            rows.append((
+                content,
+                e["date"],
+                e.get("mood", ""),
+                e["timestamp"],
+                e.get("content_hash") or hashlib.sha256(content.encode()).hexdigest(),
+                json.dumps(e.get("tags") or []),
+                e.get("event_time") or "",
+            ))
+        if not rows:
+            return []
+
+        with self._write_lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                hashes = list(dict.fromkeys(r[4] for r in rows))
+                existing = self._existing_hashes(hashes)
+                seen: set[str] = set(existing)
+                new_rows = []
+                for r in rows:
+                    if r[4] not in seen:
+                        seen.add(r[4])
+                        new_rows.append(r)
+
+                max_before = conn.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM memories"
+                ).fetchone()[0]
+                if defer_fts:
+                    conn.execute("DROP TRIGGER IF EXISTS memories_ai")
+                conn.executemany(
+                    "INSERT INTO memories (content, date, mood, timestamp, content_hash, tags, event_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    new_rows,
+                )
+                if defer_fts:
+                    conn.execute(
+                        "INSERT INTO memory_fts(rowid, content, date, mood) "
+                        "SELECT id, content, date, mood FROM memories WHERE id > ?",
+                        (max_before,),
+                    )
+                    conn.execute(_FTS_INSERT_TRIGGER)
+                ids = dict(conn.execute(
+                    "SELECT content_hash, id FROM memories WHERE id > ?", (max_before,)
+                ).fetchall())
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+        # Only the first occurrence of a new hash was inserted
+        return [ids.pop(r[4], -1) for r in rows]
+
+    def _existing_hashes(self, hashes: list[str]) -> set[str]:
+        """Hashes already stored, read on the writer connection (inside its transaction)."""
+        found: set[str] = set()
+        for placeholders, chunk in _hash_chunks(hashes):
+            found.update(
+                r[0]
+                for r in self.conn.execute(
+                    f"SELECT content_hash FROM memories WHERE content_hash IN ({placeholders})",
+                    chunk,
+                )
             )
-            self.conn.commit()
-            return cur.lastrowid  # type: ignore
-        except sqlite3.IntegrityError:
-            # Duplicate content_hash — skip
-            return -1
+        return found
 
-    def search(self, query: str, limit: int = 20) -> list[FTSResult]:
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        snippet_tokens: int | None = None,
+        mark: tuple[str, str] = ("", ""),
+        tags: list[str] | None = None,
+        mood: str | None = None,
+    ) -> list[FTSResult]:
         """Search memories using FTS5 BM25 ranking.
 
         Args:
             query: Search query string.
             limit: Max results to return.
+            date_from: Optional inclusive lower bound on `date` (YYYY-MM-DD).
+            date_to: Optional inclusive upper bound on `date` (YYYY-MM-DD).
+            snippet_tokens: If set, `content` is an FTS5 snippet() window of about
+                this many tokens around the matched terms (capped at 64) instead of
+                the full body. Callers fetch full text for the hits they keep via
+                get_by_hashes.
+            mark: Opening/closing markers wrapped around matched terms in snippets.
+            tags: Optional tags; only memories carrying any of them match.
+            mood: Optional exact mood filter.
 
         Returns:
             List of FTSResult sorted by relevance (best first).
         """
-        cur = self.conn.cursor()
-        
         # Escape FTS5 special characters by wrapping the entire query in double quotes.
         # This prevents words like 'Tech-Verse' from throwing "no such column: Verse".
         safe_query = '"' + query.replace('"', '""') + '"'
         
+        # Date range is evaluated inside the query so LIMIT only counts in-range hits
+        if snippet_tokens:
+            tokens = max(1, min(snippet_tokens, _SNIPPET_MAX_TOKENS))
+            content_col = "snippet(memory_fts, 0, ?, ?, '…', ?)"
+            params: list = [mark[0], mark[1], tokens]
+        else:
+            content_col = "m.content"
+            params = []
+
+        conditions = ["memory_fts MATCH ?"]
+        params.append(safe_query)
+        if date_from:
+            conditions.append("m.date >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("m.date <= ?")
+            params.append(date_to)
+        facet_conditions, facet_params = _facet_conditions(tags, mood, "m.id", "m.mood")
+        conditions.extend(facet_conditions)
+        params.extend(facet_params)
+        params.append(limit)
+
         # FTS5 match with BM25 ranking (negative = more relevant)
         try:
-            cur.execute(
-                """
-                SELECT m.id, m.content, m.date, m.mood, m.timestamp, rank
+            rows = self._read(
+                f"""
+                SELECT m.id, {content_col}, m.date, m.mood, m.timestamp, rank, m.content_hash
                 FROM memory_fts
                 JOIN memories m ON m.id = memory_fts.rowid
-                WHERE memory_fts MATCH ?
+                WHERE {" AND ".join(conditions)}
                 ORDER BY rank
                 LIMIT ?
                 """,
-                (safe_query, limit),
+                tuple(params),
             )
-            rows = cur.fetchall()
         except sqlite3.OperationalError:
             # Fallback if there's still somehow an issue with the query syntax
             return []
@@ -156,25 +559,21 @@ class KeywordIndex:
                     mood=row[3],
                     timestamp=row[4],
                     rank=abs(row[5]),  # Convert to positive score
+                    content_hash=row[6],
                 )
             )
         return results
 
     def count(self) -> int:
         """Return total number of indexed entries."""
-        cur = self.conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM memories")
-        return cur.fetchone()[0]
+        return self._read("SELECT COUNT(*) FROM memories")[0][0]
 
     def get_by_date(self, date: str) -> list[dict]:
         """Get all memories for a specific date from SQLite."""
-        cur = self.conn.cursor()
-        cur.execute(
+        rows = self._read(
             "SELECT content, date, mood, timestamp, tags, event_time FROM memories WHERE date = ? ORDER BY timestamp ASC",
             (date,),
         )
-        import json
-
         return [
             {
                 "text": r[0],
@@ -184,31 +583,29 @@ class KeywordIndex:
                 "tags": json.loads(r[4]) if r[4] else [],
                 "event_time": r[5] or "",
             }
-            for r in cur.fetchall()
+            for r in rows
         ]
 
-    def get_by_hashes(self, content_hashes: list[str]) -> dict[str, dict]:
-        """O(1) lookup: Get memories by content_hash. Returns {hash: {text, date, mood, ...}}."""
-        if not content_hashes:
+    def get_by_hashes(self, content_hashes: list[str]) -> dict[str, MemoryRow]:
+        """O(1) lookup: Get memories by content_hash. Returns {hash: {text, date, mood, ...}}.
+
+        Duplicates are dropped and the IN list is padded with NULLs to a
+        power-of-two size, so repeated calls reuse a cached prepared statement.
+        Rows are `MemoryRow` mappings that decode `tags` lazily.
+        """
+        unique = list(dict.fromkeys(h for h in content_hashes if h))
+        if not unique:
             return {}
-        import json
 
-        placeholders = ",".join("?" for _ in content_hashes)
-        cur = self.conn.cursor()
-        cur.execute(
-            f"SELECT content_hash, content, date, mood, timestamp, tags, event_time FROM memories WHERE content_hash IN ({placeholders})",
-            content_hashes,
-        )
-        result = {}
-        for r in cur.fetchall():
-            result[r[0]] = {
-                "text": r[1],
-                "date": r[2],
-                "mood": r[3],
-                "timestamp": r[4],
-                "tags": json.loads(r[5]) if r[5] else [],
-                "event_time": r[6] or "",
-            }
+        result: dict[str, MemoryRow] = {}
+        for placeholders, chunk in _hash_chunks(unique):
+            rows = self._read(
+                "SELECT content_hash, content, date, mood, timestamp, tags, event_time "
+                f"FROM memories WHERE content_hash IN ({placeholders})",
+                chunk,
+            )
+            for r in rows:
+                result[r[0]] = MemoryRow(r[1:])
         return result
 
     def get_timeline(
@@ -217,14 +614,104 @@ class KeywordIndex:
         end_date: str | None = None,
         limit: int = 50,
         sort_by: str = "processing_time",
+        tags: list[str] | None = None,
+        mood: str | None = None,
     ) -> list[dict]:
         """Get timeline bounded by dates, directly from SQLite.
 
         Args:
             sort_by: "processing_time" (default, when it was recorded) or
                      "event_time" (when the event actually happened).
+            tags: Optional tags; only memories carrying any of them are listed.
+            mood: Optional exact mood filter.
+        """
+        return self.timeline_page(start_date, end_date, limit, sort_by, tags=tags, mood=mood)[0]
+
+    def timeline_page(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        limit: int = 50,
+        sort_by: str = "processing_time",
+        cursor: str | None = None,
+        tags: list[str] | None = None,
+        mood: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """One page of the timeline, newest page first, entries chronological within it.
+
+        Returns the entries and a cursor for the next (older) page, or None
+        when the range is exhausted. Pages are keyset-based on (sort column,
+        id), so each page is one index range scan wherever it starts, and
+        entries saved meanwhile neither shift nor repeat later pages.
+        """
+        after = _decode_timeline_cursor(cursor) if cursor else None
+        rows = self._read(
+            *self._timeline_query(
+                start_date, end_date, limit + 1, sort_by, after=after, tags=tags, mood=mood
+            )
+        )
+        more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = _encode_timeline_cursor(rows[-1]) if more else None
+        results = [_timeline_entry(r) for r in rows]
+        results.reverse()  # chronological relative to the slice
+        return results, next_cursor
+
+    def iter_timeline(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        sort_by: str = "processing_time",
+        batch_size: int = 500,
+        tags: list[str] | None = None,
+        mood: str | None = None,
+    ) -> Iterator[dict]:
+        """Stream every entry in the range, oldest first, in constant memory.
+
+        Rows are read in keyset batches of `batch_size`. A pooled connection is
+        held only while a batch is fetched, never across the consumer's work.
+        """
+        after = None
+        while True:
+            rows = self._read(
+                *self._timeline_query(
+                    start_date,
+                    end_date,
+                    batch_size,
+                    sort_by,
+                    after=after,
+                    descending=False,
+                    tags=tags,
+                    mood=mood,
+                )
+            )
+            for r in rows:
+                yield _timeline_entry(r)
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1][6], rows[-1][7])
+
+    @staticmethod
+    def _timeline_query(
+        start_date: str | None,
+        end_date: str | None,
+        limit: int,
+        sort_by: str,
+        after: tuple[str, int] | None = None,
+        descending: bool = True,
+        tags: list[str] | None = None,
+        mood: str | None = None,
+    ) -> tuple[str, tuple]:
+        """SQL and parameters for a timeline slice (kept separate so tests can EXPLAIN it).
+
+        `after` is the (sort value, id) key of the last row already returned;
+        rows are ordered on the same key, so the slice continues right after it.
         """
-        query = "SELECT content, date, mood, timestamp, tags, event_time FROM memories"
+        order_col = "event_time" if sort_by == "event_time" else "timestamp"
+        query = (
+            "SELECT content, date, mood, timestamp, tags, event_time, "
+            f"{order_col}, id FROM memories"
+        )
         params: list = []
         conditions = []
 
@@ -241,37 +728,85 @@ class KeywordIndex:
         if sort_by == "event_time":
             conditions.append("event_time != ''")
 
+        facet_conditions, facet_params = _facet_conditions(tags, mood, "id", "mood")
+        conditions.extend(facet_conditions)
+        params.extend(facet_params)
+
+        if after is not None:
+            conditions.append(f"({order_col}, id) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
 
-        order_col = "event_time" if sort_by == "event_time" else "timestamp"
-        query += f" ORDER BY {order_col} DESC LIMIT ?"
+        direction = "DESC" if descending else "ASC"
+        query += f" ORDER BY {order_col} {direction}, id {direction} LIMIT ?"
         params.append(limit)
+        return query, tuple(params)
 
-        cur = self.conn.cursor()
-        cur.execute(query, tuple(params))
-        import json
+    def filter_hashes(
+        self, content_hashes: list[str], tags: list[str] | None = None, mood: str | None = None
+    ) -> set[str]:
+        """The subset of `content_hashes` whose memories pass the tag and mood filters.
 
-        results = [
-            {
-                "text": r[0],
-                "date": r[1],
-                "mood": r[2],
-                "timestamp": r[3],
-                "tags": json.loads(r[4]) if r[4] else [],
-                "event_time": r[5] or "",
-            }
-            for r in cur.fetchall()
-        ]
-        results.reverse()  # chronological relative to the slice
-        return results
+        For result lists that cannot push the filters down themselves (graph evidence).
+        """
+        unique = list(dict.fromkeys(h for h in content_hashes if h))
+        if not unique or not (tags or mood):
+            return set(unique)
+        conditions, params = _facet_conditions(tags, mood, "id", "mood")
+        found: set[str] = set()
+        for placeholders, chunk in _hash_chunks(unique, reserved=len(params)):
+            rows = self._read(
+                f"SELECT content_hash FROM memories WHERE content_hash IN ({placeholders}) "
+                f"AND {' AND '.join(conditions)}",
+                chunk + params,
+            )
+            found.update(r[0] for r in rows)
+        return found
+
+    def facet_counts(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        limit: int = 50,
+    ) -> dict[str, list[tuple[str, int]]]:
+        """Most frequent tags and moods, as (value, count) pairs, optionally within a date range."""
+        conditions: list[str] = []
+        params: list = []
+        if start_date:
+            conditions.append("m.date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("m.date <= ?")
+            params.append(end_date)
+        where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+        if conditions:
+            tag_sql = (
+                "SELECT t.tag, COUNT(*) AS n FROM memory_tags t "
+                f"JOIN memories m ON m.id = t.memory_id{where} GROUP BY t.tag"
+            )
+        else:
+            tag_sql = "SELECT tag, COUNT(*) AS n FROM memory_tags GROUP BY tag"
+        mood_where = where + (" AND " if where else " WHERE ") + "m.mood != ''"
+        order = " ORDER BY n DESC, 1 ASC LIMIT ?"
+        return {
+            "tags": [tuple(r) for r in self._read(tag_sql + order, (*params, limit))],
+            "moods": [
+                tuple(r)
+                for r in self._read(
+                    f"SELECT m.mood, COUNT(*) AS n FROM memories m{mood_where} GROUP BY m.mood"
+                    + order,
+                    (*params, limit),
+                )
+            ],
+        }
 
     def get_dates(self) -> list[str]:
         """List all unique dates in the database."""
-        cur = self.conn.cursor()
-        cur.execute("SELECT DISTINCT date FROM memories ORDER BY date DESC")
-        return [r[0] for r in cur.fetchall()]
+        return [r[0] for r in self._read("SELECT DISTINCT date FROM memories ORDER BY date DESC")]
 
     def close(self) -> None:
-        """Close the database connection."""
+        """Close the writer and all pooled read connections."""
+        self._readers.close()
         self.conn.close()
@@ -3,10 +3,81 @@
 from __future__ import annotations
 
 import hashlib
+import logging
 from pathlib import Path
 
 from kioku.pipeline.embedder import EmbeddingProvider
 
+log = logging.getLogger(__name__)
+
+# Version of the metadata that add() derives from a memory's stored fields. Vectors
+# with an older (or no) `meta_version` are backfilled when the store opens, so
+# filters on derived keys also match memories indexed before those keys existed.
+_META_VERSION = 2  # 1: date_num, 2: tag_<name> flags
+_BACKFILL_BATCH = 1000
+
+# Per-tag boolean metadata key, so tag filters can run inside Chroma's `where`
+_TAG_PREFIX = "tag_"
+
+
+def _date_num(date: str) -> int:
+    """YYYY-MM-DD → YYYYMMDD int. Chroma range operators ($gte/$lte) only accept numbers."""
+    try:
+        return int(date[:10].replace("-", ""))
+    except ValueError:
+        return 0
+
+
+def _date_where(date_from: str | None, date_to: str | None) -> dict | None:
+    """Chroma `where` clause for an inclusive date range on `date_num`."""
+    if date_from and date_to:
+        return {
+            "$and": [
+                {"date_num": {"$gte": _date_num(date_from)}},
+                {"date_num": {"$lte": _date_num(date_to)}},
+            ]
+        }
+    if date_from:
+        return {"date_num": {"$gte": _date_num(date_from)}}
+    if date_to:
+        return {"date_num": {"$lte": _date_num(date_to)}}
+    return None
+
+
+def _where(
+    date_from: str | None,
+    date_to: str | None,
+    tags: list[str] | None = None,
+    mood: str | None = None,
+) -> dict | None:
+    """Chroma `where` clause for the date range plus tag (any of) and mood filters.
+
+    Tags are matched on per-tag boolean metadata (`tag_<name>`); the comma-joined
+    `tags` string cannot be filtered on.
+    """
+    clauses = []
+    date_where = _date_where(date_from, date_to)
+    if date_where:
+        clauses.extend(date_where.get("$and", [date_where]))
+    if tags:
+        tag_clauses = [{_TAG_PREFIX + t: True} for t in tags]
+        clauses.append(tag_clauses[0] if len(tag_clauses) == 1 else {"$or": tag_clauses})
+    if mood:
+        clauses.append({"mood": mood})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def _derived_metadata(meta: dict) -> dict:
+    """Metadata computed from a vector's stored fields (see _META_VERSION)."""
+    tags = (meta.get("tags") or "").split(",")
+    return {
+        "date_num": _date_num(meta.get("date") or ""),
+        **{_TAG_PREFIX + t: True for t in tags if t},
+        "meta_version": _META_VERSION,
+    }
+
 
 class VectorStore:
     """ChromaDB-backed vector store for memory embeddings."""
@@ -36,6 +107,38 @@ class VectorStore:
             name=collection_name,
             metadata={"hnsw:space": "cosine"},
         )
+        try:
+            self._backfill_metadata()
+        except Exception as e:
+            log.warning("Vector metadata backfill failed: %s", e)
+
+    def _backfill_metadata(self) -> int:
+        """Add derived metadata to vectors indexed before it existed. Returns rows updated.
+
+        Stale vectors are found with `meta_version != _META_VERSION`, which also
+        matches vectors without the key. Once the collection is current, opening
+        the store costs one `limit=1` probe.
+        """
+        stale_where = {"meta_version": {"$ne": _META_VERSION}}
+        if not self.collection.get(where=stale_where, limit=1, include=[])["ids"]:
+            return 0
+
+        updated = 0
+        while True:
+            # Backfilled rows drop out of the filter, so always read the first page
+            page = self.collection.get(
+                where=stale_where, include=["metadatas"], limit=_BACKFILL_BATCH
+            )
+            if not page["ids"]:
+                break
+            # update() merges keys into the existing metadata
+            self.collection.update(
+                ids=page["ids"],
+                metadatas=[_derived_metadata(meta or {}) for meta in page["metadatas"]],
+            )
+            updated += len(page["ids"])
+        log.info("Backfilled vector metadata for %d entries", updated)
+        return updated
 
     def add(
         self,
@@ -65,6 +168,7 @@ class VectorStore:
         embedding = self.embedder.embed(content)
 
         # Upsert to ChromaDB — lightweight metadata only, raw text in SQLite
+        tags_str = ",".join(tags) if tags else ""
         self.collection.add(
             ids=[doc_id],
             embeddings=[embedding],
@@ -74,9 +178,10 @@ class VectorStore:
                     "date": date,
                     "timestamp": timestamp,
                     "mood": mood,
-                    "tags": ",".join(tags) if tags else "",
+                    "tags": tags_str,
                     "content_hash": content_hash,
                     "event_time": event_time,
+                    **_derived_metadata({"date": date, "tags": tags_str}),
                 }
             ],
         )
@@ -88,49 +193,72 @@ class VectorStore:
         limit: int = 20,
         date_from: str | None = None,
         date_to: str | None = None,
+        tags: list[str] | None = None,
+        mood: str | None = None,
     ) -> list[dict]:
         """Semantic search using vector similarity.
 
         Returns list of dicts with: content, date, mood, timestamp, distance.
+        The date range filters on the numeric `date_num` metadata (backfilled for
+        older entries when the store opens). Tag and mood filters are applied in
+        the same `where` clause.
         """
-        query_embedding = self.embedder.embed(query)
+        return self.search_many(
+            [query], limit=limit, date_from=date_from, date_to=date_to, tags=tags, mood=mood
+        )[0]
+
+    def search_many(
+        self,
+        queries: list[str],
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        tags: list[str] | None = None,
+        mood: str | None = None,
+    ) -> list[list[dict]]:
+        """Semantic search for several queries sharing one date range (and tag/mood filters).
 
-        # Build where filter for date range
-        where = None
-        if date_from and date_to:
-            where = {"$and": [{"date": {"$gte": date_from}}, {"date": {"$lte": date_to}}]}
-        elif date_from:
-            where = {"date": {"$gte": date_from}}
-        elif date_to:
-            where = {"date": {"$lte": date_to}}
+        All queries are embedded with one `embed_batch` call and sent to Chroma
+        as a single multi-query request. Returns one result list per query, in order.
+        """
+        if not queries:
+            return []
 
         # Clamp limit to collection size
         total = self.collection.count()
         if total == 0:
-            return []
+            return [[] for _ in queries]
         actual_limit = min(limit, total)
 
+        if len(queries) == 1:
+            query_embeddings = [self.embedder.embed(queries[0])]
+        else:
+            query_embeddings = self.embedder.embed_batch(queries)
+
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=query_embeddings,
             n_results=actual_limit,
-            where=where,
+            where=_where(date_from, date_to, tags, mood),
             include=["documents", "metadatas", "distances"],
         )
 
-        output = []
-        if results["ids"] and results["ids"][0]:
-            for i, doc_id in enumerate(results["ids"][0]):
-                meta = results["metadatas"][0][i] if results["metadatas"] else {}
-                output.append(
+        output: list[list[dict]] = []
+        for q in range(len(queries)):
+            ids = results["ids"][q] if results["ids"] else []
+            hits = []
+            for i in range(len(ids)):
+                meta = results["metadatas"][q][i] if results["metadatas"] else {}
+                hits.append(
                     {
-                        "content": results["documents"][0][i] if results["documents"] else "",
+                        "content": results["documents"][q][i] if results["documents"] else "",
                         "date": meta.get("date", ""),
                         "mood": meta.get("mood", ""),
                         "timestamp": meta.get("timestamp", ""),
-                        "distance": results["distances"][0][i] if results["distances"] else 0.0,
+                        "distance": results["distances"][q][i] if results["distances"] else 0.0,
                         "content_hash": meta.get("content_hash", ""),
                     }
                 )
+            output.append(hits)
         return output
 
     def count(self) -> int:
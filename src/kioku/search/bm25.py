@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from kioku.pipeline.keyword_writer import KeywordIndex
 
 
@@ -17,20 +17,44 @@ class SearchResult:
     score: float
     source: str  # "bm25", "vector", "graph"
     content_hash: str = ""  # Phase 7: Universal Identifier for SQLite hydration
+    ranks: dict[str, int] = field(default_factory=dict)  # fusion trace: leg → 1-based rank
 
 
-def bm25_search(index: KeywordIndex, query: str, limit: int = 20) -> list[SearchResult]:
+def bm25_search(
+    index: KeywordIndex,
+    query: str,
+    limit: int = 20,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    snippet_tokens: int | None = None,
+    tags: list[str] | None = None,
+    mood: str | None = None,
+) -> list[SearchResult]:
     """Run BM25 keyword search and return unified SearchResults.
 
     Args:
         index: The KeywordIndex instance.
         query: Search query string.
         limit: Max results.
+        date_from: Optional inclusive start date (YYYY-MM-DD), applied in SQL.
+        date_to: Optional inclusive end date (YYYY-MM-DD), applied in SQL.
+        snippet_tokens: If set, `content` holds an FTS5 snippet around the matched
+            terms rather than the full body (full text comes from hydration).
+        tags: Optional tags (any of), applied in SQL via the memory_tags index.
+        mood: Optional exact mood, applied in SQL.
 
     Returns:
         List of SearchResult sorted by BM25 score (highest first).
     """
-    fts_results = index.search(query, limit=limit)
+    fts_results = index.search(
+        query,
+        limit=limit,
+        date_from=date_from,
+        date_to=date_to,
+        snippet_tokens=snippet_tokens,
+        tags=tags,
+        mood=mood,
+    )
 
     # Normalize scores: FTS5 BM25 scores vary widely,
     # so we normalize relative to the best score
@@ -51,6 +75,7 @@ def bm25_search(index: KeywordIndex, query: str, limit: int = 20) -> list[Search
                 timestamp=r.timestamp,
                 score=r.rank / max_score,  # Normalize to 0-1
                 source="bm25",
+                content_hash=r.content_hash,
             )
         )
     return results
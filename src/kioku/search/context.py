@@ -0,0 +1,112 @@
+"""Request-scoped memo for graph and SQLite lookups made during one search."""
+
+from __future__ import annotations
+
+import threading
+
+from kioku.pipeline.graph_writer import GraphNode, GraphSearchResult, GraphStore
+from kioku.pipeline.keyword_writer import KeywordIndex
+
+
+class SearchContext:
+    """Memoizes traversals, entity lookups, path lookups and hydrations for one request.
+
+    Exposes the read side of the GraphStore protocol (`search_entities_many`,
+    `traverse`, `traverse_many`, `find_path`), so it can be passed to
+    `graph_search` in place of the store. A traversal cached with a larger
+    `limit` also serves smaller ones. Create one per request — nothing here is
+    invalidated by writes.
+    """
+
+    def __init__(self, graph_store: GraphStore, keyword_index: KeywordIndex):
+        self.graph_store = graph_store
+        self.keyword_index = keyword_index
+        # (lower(seed), max_hops, date_from, date_to) → (limit fetched, result)
+        self._traversals: dict[tuple, tuple[int, GraphSearchResult]] = {}
+        self._entities: dict[tuple[str, int], list[GraphNode]] = {}
+        self._paths: dict[tuple[str, str], GraphSearchResult] = {}
+        self._hydrated: dict[str, dict] = {}
+        self._absent: set[str] = set()  # hashes SQLite had no row for
+        self._lock = threading.Lock()
+
+    # ─── Graph ───────────────────────────────────────────────────────────
+
+    def search_entities_many(self, terms: list[str], limit: int = 10) -> dict[str, list[GraphNode]]:
+        missing = [t for t in dict.fromkeys(terms) if (t, limit) not in self._entities]
+        if missing:
+            fetched = self.graph_store.search_entities_many(missing, limit=limit)
+            with self._lock:
+                for term in missing:
+                    self._entities[(term, limit)] = fetched.get(term, [])
+        return {t: self._entities[(t, limit)] for t in terms}
+
+    def search_entities(self, query: str, limit: int = 10) -> list[GraphNode]:
+        return self.search_entities_many([query], limit=limit)[query]
+
+    def traverse_many(
+        self,
+        seeds: list[str],
+        max_hops: int = 2,
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> dict[str, GraphSearchResult]:
+        def _key(seed: str) -> tuple:
+            return (seed.lower(), max_hops, date_from, date_to)
+
+        missing = [
+            seed
+            for seed in dict.fromkeys(seeds)
+            if _key(seed) not in self._traversals or self._traversals[_key(seed)][0] < limit
+        ]
+        if missing:
+            fetched = self.graph_store.traverse_many(
+                missing, max_hops=max_hops, limit=limit, date_from=date_from, date_to=date_to
+            )
+            with self._lock:
+                for seed in missing:
+                    self._traversals[_key(seed)] = (limit, fetched[seed])
+
+        results = {}
+        for seed in seeds:
+            cached_limit, cached = self._traversals[_key(seed)]
+            if cached_limit > limit:
+                cached = GraphSearchResult(nodes=cached.nodes[:limit], edges=cached.edges[:limit])
+            results[seed] = cached
+        return results
+
+    def traverse(
+        self,
+        entity_name: str,
+        max_hops: int = 2,
+        limit: int = 20,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> GraphSearchResult:
+        return self.traverse_many(
+            [entity_name], max_hops=max_hops, limit=limit, date_from=date_from, date_to=date_to
+        )[entity_name]
+
+    def find_path(self, source: str, target: str) -> GraphSearchResult:
+        key = (source.lower(), target.lower())
+        if key not in self._paths:
+            result = self.graph_store.find_path(source, target)
+            with self._lock:
+                self._paths[key] = result
+        return self._paths[key]
+
+    # ─── SQLite ──────────────────────────────────────────────────────────
+
+    def get_by_hashes(self, content_hashes: list[str]) -> dict[str, dict]:
+        """Hydrate by content_hash, only querying SQLite for hashes not seen yet."""
+        missing = [
+            h
+            for h in dict.fromkeys(content_hashes)
+            if h and h not in self._hydrated and h not in self._absent
+        ]
+        if missing:
+            fetched = self.keyword_index.get_by_hashes(missing)
+            with self._lock:
+                self._hydrated.update(fetched)
+                self._absent.update(h for h in missing if h not in fetched)
+        return {h: self._hydrated[h] for h in content_hashes if h in self._hydrated}
@@ -0,0 +1,41 @@
+"""Per-request latency budget for the search pipeline."""
+
+from __future__ import annotations
+
+import time
+
+
+class Deadline:
+    """Wall-clock budget for one request, started at construction.
+
+    `Deadline(None)` never expires, so stages can consult it unconditionally.
+    Stages that get skipped or cut short are recorded in `skipped`, in the
+    order they happened, for the response.
+    """
+
+    def __init__(self, budget_ms: int | None = None):
+        self.budget_ms = budget_ms
+        self._started = time.monotonic()
+        self.skipped: list[str] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_ms is not None
+
+    def remaining(self) -> float:
+        """Seconds left in the budget (infinite when no budget was set)."""
+        if self.budget_ms is None:
+            return float("inf")
+        return max(0.0, self._started + self.budget_ms / 1000 - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.enabled and self.remaining() <= 0
+
+    def clamp(self, timeout: float) -> float:
+        """Shrink a stage timeout so it ends no later than the deadline."""
+        return min(timeout, self.remaining())
+
+    def skip(self, stage: str) -> None:
+        if stage not in self.skipped:
+            self.skipped.append(stage)
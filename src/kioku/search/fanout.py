@@ -0,0 +1,65 @@
+"""Concurrent fan-out of search legs with per-leg timeouts."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from concurrent.futures import TimeoutError as FutureTimeout
+
+log = logging.getLogger(__name__)
+
+
+def fan_out(
+    executor: Executor,
+    legs: dict[str, Callable[[], list] | Future],
+    timeouts: dict[str, float] | None = None,
+    default_timeout: float = 5.0,
+    dropped: list[str] | None = None,
+) -> dict[str, list]:
+    """Run search legs concurrently and collect their results.
+
+    All legs are submitted at the same moment and each one gets its own timeout,
+    measured from that shared start. A leg that raises or misses its deadline is
+    dropped (empty list) instead of holding up the whole response.
+
+    A leg may also be a Future that was submitted earlier (speculative legs); it
+    is collected under the same per-leg deadline instead of being resubmitted.
+
+    Args:
+        executor: Pool the legs run on.
+        legs: Leg name → zero-arg callable returning a result list, or a Future of one.
+        timeouts: Optional per-leg timeout in seconds.
+        default_timeout: Timeout for legs not listed in `timeouts`.
+        dropped: Optional list that collects the names of legs that timed out or failed.
+
+    Returns:
+        Leg name → results, in the same order as `legs`.
+    """
+    timeouts = timeouts or {}
+    started = time.monotonic()
+    futures = {
+        name: leg if isinstance(leg, Future) else executor.submit(leg) for name, leg in legs.items()
+    }
+
+    collected: dict[str, list] = {}
+    # Wait on the tightest deadlines first so a slow leg never delays a fast one's cutoff
+    for name in sorted(futures, key=lambda n: timeouts.get(n, default_timeout)):
+        timeout = timeouts.get(name, default_timeout)
+        remaining = max(0.0, started + timeout - time.monotonic())
+        try:
+            collected[name] = futures[name].result(timeout=remaining)
+        except FutureTimeout:
+            futures[name].cancel()
+            log.warning("Search leg '%s' exceeded %.2fs — dropped", name, timeout)
+            collected[name] = []
+            if dropped is not None:
+                dropped.append(name)
+        except Exception as e:
+            log.warning("Search leg '%s' failed — dropped: %s", name, e)
+            collected[name] = []
+            if dropped is not None:
+                dropped.append(name)
+
+    return {name: collected[name] for name in legs}
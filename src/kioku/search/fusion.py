@@ -0,0 +1,54 @@
+"""Weighted reciprocal rank fusion keyed on content_hash."""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import replace
+
+from kioku.search.bm25 import SearchResult
+
+
+def fuse(
+    legs: dict[str, list[SearchResult]],
+    weights: dict[str, float] | None = None,
+    k: int = 60,
+    limit: int = 10,
+) -> list[SearchResult]:
+    """Fuse ranked result lists from several search legs with weighted RRF.
+
+    Results are merged on `content_hash` (falling back to `content` for results
+    without one), so a graph evidence snippet and the BM25/vector hit for the
+    same memory count as one document. Each leg contributes
+    `weight / (k + rank)`; the top `limit` are picked with a heap, so large
+    candidate lists cost O(n log limit) rather than a full sort.
+
+    The inputs are never mutated. Each returned result is a copy of the first
+    occurrence (in leg order) with the fused `score` and a `ranks` trace of its
+    1-based rank in every leg that returned it.
+
+    Args:
+        legs: Leg name → results, best first. Dict order is the leg priority.
+        weights: Optional leg name → weight (default 1.0). A weight of 0 disables a leg.
+        k: RRF constant (default 60, standard value).
+        limit: Max results to return.
+    """
+    weights = weights or {}
+    # key → [fused score, first-seen order, representative, ranks]
+    fused: dict[str, list] = {}
+
+    for leg, results in legs.items():
+        weight = weights.get(leg, 1.0)
+        if weight <= 0:
+            continue
+        for rank, result in enumerate(results, start=1):
+            key = result.content_hash or result.content
+            entry = fused.get(key)
+            if entry is None:
+                fused[key] = [weight / (k + rank), len(fused), result, {leg: rank}]
+            elif leg not in entry[3]:  # a leg counts once per document, at its best rank
+                entry[0] += weight / (k + rank)
+                entry[3][leg] = rank
+
+    # Highest score first; ties go to the document seen first
+    top = heapq.nsmallest(limit, fused.values(), key=lambda e: (-e[0], e[1]))
+    return [replace(result, score=score, ranks=ranks) for score, _, result, ranks in top]
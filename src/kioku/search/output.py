@@ -0,0 +1,145 @@
+"""Output shaping for search responses — detail levels, projection and a byte budget."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+
+# Per-result keys available at each detail level
+DETAIL_FIELDS: dict[str, tuple[str, ...]] = {
+    "ids": ("id", "date", "score", "source"),
+    "snippet": ("id", "content", "date", "mood", "score", "source"),
+    "full": ("id", "content", "date", "mood", "score", "source", "ranks"),
+}
+
+
+@dataclass(frozen=True)
+class OutputSpec:
+    """How much of each search result to return.
+
+    detail:     "ids" (ids + scores, no text, no graph context), "snippet"
+                (content shortened to `snippet_chars`) or "full".
+    fields:     Optional subset of the result keys for the chosen detail level.
+    max_bytes:  Optional cap on the serialized response size. Items are admitted
+                one by one while the response is built; once the next one would
+                not fit, the rest are left out and the response is marked
+                `truncated`.
+    """
+
+    detail: str = "full"
+    fields: tuple[str, ...] | None = None
+    max_bytes: int | None = None
+    snippet_chars: int = 200
+
+    def __post_init__(self) -> None:
+        if self.detail not in DETAIL_FIELDS:
+            raise ValueError(
+                f"detail must be one of {', '.join(DETAIL_FIELDS)} (got {self.detail!r})"
+            )
+        if self.fields is not None:
+            unknown = set(self.fields) - set(DETAIL_FIELDS[self.detail])
+            if unknown:
+                raise ValueError(
+                    f"fields {sorted(unknown)} are not available at detail={self.detail!r}"
+                )
+
+    @property
+    def result_fields(self) -> tuple[str, ...]:
+        available = DETAIL_FIELDS[self.detail]
+        if self.fields is None:
+            return available
+        return tuple(f for f in available if f in self.fields)
+
+    def text(self, text: str) -> str:
+        """Apply the detail level to a memory body."""
+        if self.detail == "snippet":
+            return snippet(text, self.snippet_chars)
+        return text
+
+
+def snippet(text: str, max_chars: int) -> str:
+    """Shorten text to at most `max_chars`, cutting at a word boundary when possible."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    space = cut.rfind(" ")
+    if space > max_chars // 2:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def to_json(obj) -> str:
+    """Compact JSON (no whitespace) — the serialization `max_bytes` is measured on.
+
+    Anything that honors `max_bytes` must print responses with this; indented
+    output is larger than the budget accounts for.
+    """
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _size(obj) -> int:
+    return len(to_json(obj).encode())
+
+
+class ResponseBudget:
+    """Running byte count for a response that is assembled incrementally.
+
+    Sizes are measured on `to_json` output. With no limit every item is admitted.
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self.truncated = False
+
+    def reserve(self, obj) -> None:
+        """Account for something that is always sent (e.g. the response envelope)."""
+        if self.max_bytes is not None:
+            self.used += _size(obj)
+
+    def admit(self, obj) -> bool:
+        """Admit `obj` if it fits (plus a separator); once one item is refused, all later ones are."""
+        if self.max_bytes is None:
+            return True
+        if self.truncated:
+            return False
+        size = _size(obj) + 1
+        if self.used + size > self.max_bytes:
+            self.truncated = True
+            return False
+        self.used += size
+        return True
+
+
+# Lists a finished response can shed items from, lowest priority first
+_TRIM_ORDER = (
+    ("connections",),
+    ("graph_context", "evidence"),
+    ("graph_context", "nodes"),
+    ("results",),
+)
+
+
+def trim_to_budget(response: dict, max_bytes: int | None) -> dict:
+    """Drop trailing items, lowest priority first, until `response` fits in `max_bytes`.
+
+    For keys added after a response was assembled under a ResponseBudget. Marks
+    the response `truncated` when anything is dropped and keeps `count` in step
+    with `results`.
+    """
+    if max_bytes is None or _size(response) <= max_bytes:
+        return response
+    response["truncated"] = True
+    excess = _size(response) - max_bytes
+    for path in _TRIM_ORDER:
+        parent = response
+        for key in path[:-1]:
+            parent = parent.get(key) or {}
+        items = parent.get(path[-1]) or []
+        while items and excess > 0:
+            excess -= _size(items.pop())
+        if excess <= 0:
+            break
+    if "count" in response:
+        response["count"] = len(response.get("results", []))
+    return response
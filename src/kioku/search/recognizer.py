@@ -0,0 +1,72 @@
+"""Local dictionary-based query entity recognizer.
+
+Matches query text against canonical entity names and their SAME_AS aliases
+with a token trie, so the common case (the query names an entity the graph
+already knows) resolves in microseconds instead of an LLM round trip.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+from kioku.search.stopwords import STOPWORDS
+
+_END = "\0"  # trie terminal key → canonical name
+
+
+def _tokenize(text: str) -> list[str]:
+    """Lowercased word tokens, NFC-normalized so decomposed Vietnamese diacritics stay in-word.
+
+    Uses the same `\\w` definition as the word-boundary regex in `search/graph.py`,
+    so a match here is always a whole-word match there too.
+    """
+    return re.findall(r"\w+", unicodedata.normalize("NFC", text).lower())
+
+
+class EntityRecognizer:
+    """Token-trie matcher over canonical entity names and aliases."""
+
+    def __init__(self, canonical: list[dict]):
+        """Build the trie from `get_canonical_entities()` rows (ordered by mentions desc)."""
+        self._trie: dict = {}
+        self.size = 0
+        for entity in canonical:
+            name = entity.get("name")
+            if not name:
+                continue
+            for surface in [name, *entity.get("aliases", [])]:
+                tokens = _tokenize(surface)
+                if not tokens:
+                    continue
+                # A lone stopword / 1-char token would match almost every query
+                if len(tokens) == 1 and (tokens[0] in STOPWORDS or len(tokens[0]) < 2):
+                    continue
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                if _END not in node:  # first (most mentioned) entity wins a shared surface form
+                    node[_END] = name
+                    self.size += 1
+
+    def match(self, text: str) -> list[str]:
+        """Return canonical names found in `text`, longest match first, in query order."""
+        tokens = _tokenize(text)
+        found: list[str] = []
+        i = 0
+        while i < len(tokens):
+            node = self._trie
+            best, best_end = None, i
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if _END in node:
+                    best, best_end = node[_END], j
+            if best is None:
+                i += 1
+                continue
+            if best not in found:
+                found.append(best)
+            i = best_end
+        return found
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from kioku.search.bm25 import SearchResult
+from kioku.search.fusion import fuse
 
 
 def rrf_rerank(
@@ -19,28 +20,7 @@ def rrf_rerank(
 
     Returns:
         Merged and reranked list of SearchResult.
-    """
-    # content -> (best SearchResult, accumulated RRF score)
-    scores: dict[str, tuple[SearchResult, float]] = {}
-
-    for results in result_lists:
-        for rank_pos, result in enumerate(results):
-            rrf_score = 1.0 / (k + rank_pos + 1)
-            key = result.content  # Dedupe by content
-
-            if key in scores:
-                existing_result, existing_score = scores[key]
-                scores[key] = (existing_result, existing_score + rrf_score)
-            else:
-                scores[key] = (result, rrf_score)
 
-    # Sort by accumulated RRF score (descending)
-    ranked = sorted(scores.values(), key=lambda x: x[1], reverse=True)
-
-    # Update score on results and return
-    output = []
-    for result, score in ranked[:limit]:
-        result.score = score
-        output.append(result)
-
-    return output
+    Thin wrapper over `fusion.fuse` with equal weights; legs are named by position.
+    """
+    return fuse({str(i): results for i, results in enumerate(result_lists)}, k=k, limit=limit)
@@ -0,0 +1,84 @@
+"""Adaptive query router — decides which search legs are worth running.
+
+Routing uses signals that are already available before the expensive legs
+start: the BM25 result list (score margin between the top two hits), whether
+the query resolved to graph entities, and whether a temporal range was
+detected in the query text.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from kioku.search.bm25 import SearchResult
+
+ALL_LEGS = ("bm25", "vector", "graph")
+
+
+@dataclass(frozen=True)
+class Route:
+    """Which legs to run for a query, and why."""
+
+    name: str  # "entity", "keyword", "temporal" or "full"
+    legs: tuple[str, ...]
+    reason: str
+
+
+def bm25_margin(results: list[SearchResult]) -> float:
+    """Gap between the best and second-best BM25 score (scores are normalized to 0–1).
+
+    A single hit has the maximum margin of 1.0; no hits has a margin of 0.0.
+    Because scores are relative to the top hit, a lone hit says nothing about
+    how good it is — `route_query` does not treat it as decisive.
+    """
+    if not results:
+        return 0.0
+    if len(results) == 1:
+        return 1.0
+    return max(0.0, results[0].score - results[1].score)
+
+
+def route_query(
+    query: str,
+    bm25_results: list[SearchResult],
+    entities: list[str] | None,
+    temporal: bool,
+    margin_threshold: float = 0.5,
+    max_keyword_terms: int = 4,
+    min_keyword_hits: int = 2,
+) -> Route:
+    """Pick the legs to run for a query.
+
+    - entity:   entities matched → all legs (graph seeds are the point of the query)
+    - keyword:  short query whose top BM25 hit clearly beats at least one other hit
+                → BM25 only (a single, possibly incidental, hit never qualifies)
+    - temporal: a time phrase was detected → BM25 + vector (graph edges rarely add
+                anything once results are restricted to a date range)
+    - full:     everything else → all legs
+    """
+    if entities:
+        return Route("entity", ALL_LEGS, f"entities={entities}")
+
+    margin = bm25_margin(bm25_results)
+    terms = len(query.split())
+    if (
+        len(bm25_results) >= min_keyword_hits
+        and terms <= max_keyword_terms
+        and margin >= margin_threshold
+    ):
+        return Route("keyword", ("bm25",), f"margin={margin:.2f} terms={terms}")
+
+    if temporal:
+        return Route("temporal", ("bm25", "vector"), "temporal range detected")
+
+    return Route("full", ALL_LEGS, f"margin={margin:.2f} hits={len(bm25_results)}")
+
+
+def leg_hit_stats(legs: dict[str, list], fused: list[SearchResult]) -> dict[str, dict[str, int]]:
+    """Per-leg candidate counts and how many fused results each leg contributed to."""
+    stats = {name: {"hits": len(results), "in_top": 0} for name, results in legs.items()}
+    for result in fused:
+        for leg in result.ranks:
+            if leg in stats:
+                stats[leg]["in_top"] += 1
+    return stats
@@ -6,14 +6,40 @@ from kioku.pipeline.vector_writer import VectorStore
 from kioku.search.bm25 import SearchResult
 
 
-def vector_search(store: VectorStore, query: str, limit: int = 20) -> list[SearchResult]:
+def vector_search(
+    store: VectorStore,
+    query: str,
+    limit: int = 20,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    tags: list[str] | None = None,
+    mood: str | None = None,
+) -> list[SearchResult]:
     """Run semantic vector search and return unified SearchResults.
 
     ChromaDB returns cosine distances (0 = identical, 2 = opposite).
     We convert to similarity scores (1 = identical, 0 = opposite).
+    The optional date range, tags and mood are pushed into the Chroma `where` clause.
     """
-    raw_results = store.search(query, limit=limit)
+    raw_results = store.search(
+        query, limit=limit, date_from=date_from, date_to=date_to, tags=tags, mood=mood
+    )
+    return _to_results(raw_results)
 
+
+def vector_search_many(
+    store: VectorStore,
+    queries: list[str],
+    limit: int = 20,
+    date_from: str | None = None,
+    date_to: str | None = None,
+) -> list[list[SearchResult]]:
+    """Batched `vector_search`: one embedding call and one Chroma query for all queries."""
+    raw = store.search_many(queries, limit=limit, date_from=date_from, date_to=date_to)
+    return [_to_results(hits) for hits in raw]
+
+
+def _to_results(raw_results: list[dict]) -> list[SearchResult]:
     if not raw_results:
         return []
 
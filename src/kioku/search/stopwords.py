@@ -0,0 +1,14 @@
+"""Query stopwords shared by graph seed extraction and the entity recognizer."""
+
+# Vietnamese stopwords (common words that rarely match useful entities)
+# fmt: off
+STOPWORDS = frozenset({
+    "là", "và", "của", "có", "cho", "với", "được", "này", "đó", "các",
+    "một", "những", "trong", "để", "từ", "theo", "về", "hay", "hoặc",
+    "nhưng", "mà", "nếu", "khi", "thì", "đã", "sẽ", "đang", "rồi",
+    "nào", "gì", "thế", "sao", "tại", "vì", "bị", "do", "qua", "lại",
+    "như", "hơn", "nhất", "rất", "quá", "cũng", "vẫn", "còn", "chỉ",
+    "tôi", "anh", "em", "bạn", "mình", "chúng", "họ", "ai",
+    "the", "is", "are", "was", "were", "what", "who", "how", "why",
+})
+# fmt: on
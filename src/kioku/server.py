@@ -10,14 +10,22 @@ except ImportError:
     )
 
 from kioku.service import KiokuService
+from kioku.singleflight import SingleFlight
 
 # Initialize service (single source of truth for all business logic)
 _svc = KiokuService()
 
+# Concurrent identical read calls (agent retries, agents sharing a tenant) share one execution
+_inflight = SingleFlight()
+
 # Create MCP server
 mcp = FastMCP(
     "Kioku",
-    instructions="Personal memory agent — save and search your life memories with tri-hybrid search.",
+    instructions=(
+        "Personal memory agent — save and search your life memories with tri-hybrid search. "
+        "For questions about people, places or events, prefer resolve_and_search: it maps "
+        "the question to known entities and searches in one call."
+    ),
 )
 
 
@@ -47,6 +55,14 @@ def search_memories(
     date_from: str | None = None,
     date_to: str | None = None,
     entities: list[str] | None = None,
+    deadline_ms: int | None = None,
+    detail: str = "full",
+    fields: list[str] | None = None,
+    max_bytes: int | None = None,
+    paginate: bool = False,
+    cursor: str | None = None,
+    tags: list[str] | None = None,
+    mood: str | None = None,
 ) -> dict:
     """Search through all saved memories using tri-hybrid search (BM25 + Vector + KG).
 
@@ -62,24 +78,148 @@ def search_memories(
                   If the user's question mentions specific people, places, or topics,
                   extract and pass them here for more precise KG results.
                   Example: ["Mẹ", "Hùng"] for "mẹ tôi và sếp Hùng ai khắt khe hơn?"
+        deadline_ms: Optional latency budget in milliseconds. When it runs out, slower
+                  stages (entity extraction, vector/graph legs, graph context, path
+                  finding) are skipped and listed in the response's `skipped` field.
+        detail: "full" (default), "snippet" (bodies shortened — usually enough to answer)
+                  or "ids" (ids, dates and scores only, no graph context).
+        fields: Optional subset of result keys, e.g. ["content", "date"].
+        max_bytes: Optional cap on the response size; lower-ranked items are left out
+                  and the response is marked `truncated`.
+        paginate: Set to true to page through results. The response carries a
+                  `next_cursor` (null on the last page).
+        cursor:   Pass a `next_cursor` to get the next `limit` results of that search
+                  without searching again. Other filters are taken from the first call.
+        tags:     Only memories carrying any of these tags (see list_facets).
+        mood:     Only memories with exactly this mood, e.g. "stressed".
+    """
+    key = (
+        "search_memories",
+        query,
+        limit,
+        date_from,
+        date_to,
+        tuple(entities) if entities else None,
+        deadline_ms,
+        detail,
+        tuple(fields) if fields else None,
+        max_bytes,
+        paginate,
+        cursor,
+        tuple(tags) if tags else None,
+        mood,
+    )
+    return _inflight.do(
+        key,
+        lambda: _svc.search_memories(
+            query,
+            limit=limit,
+            date_from=date_from,
+            date_to=date_to,
+            entities=entities,
+            deadline_ms=deadline_ms,
+            detail=detail,
+            fields=fields,
+            max_bytes=max_bytes,
+            paginate=paginate,
+            cursor=cursor,
+            tags=tags,
+            mood=mood,
+        ),
+    )
+
+
+@mcp.tool()
+def resolve_and_search(
+    query: str,
+    limit: int = 10,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    deadline_ms: int | None = None,
+    detail: str = "full",
+    fields: list[str] | None = None,
+    max_bytes: int | None = None,
+) -> dict:
+    """Answer a question about specific people, places, events or topics in one call.
+
+    Resolves the entities mentioned in the question against the knowledge graph
+    server-side, then runs the entity-focused search. Returns the search results
+    plus only the entities actually used — no need to call list_entities first.
+
+    Args:
+        query: The user's question or keywords, e.g. "mẹ tôi và sếp Hùng ai khắt khe hơn?".
+        limit: Maximum number of results to return (default 10).
+        date_from: Optional start date filter (YYYY-MM-DD).
+        date_to: Optional end date filter (YYYY-MM-DD).
+        deadline_ms: Optional latency budget in milliseconds (see search_memories).
+        detail, fields, max_bytes: Output shaping, as in search_memories.
+    """
+    key = (
+        "resolve_and_search",
+        query,
+        limit,
+        date_from,
+        date_to,
+        deadline_ms,
+        detail,
+        tuple(fields) if fields else None,
+        max_bytes,
+    )
+    return _inflight.do(
+        key,
+        lambda: _svc.resolve_and_search(
+            query,
+            limit=limit,
+            date_from=date_from,
+            date_to=date_to,
+            deadline_ms=deadline_ms,
+            detail=detail,
+            fields=fields,
+            max_bytes=max_bytes,
+        ),
+    )
+
+
+@mcp.tool()
+def search_memories_many(
+    queries: list[str],
+    limit: int = 10,
+    date_from: str | None = None,
+    date_to: str | None = None,
+) -> dict:
+    """Run several related searches in one call (e.g. the sub-questions of a multi-part answer).
+
+    Cheaper than calling search_memories repeatedly: all queries share one embedding
+    batch, one vector query, graph traversals and one database hydration pass.
+
+    Args:
+        queries: The search queries (questions or keywords), 1–6 is typical.
+        limit: Maximum number of results per query (default 10).
+        date_from: Optional start date filter (YYYY-MM-DD) applied to every query.
+        date_to: Optional end date filter (YYYY-MM-DD) applied to every query.
     """
-    return _svc.search_memories(query, limit=limit, date_from=date_from, date_to=date_to, entities=entities)
+    return _inflight.do(
+        ("search_memories_many", tuple(queries), limit, date_from, date_to),
+        lambda: _svc.search_memories_many(
+            queries, limit=limit, date_from=date_from, date_to=date_to
+        ),
+    )
 
 
 @mcp.tool()
 def list_entities(limit: int = 50) -> dict:
     """List top canonical entities from the knowledge graph with their types.
 
-    IMPORTANT: Call this BEFORE search_memories when the user asks about specific
-    people, places, events, or concepts. Use the returned entity names to populate
-    the `entities` parameter of search_memories for precise KG results.
+    Use this to browse the entity vocabulary, or to pick names for the `entities`
+    parameter of search_memories. For answering a question, resolve_and_search
+    does the entity lookup and the search in a single call.
 
     Entity types include: person, family, event, concept, place, organization, etc.
 
     Args:
         limit: Maximum entities to return (default 50, ordered by mention count).
     """
-    return _svc.list_entities(limit=limit)
+    return _inflight.do(("list_entities", limit), lambda: _svc.list_entities(limit=limit))
 
 
 @mcp.tool()
@@ -88,16 +228,67 @@ def get_timeline(
     end_date: str | None = None,
     limit: int = 50,
     sort_by: str = "processing_time",
+    cursor: str | None = None,
+    tags: list[str] | None = None,
+    mood: str | None = None,
 ) -> dict:
     """Get a chronologically ordered sequence of memories from SQLite Database.
 
+    Returns the latest `limit` entries in the range. To go further back, call again
+    with the response's `next_cursor` (null once the range is exhausted).
+
     Args:
         start_date: Start date (YYYY-MM-DD) inclusive.
         end_date: End date (YYYY-MM-DD) inclusive.
         limit: Max number of entries to return (default 50).
         sort_by: "processing_time" (default — when recorded) or "event_time" (when event actually happened).
+        cursor: `next_cursor` from the previous page.
+        tags: Only memories carrying any of these tags.
+        mood: Only memories with exactly this mood.
     """
-    return _svc.get_timeline(start_date=start_date, end_date=end_date, limit=limit, sort_by=sort_by)
+    return _inflight.do(
+        (
+            "get_timeline",
+            start_date,
+            end_date,
+            limit,
+            sort_by,
+            cursor,
+            tuple(tags) if tags else None,
+            mood,
+        ),
+        lambda: _svc.get_timeline(
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            sort_by=sort_by,
+            cursor=cursor,
+            tags=tags,
+            mood=mood,
+        ),
+    )
+
+
+@mcp.tool()
+def list_facets(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    limit: int = 50,
+) -> dict:
+    """Count memories per tag and per mood, most frequent first.
+
+    Use it to see which tags and moods exist before filtering search_memories or
+    get_timeline by `tags`/`mood`, or to answer "how often" questions directly.
+
+    Args:
+        start_date: Optional start date (YYYY-MM-DD) inclusive.
+        end_date: Optional end date (YYYY-MM-DD) inclusive.
+        limit: Maximum values per facet (default 50).
+    """
+    return _inflight.do(
+        ("list_facets", start_date, end_date, limit),
+        lambda: _svc.get_facets(start_date=start_date, end_date=end_date, limit=limit),
+    )
 
 
 # ─── Resources ─────────────────────────────────────────────────────────────
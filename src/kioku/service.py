@@ -2,9 +2,16 @@
 
 from __future__ import annotations
 
+import copy
+import dataclasses
 import hashlib
 import logging
 import re
+import secrets
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 
 from kioku.config import Settings
@@ -14,15 +21,41 @@ from kioku.pipeline.graph_writer import FalkorGraphStore, InMemoryGraphStore
 from kioku.pipeline.keyword_writer import KeywordIndex
 from kioku.pipeline.vector_writer import VectorStore
 from kioku.search.bm25 import bm25_search
+from kioku.search.cache import TTLCache
+from kioku.search.context import SearchContext
+from kioku.search.deadline import Deadline
+from kioku.search.fanout import fan_out
+from kioku.search.fusion import fuse
 from kioku.search.graph import graph_search
-from kioku.search.reranker import rrf_rerank
-from kioku.search.semantic import vector_search
+from kioku.search.output import OutputSpec, ResponseBudget, trim_to_budget
+from kioku.search.recognizer import EntityRecognizer
+from kioku.search.router import leg_hit_stats, route_query
+from kioku.search.semantic import vector_search, vector_search_many
 from kioku.storage.markdown import save_entry
 
 log = logging.getLogger(__name__)
 
 JST = timezone(timedelta(hours=7))
 
+# Every stage a search deadline can record under `skipped`
+_SKIPPABLE_STAGES = ("entity_extraction", "bm25", "vector", "graph", "graph_context", "connections")
+
+
+@dataclass
+class _Retrieval:
+    """Fused results and selected graph evidence for one query, before hydration."""
+
+    query: str
+    entities: list[str]
+    results: list
+    graph_nodes: dict[str, dict] = field(default_factory=dict)
+    top_edges: list = field(default_factory=list)
+    enriched: bool = False
+    route: str = ""  # router decision, when the router is enabled
+
+    def content_hashes(self) -> list[str]:
+        return [r.content_hash for r in self.results] + [e.source_hash for e in self.top_edges]
+
 
 class KiokuService:
     """Core business logic for Kioku — shared by MCP server and CLI."""
@@ -34,7 +67,9 @@ class KiokuService:
         self.settings.ensure_dirs()
 
         # SQLite FTS5
-        self.keyword_index = KeywordIndex(self.settings.sqlite_path)
+        self.keyword_index = KeywordIndex(
+            self.settings.sqlite_path, read_connections=self.settings.sqlite_read_connections
+        )
 
         # Vector store — try Ollama, fallback to FakeEmbedder
         try:
@@ -55,6 +90,7 @@ class KiokuService:
                 host=self.settings.falkordb_host,
                 port=self.settings.falkordb_port,
                 graph_name=self.settings.falkordb_graph,
+                snapshot_ttl=self.settings.entity_snapshot_ttl,
             )
             _ = self.graph_store.graph
             log.info("Using FalkorDB graph store")
@@ -70,6 +106,33 @@ class KiokuService:
             log.warning("No Anthropic API key, using FakeExtractor (rule-based)")
             self.extractor = FakeExtractor()
 
+        # Query → entity names from the LLM, keyed by (normalized query, graph version)
+        self._query_entity_cache = TTLCache(
+            maxsize=self.settings.query_entity_cache_size,
+            ttl=self.settings.query_entity_cache_ttl,
+        )
+
+        # Whole search_memories responses, keyed on the SQLite write generation (opt-in)
+        self._search_cache = TTLCache(
+            maxsize=self.settings.search_cache_size,
+            ttl=self.settings.search_cache_ttl,
+        )
+
+        # Fused rankings of paged searches, keyed by the cursor token
+        self._cursor_cache = TTLCache(
+            maxsize=self.settings.search_cursor_cache_size,
+            ttl=self.settings.search_cursor_ttl,
+        )
+
+        # Local query entity recognizer, rebuilt when the graph version changes
+        self._recognizer: EntityRecognizer | None = None
+        self._recognizer_version = -1
+
+        # Worker pool for concurrent search legs
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.settings.search_workers, thread_name_prefix="kioku-search"
+        )
+
     def _init_vector_store(self, embedder) -> VectorStore:
         """Initialize ChromaDB with mode: server, embedded, or auto-detect."""
         s = self.settings
@@ -179,6 +242,7 @@ class KiokuService:
             timestamp=entry.timestamp,
             mood=mood or "",
             content_hash=content_hash,
+            tags=tags,
             event_time=event_time or "",
         )
 
@@ -196,6 +260,13 @@ class KiokuService:
         except Exception as e:
             log.warning("Vector indexing failed: %s", e)
 
+        # All stores are written — invalidate cached search responses (the insert
+        # trigger already bumped it, this covers searches that raced the save)
+        try:
+            self.keyword_index.bump_generation()
+        except Exception as e:
+            log.warning("Generation bump failed: %s", e)
+
         return {
             "status": "saved",
             "timestamp": entry.timestamp,
@@ -250,6 +321,146 @@ class KiokuService:
 
         return None, None
 
+    def _local_recognizer(self) -> EntityRecognizer:
+        """Return the dictionary recognizer for the current canonical entity set."""
+        version = getattr(self.graph_store, "version", 0)
+        if self._recognizer is None or self._recognizer_version != version:
+            canonical = self.graph_store.get_canonical_entities(
+                limit=self.settings.query_entity_vocab_size
+            )
+            self._recognizer = EntityRecognizer(canonical)
+            self._recognizer_version = version
+        return self._recognizer
+
+    def _resolve_query_entities(self, query: str) -> list[str] | None:
+        """Resolve query text to canonical entity names.
+
+        Mode (settings.query_entity_mode):
+          - "llm":    always ask Claude
+          - "local":  dictionary match only (no LLM call)
+          - "hybrid": dictionary match first, Claude only when nothing matches
+        """
+        mode = self.settings.query_entity_mode
+        if mode in ("local", "hybrid"):
+            try:
+                matched = self._local_recognizer().match(query)
+            except Exception as e:
+                log.warning("Local entity recognition failed: %s", e)
+                matched = []
+            if matched:
+                log.info("Auto-extracted entities (local match): %s", matched)
+                return matched
+            if mode == "local":
+                return None
+        return self._auto_extract_entities(query)
+
+    def _resolve_entities_within(
+        self, query: str, deadline: Deadline, future: Future | None = None
+    ) -> list[str] | None:
+        """Resolve query entities, giving up once half the remaining budget is used.
+
+        The other half is left for the search legs. A resolution that is cut short
+        keeps running in the pool, so its LLM answer still lands in the entity cache.
+        `future` is a resolution already submitted for this query (batched search).
+        """
+        if future is None and not deadline.enabled:
+            return self._resolve_query_entities(query)
+        if deadline.expired:
+            deadline.skip("entity_extraction")
+            return None
+        if future is None:
+            future = self._executor.submit(self._resolve_query_entities, query)
+        try:
+            return future.result(timeout=deadline.remaining() / 2 if deadline.enabled else None)
+        except FutureTimeout:
+            log.warning("Entity extraction cut short by the search deadline")
+        except Exception as e:
+            log.warning("Entity extraction failed: %s", e)
+        deadline.skip("entity_extraction")
+        return None
+
+    def _auto_extract_entities(self, query: str) -> list[str] | None:
+        """Map the query onto canonical graph entities with one LLM call.
+
+        Results are cached (LRU + TTL) by normalized query and the graph store's
+        version stamp, so any upsert that changes the canonical entities
+        invalidates earlier answers. Failed calls are not cached.
+        """
+        cache_key = (" ".join(query.lower().split()), getattr(self.graph_store, "version", 0))
+        cached = self._query_entity_cache.get(cache_key)
+        if cached is not None:
+            log.info("Auto-extracted entities (cached): %s", cached)
+            return list(cached) or None
+
+        try:
+            canonical = self.graph_store.get_canonical_entities(limit=50)
+
+            # Build context: PERSON/PLACE/EVENT entities + aliases (key for name mapping)
+            entity_lines = []
+            for e in canonical:
+                if e.get("type") in ("PERSON", "PLACE", "EVENT", "ORGANIZATION", ""):
+                    alias_part = ""
+                    if e.get("aliases"):
+                        alias_part = "|aliases:" + ",".join(e["aliases"][:4])
+                    entity_lines.append(e["name"] + alias_part)
+
+            # User identity hint from settings (helps for pronouns/full-names)
+            user_hint = getattr(self.settings, "user_identity", "") or ""
+
+            entity_map_str = ", ".join(entity_lines[:30]) if entity_lines else "(empty)"
+
+            search_prompt = (
+                f"Graph entities: {entity_map_str}\n"
+                + (f"Diary owner: {user_hint}\n" if user_hint else "")
+                + f"Query: {query}\n"
+                "Return a JSON array of entity name strings to search for. "
+                "Use canonical names from the graph (not aliases). "
+                "Use Vietnamese if query is Vietnamese. "
+                'Example output: ["m\u1eb9", "TBV"]\n'
+                "Output:"
+            )
+
+            msg = [{"role": "user", "content": search_prompt}]
+            resp = self.extractor.client.messages.create(
+                model=self.extractor.model,
+                max_tokens=256,
+                messages=msg,
+            )
+            raw = resp.content[0].text.strip()
+            import json as _json
+            entities: list[str] = []
+            start_idx = raw.find("[")
+            end_idx = raw.rfind("]")
+            if start_idx != -1 and end_idx != -1:
+                auto_entities = _json.loads(raw[start_idx:end_idx + 1])
+                if isinstance(auto_entities, list):
+                    entities = [str(e) for e in auto_entities if e]
+                    log.info("Auto-extracted entities (search prompt): %s", entities)
+        except Exception as e:
+            log.warning("Entity auto-extraction failed: %s", e)
+            return None
+
+        self._query_entity_cache.set(cache_key, tuple(entities))
+        return entities or None
+
+    def _leg_timeouts(self) -> dict[str, float]:
+        """Per-leg timeouts (seconds) for the concurrent search fan-out."""
+        s = self.settings
+        return {
+            "bm25": s.search_timeout_bm25,
+            "vector": s.search_timeout_vector,
+            "graph": s.search_timeout_graph,
+        }
+
+    def _leg_weights(self) -> dict[str, float]:
+        """Per-leg weights for rank fusion."""
+        s = self.settings
+        return {
+            "bm25": s.search_weight_bm25,
+            "vector": s.search_weight_vector,
+            "graph": s.search_weight_graph,
+        }
+
     def search_memories(
         self,
         query: str,
@@ -257,6 +468,14 @@ class KiokuService:
         date_from: str | None = None,
         date_to: str | None = None,
         entities: list[str] | None = None,
+        deadline_ms: int | None = None,
+        detail: str = "full",
+        fields: list[str] | None = None,
+        max_bytes: int | None = None,
+        paginate: bool = False,
+        cursor: str | None = None,
+        tags: list[str] | None = None,
+        mood: str | None = None,
     ) -> dict:
         """Search through all saved memories using tri-hybrid search.
 
@@ -266,60 +485,207 @@ class KiokuService:
             entities: Optional list of entity names pre-extracted by Agent.
                       If provided, graph_search uses them as seeds directly
                       instead of tokenizing the query. Improves KG precision.
+            deadline_ms: Optional latency budget. Once it is spent, entity extraction,
+                      the vector/graph legs, graph-context enrichment and path finding
+                      are skipped or cut short; the response lists them in `skipped`.
+            detail:   "ids" (ids + scores, no text or graph context — skips hydration),
+                      "snippet" (shortened bodies) or "full" (default).
+            fields:   Optional subset of per-result keys to return.
+            max_bytes: Optional cap on the serialized response size; items beyond it
+                      are left out while assembling and the response is marked `truncated`.
+            paginate: Return the first page of a paged search. Up to `search_page_pool`
+                      fused candidates are kept under the response's `next_cursor`.
+            cursor:   `next_cursor` from a previous page. The next `limit` results are
+                      sliced from that search's ranking (query, dates and entities of
+                      this call are ignored); graph context is only on the first page.
+            tags:     Only memories carrying any of these tags. Pushed into SQLite
+                      (memory_tags index) and Chroma `where`; graph hits and evidence
+                      are checked against SQLite.
+            mood:     Only memories with exactly this mood (pushed down the same way).
         """
+        deadline = Deadline(deadline_ms)
+        spec = self._output_spec(detail, fields, max_bytes)
+        facets = {"tags": list(tags) if tags else None, "mood": mood or None}
+        if paginate or cursor:
+            return self._search_page(
+                query, limit, date_from, date_to, entities, deadline, spec, cursor, **facets
+            )
+        args = (query, limit, date_from, date_to, entities, deadline, spec)
+        if self._search_cache.maxsize <= 0:
+            return self._search_memories(*args, **facets)
+
+        try:
+            generation = self.keyword_index.generation()
+        except Exception as e:
+            log.warning("Search cache bypassed, generation unavailable: %s", e)
+            return self._search_memories(*args, **facets)
+
+        # Today's date is part of the key: temporal phrases resolve relative to it.
+        # Budgeted and unbudgeted answers differ in shape ("skipped"), so never share.
+        key = (
+            query,
+            limit,
+            date_from,
+            date_to,
+            tuple(entities) if entities else None,
+            spec,
+            tuple(tags) if tags else None,
+            mood or None,
+            deadline_ms is not None,
+            datetime.now(JST).strftime("%Y-%m-%d"),
+            generation,
+            getattr(self.graph_store, "version", 0),
+        )
+        cached = self._search_cache.get(key)
+        if cached is None:
+            cached = self._search_memories(*args, **facets)
+            if not cached.get("skipped"):  # never serve a degraded answer from cache
+                self._search_cache.set(key, cached)
+        # Callers may mutate the response; never hand out the cached object
+        return copy.deepcopy(cached)
+
+    def _search_memories(
+        self,
+        query: str,
+        limit: int,
+        date_from: str | None,
+        date_to: str | None,
+        entities: list[str] | None,
+        deadline: Deadline,
+        spec: OutputSpec,
+        tags: list[str] | None = None,
+        mood: str | None = None,
+    ) -> dict:
+        # Request-scoped memo: graph leg, enrichment and hydration share fetched subgraphs
+        ctx = SearchContext(self.graph_store, self.keyword_index)
+        retrieval = self._retrieve(
+            query, limit, date_from, date_to, entities, deadline, ctx, tags=tags, mood=mood
+        )
+        # ids-only responses carry no text, so there is nothing to hydrate
+        hydrated = {}
+        if spec.detail != "ids":
+            hydrated = self._hydrate(retrieval.content_hashes(), ctx=ctx)
+        return self._assemble(retrieval, hydrated, ctx, deadline, spec)
+
+    def _search_page(
+        self,
+        query: str,
+        limit: int,
+        date_from: str | None,
+        date_to: str | None,
+        entities: list[str] | None,
+        deadline: Deadline,
+        spec: OutputSpec,
+        cursor: str | None,
+        tags: list[str] | None = None,
+        mood: str | None = None,
+    ) -> dict:
+        """One page of a paged search; legs and fusion only run for the first page."""
+        ctx = SearchContext(self.graph_store, self.keyword_index)
+        if cursor is None:
+            retrieval = self._retrieve(
+                query, limit, date_from, date_to, entities, deadline, ctx,
+                pool=self.settings.search_page_pool, tags=tags, mood=mood,
+            )
+            token, offset = secrets.token_urlsafe(12), 0
+            self._cursor_cache.set(token, retrieval)
+        else:
+            token, _, raw_offset = cursor.partition(".")
+            retrieval = self._cursor_cache.get(token)
+            if retrieval is None or not raw_offset.isdigit():
+                raise ValueError("Search cursor is invalid or has expired; run the search again")
+            offset = int(raw_offset)
+
+        page = dataclasses.replace(retrieval, results=retrieval.results[offset:offset + limit])
+        if offset:
+            page = dataclasses.replace(page, graph_nodes={}, top_edges=[], enriched=False)
+        hydrated = {}
+        if spec.detail != "ids":
+            hydrated = self._hydrate(page.content_hashes(), ctx=ctx)
+        # Room for the cursor, which is only known once the page is assembled
+        longest_cursor = {"next_cursor": f"{token}.{len(retrieval.results)}"}
+        response = self._assemble(page, hydrated, ctx, deadline, spec, trailing=longest_cursor)
+
+        # Continue after the last result actually returned (max_bytes may cut the page);
+        # always advance so a result too large for the budget cannot stall paging
+        end = offset + max(response["count"], 1)
+        response["next_cursor"] = f"{token}.{end}" if end < len(retrieval.results) else None
+        return response
+
+    def _output_spec(
+        self, detail: str, fields: list[str] | None, max_bytes: int | None
+    ) -> OutputSpec:
+        return OutputSpec(
+            detail=detail,
+            fields=tuple(fields) if fields else None,
+            max_bytes=max_bytes,
+            snippet_chars=self.settings.search_snippet_chars,
+        )
+
+    def _retrieve(
+        self,
+        query: str,
+        limit: int,
+        date_from: str | None,
+        date_to: str | None,
+        entities: list[str] | None,
+        deadline: Deadline,
+        ctx: SearchContext,
+        vector_candidates: list | None = None,
+        pool: int | None = None,
+        tags: list[str] | None = None,
+        mood: str | None = None,
+        entities_future: Future | None = None,
+    ) -> _Retrieval:
+        """Run the search legs, fuse them and pick graph evidence — everything but hydration.
+
+        `vector_candidates` are precomputed vector hits (limit*5) for this query,
+        as produced by a batched search; when given, no vector search is issued.
+        `entities_future` is an entity resolution already in flight for this query.
+        `pool` deepens the legs and the fused list beyond `limit` (paged search);
+        the graph evidence budget is still sized for one page of `limit` results.
+        `tags`/`mood` go into the BM25 SQL and the Chroma `where`; graph hits and
+        evidence edges are filtered on their source memory afterwards.
+        """
+        depth = max(limit, pool or 0)
         clean_query = re.sub(r"[^\w\s]", " ", query)
 
         # Detect temporal patterns and auto-set date range for timeline routing
+        temporal = False
         if not date_from and not date_to:
             date_from, date_to = self._extract_temporal_range(query)
+            temporal = bool(date_from or date_to)
+
+        # Date range is pushed down into every leg (FTS5 SQL, Chroma where, graph
+        # traversal), so each leg only fetches in-range candidates
+        date_range = {"date_from": date_from, "date_to": date_to}
+        facets = {"tags": tags, "mood": mood}
+        vector_opts = {**date_range, **facets}
+        # BM25 hits carry a snippet, not the body; _hydrate fetches full text for the top-k
+        bm25_opts = {
+            **vector_opts,
+            "snippet_tokens": self.settings.search_bm25_snippet_tokens or None,
+        }
 
-        # Auto-extract entities from query if not provided
-        if not entities:
-            try:
-                canonical = self.graph_store.get_canonical_entities(limit=50)
-
-                # Build context: PERSON/PLACE/EVENT entities + aliases (key for name mapping)
-                entity_lines = []
-                for e in canonical:
-                    if e.get("type") in ("PERSON", "PLACE", "EVENT", "ORGANIZATION", ""):
-                        alias_part = ""
-                        if e.get("aliases"):
-                            alias_part = "|aliases:" + ",".join(e["aliases"][:4])
-                        entity_lines.append(e["name"] + alias_part)
-
-                # User identity hint from settings (helps for pronouns/full-names)
-                user_hint = getattr(self.settings, "user_identity", "") or ""
-
-                entity_map_str = ", ".join(entity_lines[:30]) if entity_lines else "(empty)"
-
-                search_prompt = (
-                    f"Graph entities: {entity_map_str}\n"
-                    + (f"Diary owner: {user_hint}\n" if user_hint else "")
-                    + f"Query: {query}\n"
-                    "Return a JSON array of entity name strings to search for. "
-                    "Use canonical names from the graph (not aliases). "
-                    "Use Vietnamese if query is Vietnamese. "
-                    'Example output: ["m\u1eb9", "TBV"]\n'
-                    "Output:"
+        # Speculative legs: while entities are resolved (possibly an LLM call), start
+        # the query-text BM25 leg and one vector search (embedding + ANN) that both
+        # modes reuse — entity mode filters it, default mode keeps the top limit*3
+        speculative: dict = {}
+        if not entities and self.settings.search_speculative:
+            speculative["bm25"] = self._executor.submit(
+                bm25_search, self.keyword_index, clean_query, limit=depth * 3, **bm25_opts
+            )
+            # With the router on, the vector leg waits for the routing decision instead
+            if vector_candidates is None and not self.settings.search_router:
+                speculative["vector"] = self._executor.submit(
+                    vector_search, self.vector_store, query, limit=depth * 5, **vector_opts
                 )
+        if vector_candidates is not None:
+            speculative["vector"] = lambda: vector_candidates
 
-                msg = [{"role": "user", "content": search_prompt}]
-                resp = self.extractor.client.messages.create(
-                    model=self.extractor.model,
-                    max_tokens=256,
-                    messages=msg,
-                )
-                raw = resp.content[0].text.strip()
-                import json as _json
-                start_idx = raw.find("[")
-                end_idx = raw.rfind("]")
-                if start_idx != -1 and end_idx != -1:
-                    auto_entities = _json.loads(raw[start_idx:end_idx + 1])
-                    if isinstance(auto_entities, list):
-                        entities = [str(e) for e in auto_entities if e]
-                        log.info("Auto-extracted entities (search prompt): %s", entities)
-            except Exception as e:
-                log.warning("Entity auto-extraction failed: %s", e)
+        # Auto-extract entities from query if not provided
+        if not entities:
+            entities = self._resolve_entities_within(query, deadline, entities_future)
 
         if entities:
             # Entity-focused mode: all 3 legs target the same entities
@@ -327,81 +693,139 @@ class KiokuService:
             import re as _re
             safe_entities = [_re.sub(r'[&|*"^()]', ' ', e).strip() for e in entities]
             bm25_query = " ".join(e for e in safe_entities if e)
-            bm25_results = bm25_search(self.keyword_index, bm25_query, limit=limit * 3) if bm25_query else []
-
-            # Vector: search with original query but filter to entity-relevant results
-            vec_all = vector_search(self.vector_store, query, limit=limit * 5)
             entity_lower = [e.lower() for e in entities]
-            vec_results = [
-                r for r in vec_all
-                if any(ent in r.content.lower() for ent in entity_lower)
-            ]
 
-            # Graph: use entities as seeds directly
-            kg_results = graph_search(self.graph_store, query, limit=limit * 3, entities=entities)
+            # The query-text BM25 leg is not used in entity mode
+            if "bm25" in speculative:
+                speculative["bm25"].cancel()
+
+            legs = {
+                "bm25": lambda: (
+                    bm25_search(self.keyword_index, bm25_query, limit=depth * 3, **bm25_opts)
+                    if bm25_query else []
+                ),
+                # Vector: search with original query, filtered to entity-relevant results below
+                "vector": speculative.get("vector") or (
+                    lambda: vector_search(self.vector_store, query, limit=depth * 5, **vector_opts)
+                ),
+                # Graph: use entities as seeds directly
+                "graph": lambda: graph_search(
+                    ctx, query, limit=depth * 3, entities=entities, **date_range
+                ),
+            }
         else:
             # Default mode: standard tri-hybrid
-            bm25_results = bm25_search(self.keyword_index, clean_query, limit=limit * 3)
-            vec_results = vector_search(self.vector_store, query, limit=limit * 3)
-            kg_results = graph_search(self.graph_store, query, limit=limit * 3)
-
-        results = rrf_rerank(bm25_results, vec_results, kg_results, limit=limit)
-
-        if date_from or date_to:
-            filtered = []
-            for r in results:
-                if date_from and r.date and r.date < date_from:
-                    continue
-                if date_to and r.date and r.date > date_to:
+            legs = {
+                "bm25": speculative.get("bm25") or (
+                    lambda: bm25_search(
+                        self.keyword_index, clean_query, limit=depth * 3, **bm25_opts
+                    )
+                ),
+                "vector": speculative.get("vector") or (
+                    lambda: vector_search(self.vector_store, query, limit=depth * 3, **vector_opts)
+                ),
+                "graph": lambda: graph_search(ctx, query, limit=depth * 3, **date_range),
+            }
+
+        timeouts = self._leg_timeouts()
+
+        # Router: run BM25 first and let its score margin, the entity match and the
+        # temporal signal decide whether the vector and graph legs are worth running
+        route = None
+        if self.settings.search_router:
+            if not entities:
+                bm25_leg = legs["bm25"]
+                try:
+                    if isinstance(bm25_leg, Future):
+                        bm25_first = bm25_leg.result(timeout=timeouts["bm25"])
+                    else:
+                        bm25_first = bm25_leg()
+                except Exception as e:
+                    log.warning("Search leg 'bm25' failed before routing: %s", e)
+                    bm25_first = []
+                legs["bm25"] = lambda: bm25_first
+            else:
+                bm25_first = []
+            route = route_query(
+                query,
+                bm25_first,
+                entities,
+                temporal,
+                margin_threshold=self.settings.search_router_margin,
+            )
+            for name in [n for n in legs if n not in route.legs]:
+                leg = legs.pop(name)
+                if isinstance(leg, Future):
+                    leg.cancel()
+            log.info("Search route=%s (%s) legs=%s", route.name, route.reason, list(route.legs))
+
+        # Out of budget: answer from BM25 alone. Otherwise the vector and graph
+        # legs may run until the deadline; BM25 keeps its own timeout as the floor.
+        if deadline.expired:
+            for name in ("vector", "graph"):
+                leg = legs.pop(name, None)
+                if leg is None:
                     continue
-                filtered.append(r)
-            results = filtered
-
-        # Phase 7: Hydrate from SQLite via content_hash (deduplicated)
-        hashes = list({r.content_hash for r in results if r.content_hash})
-        hydrated = {}
-        if hashes:
-            try:
-                hydrated = self.keyword_index.get_by_hashes(hashes)
-            except Exception as e:
-                log.warning("Search hydration failed: %s", e)
+                if isinstance(leg, Future):
+                    leg.cancel()
+                deadline.skip(name)
+        elif deadline.enabled:
+            for name in ("vector", "graph"):
+                timeouts[name] = deadline.clamp(timeouts[name])
+
+        # Run all three legs concurrently; a slow or failed leg is dropped
+        dropped: list[str] = []
+        leg_results = fan_out(self._executor, legs, timeouts=timeouts, dropped=dropped)
+        if deadline.enabled:
+            for name in dropped:
+                deadline.skip(name)
+        bm25_results = leg_results["bm25"]
+        vec_results = leg_results.get("vector", [])
+        kg_results = leg_results.get("graph", [])
+        if kg_results and (tags or mood):
+            # Graph edges know nothing about tags or moods; check their source memories
+            allowed = self.keyword_index.filter_hashes(
+                [r.content_hash for r in kg_results], **facets
+            )
+            kg_results = [r for r in kg_results if r.content_hash in allowed]
 
-        output_results = []
-        for r in results:
-            # If we have hydrated data, use it for authoritative content
-            if r.content_hash and r.content_hash in hydrated:
-                entry = hydrated[r.content_hash]
-                output_results.append({
-                    "content": entry["text"],
-                    "date": entry.get("date", r.date),
-                    "mood": entry.get("mood", r.mood),
-                    "score": round(r.score, 4),
-                    "source": r.source,
-                })
-            else:
-                output_results.append({
-                    "content": r.content,
-                    "date": r.date,
-                    "mood": r.mood,
-                    "score": round(r.score, 4),
-                    "source": r.source,
-                })
+        if entities:
+            vec_results = [
+                r for r in vec_results
+                if any(ent in r.content.lower() for ent in entity_lower)
+            ]
+        else:
+            vec_results = vec_results[: depth * 3]
 
-        response: dict = {
-            "query": query,
-            "entities_used": entities or [],
-            "count": len(output_results),
-            "results": output_results,
-        }
+        results = fuse(
+            {"bm25": bm25_results, "vector": vec_results, "graph": kg_results},
+            weights=self._leg_weights(),
+            k=self.settings.search_rrf_k,
+            limit=depth,
+        )
+        log.info(
+            "Search leg hits for %r: %s",
+            query,
+            leg_hit_stats({"bm25": bm25_results, "vector": vec_results, "graph": kg_results}, results),
+        )
 
-        # Enrich with graph context when entities are provided
-        if entities:
+        # Graph context (entity mode): pick the evidence edges before hydrating so
+        # their source memories are fetched in the same batch as the text results
+        graph_nodes: dict[str, dict] = {}
+        top_edges: list = []
+        enriched = False
+        if entities and deadline.expired:
+            deadline.skip("graph_context")
+        elif entities:
             try:
-                graph_nodes: dict[str, dict] = {}
+                # Same date range and at most the graph leg's limit, so this is served
+                # from the memo (sliced to 20) when graph_search traversed these seeds
+                traversals = ctx.traverse_many(
+                    entities, max_hops=2, limit=min(20, depth * 3), **date_range
+                )
                 all_edges: list = []
-
                 for ent in entities:
-                    traversal = self.graph_store.traverse(ent, max_hops=2, limit=20)
+                    traversal = traversals[ent]
                     for n in traversal.nodes:
                         if n.name not in graph_nodes:
                             graph_nodes[n.name] = {
@@ -410,65 +834,291 @@ class KiokuService:
                                 "mention_count": n.mention_count,
                             }
                     all_edges.extend(traversal.edges)
+                if tags or mood:
+                    allowed = self.keyword_index.filter_hashes(
+                        [e.source_hash for e in all_edges], **facets
+                    )
+                    all_edges = [e for e in all_edges if e.source_hash in allowed]
 
                 # Budget: total heavyweight entries (text + graph evidence) ≤ 20
-                evidence_budget = max(0, 20 - len(output_results))
+                evidence_budget = max(0, 20 - min(len(results), limit))
 
                 # Dedup edges: skip those already in text results
                 text_hashes = {r.content_hash for r in results if r.content_hash}
-                unique_edges = []
                 seen_edge_hashes: set[str] = set()
                 for e in sorted(all_edges, key=lambda x: x.weight, reverse=True):
+                    if len(top_edges) >= evidence_budget:
+                        break
                     h = e.source_hash
                     if h and h not in text_hashes and h not in seen_edge_hashes:
                         seen_edge_hashes.add(h)
-                        unique_edges.append(e)
-
-                # Hydrate top-N unique edges from SQLite
-                top_edges = unique_edges[:evidence_budget]
-                edge_hashes = [e.source_hash for e in top_edges if e.source_hash]
-                edge_hydrated = {}
-                if edge_hashes:
-                    try:
-                        edge_hydrated = self.keyword_index.get_by_hashes(edge_hashes)
-                    except Exception:
-                        pass
-
-                graph_evidence = []
-                for e in top_edges:
-                    entry = edge_hydrated.get(e.source_hash, {}) if e.source_hash else {}
-                    graph_evidence.append({
-                        "source": e.source,
-                        "target": e.target,
-                        "type": e.rel_type,
-                        "weight": round(e.weight, 2),
-                        "evidence": entry.get("text", e.evidence or ""),
-                    })
-
-                response["graph_context"] = {
-                    "nodes": list(graph_nodes.values()),
-                    "evidence": graph_evidence,
-                }
+                        top_edges.append(e)
+                enriched = True
+            except Exception as e:
+                log.warning("Graph context enrichment failed: %s", e)
+
+        return _Retrieval(
+            query,
+            entities or [],
+            results,
+            graph_nodes,
+            top_edges,
+            enriched,
+            route=route.name if route else "",
+        )
 
-                # Find paths between entity pairs (when 2+ entities)
-                if len(entities) >= 2:
+    def _assemble(
+        self,
+        retrieval: _Retrieval,
+        hydrated: dict,
+        ctx: SearchContext,
+        deadline: Deadline,
+        spec: OutputSpec | None = None,
+        trailing: dict | None = None,
+    ) -> dict:
+        """Build the search response from a retrieval and its hydrated memories.
+
+        `spec` sets the detail level, field projection and byte budget. Items are
+        admitted in priority order (results, graph nodes, evidence, connections)
+        while the response is built, so an oversized response is never serialized.
+        `trailing` holds keys the caller adds afterwards, at their largest, so the
+        budget keeps room for them.
+        """
+        spec = spec or OutputSpec()
+        query, entities, results = retrieval.query, retrieval.entities, retrieval.results
+        top_edges = retrieval.top_edges
+        fields = spec.result_fields
+
+        response: dict = {
+            "query": query,
+            "entities_used": entities,
+            "count": 0,
+            "results": [],
+        }
+        if retrieval.route:
+            response["route"] = retrieval.route
+        budget = ResponseBudget(spec.max_bytes)
+        # Envelope plus room for the trailing count/skipped/truncated keys
+        budget.reserve(response)
+        budget.reserve({"graph_context": {"nodes": [], "evidence": []}, "truncated": True})
+        if deadline.enabled:
+            budget.reserve({"skipped": list(_SKIPPABLE_STAGES)})
+        if trailing:
+            budget.reserve(trailing)
+
+        output_results = response["results"]
+        for r in results:
+            # If we have hydrated data, use it for authoritative content
+            entry = hydrated.get(r.content_hash) if r.content_hash else None
+            item = {
+                "id": r.content_hash,
+                "content": spec.text(entry["text"] if entry else r.content),
+                "date": entry.get("date", r.date) if entry else r.date,
+                "mood": entry.get("mood", r.mood) if entry else r.mood,
+                "score": round(r.score, 4),
+                "source": r.source,
+                "ranks": r.ranks,
+            }
+            item = {f: item[f] for f in fields}
+            if not budget.admit(item):
+                break
+            output_results.append(item)
+        response["count"] = len(output_results)
+
+        # ids-only responses carry no graph context
+        if retrieval.enriched and spec.detail != "ids":
+            nodes = []
+            for node in retrieval.graph_nodes.values():
+                if not budget.admit(node):
+                    break
+                nodes.append(node)
+
+            graph_evidence = []
+            for e in top_edges:
+                entry = hydrated.get(e.source_hash, {})
+                item = {
+                    "source": e.source,
+                    "target": e.target,
+                    "type": e.rel_type,
+                    "weight": round(e.weight, 2),
+                    "evidence": spec.text(entry.get("text", e.evidence or "")),
+                }
+                if not budget.admit(item):
+                    break
+                graph_evidence.append(item)
+
+            response["graph_context"] = {
+                "nodes": nodes,
+                "evidence": graph_evidence,
+            }
+
+            # Find paths between entity pairs (when 2+ entities)
+            if len(entities) >= 2 and not budget.truncated:
+                try:
                     connections = []
-                    for i in range(len(entities)):
-                        for j in range(i + 1, len(entities)):
-                            path_result = self.graph_store.find_path(entities[i], entities[j])
-                            if path_result.paths:
-                                connections.append({
-                                    "from": entities[i],
-                                    "to": entities[j],
-                                    "paths": path_result.paths,
-                                })
+                    pairs = [
+                        (entities[i], entities[j])
+                        for i in range(len(entities))
+                        for j in range(i + 1, len(entities))
+                    ]
+                    for a, b in pairs:
+                        if deadline.expired:
+                            deadline.skip("connections")
+                            break
+                        path_result = ctx.find_path(a, b)
+                        if path_result.paths:
+                            item = {
+                                "from": a,
+                                "to": b,
+                                "paths": path_result.paths,
+                            }
+                            if not budget.admit(item):
+                                break
+                            connections.append(item)
                     if connections:
                         response["connections"] = connections
+                except Exception as e:
+                    log.warning("Graph context enrichment failed: %s", e)
+
+        if budget.truncated:
+            response["truncated"] = True
+        if deadline.enabled:
+            response["skipped"] = deadline.skipped
+        return response
 
+    def resolve_and_search(
+        self,
+        query: str,
+        limit: int = 10,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        deadline_ms: int | None = None,
+        detail: str = "full",
+        fields: list[str] | None = None,
+        max_bytes: int | None = None,
+    ) -> dict:
+        """Resolve the query's entities server-side and run the entity-mode search in one call.
+
+        Entities come from the local canonical-entity matcher, with the LLM as
+        fallback (see `query_entity_mode`). Instead of the whole vocabulary, the
+        response carries only the entities actually used, with their type and
+        mention count, under `entities`.
+        """
+        result = self.search_memories(
+            query,
+            limit=limit,
+            date_from=date_from,
+            date_to=date_to,
+            deadline_ms=deadline_ms,
+            detail=detail,
+            fields=fields,
+            max_bytes=max_bytes,
+        )
+        used = result.get("entities_used") or []
+        details: list[dict] = []
+        if used:
+            try:
+                canonical = {
+                    e["name"].lower(): e
+                    for e in self.graph_store.get_canonical_entities(
+                        limit=self.settings.query_entity_vocab_size
+                    )
+                }
             except Exception as e:
-                log.warning("Graph context enrichment failed: %s", e)
+                log.warning("Entity lookup failed: %s", e)
+                canonical = {}
+            for name in used:
+                entry = canonical.get(name.lower(), {})
+                details.append({
+                    "name": entry.get("name", name),
+                    "type": entry.get("type", ""),
+                    "mentions": entry.get("mentions", 0),
+                })
+        result["entities"] = details
+        # The entity details were not part of the assembled response's budget
+        return trim_to_budget(result, max_bytes)
 
-        return response
+    def search_memories_many(
+        self,
+        queries: list[str],
+        limit: int = 10,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> dict:
+        """Run several searches as one batch.
+
+        Queries are embedded with one `embed_batch` call and sent to Chroma as one
+        multi-query request per distinct date range. Graph traversals are shared
+        through one SearchContext, and every result and evidence memory is
+        hydrated in a single SQLite pass. Entities are resolved for all queries
+        concurrently, so LLM round trips overlap instead of adding up. Each entry
+        in `searches` has the same shape as a `search_memories` response.
+        """
+        queries = [q for q in queries if q and q.strip()]
+        if not queries:
+            return {"count": 0, "searches": []}
+
+        deadline = Deadline()
+        entity_futures = [self._executor.submit(self._resolve_query_entities, q) for q in queries]
+
+        # Effective date range per query (explicit range, else temporal phrases)
+        ranges = [
+            (date_from, date_to) if date_from or date_to else self._extract_temporal_range(q)
+            for q in queries
+        ]
+
+        # One batched vector search per distinct date range (limit*5 serves both modes)
+        candidates: list[list | None] = [None] * len(queries)
+        by_range: dict[tuple, list[int]] = {}
+        for i, r in enumerate(ranges):
+            by_range.setdefault(r, []).append(i)
+        for (d_from, d_to), idxs in by_range.items():
+            try:
+                batch = vector_search_many(
+                    self.vector_store,
+                    [queries[i] for i in idxs],
+                    limit=limit * 5,
+                    date_from=d_from,
+                    date_to=d_to,
+                )
+            except Exception as e:
+                log.warning("Batched vector search failed: %s", e)
+                batch = [[] for _ in idxs]
+            for i, hits in zip(idxs, batch):
+                candidates[i] = hits
+
+        ctx = SearchContext(self.graph_store, self.keyword_index)
+        retrievals = []
+        for i, query in enumerate(queries):
+            d_from, d_to = ranges[i]
+            retrievals.append(
+                self._retrieve(
+                    query, limit, d_from, d_to, None, deadline, ctx,
+                    vector_candidates=candidates[i],
+                    entities_future=entity_futures[i],
+                )
+            )
+
+        hashes = [h for r in retrievals for h in r.content_hashes()]
+        hydrated = self._hydrate(hashes, ctx=ctx)
+        searches = [self._assemble(r, hydrated, ctx, deadline) for r in retrievals]
+        return {"count": len(searches), "searches": searches}
+
+    def _hydrate(self, content_hashes: list[str], ctx: SearchContext | None = None) -> dict:
+        """Fetch every memory a response needs with a single batched SQLite lookup.
+
+        Blank and duplicate hashes are dropped; failures degrade to an empty
+        mapping so callers fall back to the content carried by the index hit.
+        """
+        hashes = list(dict.fromkeys(h for h in content_hashes if h))
+        if not hashes:
+            return {}
+        try:
+            source = ctx if ctx is not None else self.keyword_index
+            return source.get_by_hashes(hashes)
+        except Exception as e:
+            log.warning("Hydration from SQLite failed: %s", e)
+            return {}
 
     def recall_related(self, entity: str, max_hops: int = 2, limit: int = 10) -> dict:
         """Recall everything related to a person, place, topic, or event.
@@ -477,14 +1127,8 @@ class KiokuService:
         """
         result = self.graph_store.traverse(entity, max_hops=max_hops, limit=limit)
 
-        # Phase 7: Collect source_hashes from edges for O(1) hydration
-        source_hashes = list({e.source_hash for e in result.edges if e.source_hash})
-        hydrated = {}
-        if source_hashes:
-            try:
-                hydrated = self.keyword_index.get_by_hashes(source_hashes)
-            except Exception as e:
-                log.warning("Hydration from SQLite failed: %s", e)
+        # Phase 7: Hydrate source memories from edge source_hashes in one batch
+        hydrated = self._hydrate([e.source_hash for e in result.edges])
 
         return {
             "entity": entity,
@@ -526,14 +1170,8 @@ class KiokuService:
         """
         result = self.graph_store.find_path(entity_a, entity_b)
 
-        # Phase 7: Collect source_hashes for hydration
-        source_hashes = list({e.source_hash for e in result.edges if e.source_hash})
-        hydrated = {}
-        if source_hashes:
-            try:
-                hydrated = self.keyword_index.get_by_hashes(source_hashes)
-            except Exception as e:
-                log.warning("Explain hydration failed: %s", e)
+        # Phase 7: Hydrate source memories from edge source_hashes in one batch
+        hydrated = self._hydrate([e.source_hash for e in result.edges])
 
         return {
             "from": entity_a,
@@ -587,22 +1225,60 @@ class KiokuService:
         end_date: str | None = None,
         limit: int = 50,
         sort_by: str = "processing_time",
+        cursor: str | None = None,
+        tags: list[str] | None = None,
+        mood: str | None = None,
     ) -> dict:
         """Get a chronologically ordered sequence of memories.
 
+        Returns the latest `limit` entries of the range; pass the response's
+        `next_cursor` back as `cursor` to get the page before them.
+
         Args:
             sort_by: "processing_time" (when recorded) or "event_time" (when it happened).
+            tags: Only memories carrying any of these tags.
+            mood: Only memories with exactly this mood.
         """
-        entries = self.keyword_index.get_timeline(
+        entries, next_cursor = self.keyword_index.timeline_page(
             start_date,
             end_date,
             limit,
             sort_by=sort_by,
+            cursor=cursor,
+            tags=tags,
+            mood=mood,
         )
         return {
             "count": len(entries),
             "sort_by": sort_by,
             "timeline": entries,
+            "next_cursor": next_cursor,
+        }
+
+    def iter_timeline(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        sort_by: str = "processing_time",
+        tags: list[str] | None = None,
+        mood: str | None = None,
+    ) -> Iterator[dict]:
+        """Stream every memory in the range, oldest first (for exports)."""
+        return self.keyword_index.iter_timeline(
+            start_date, end_date, sort_by=sort_by, tags=tags, mood=mood
+        )
+
+    def get_facets(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        limit: int = 50,
+    ) -> dict:
+        """Count memories per tag and per mood, most frequent first."""
+        counts = self.keyword_index.facet_counts(start_date, end_date, limit)
+        return {
+            "tags": [{"tag": tag, "count": n} for tag, n in counts["tags"]],
+            "moods": [{"mood": mood, "count": n} for mood, n in counts["moods"]],
         }
 
     # ─── Resources ───────────────────────────────────────────────────────
@@ -691,4 +1367,5 @@ Please synthesize:
 
     def close(self) -> None:
         """Clean up resources."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
         self.keyword_index.close()
@@ -55,6 +55,143 @@ class TestKeywordIndex:
         keyword_index.index(content="Text B", date="2026-02-22", timestamp="t2")
         assert keyword_index.count() == 2
 
+    def test_get_by_hashes_batches_and_pads(self, keyword_index):
+        import hashlib
+
+        hashes = []
+        for i in range(9):  # crosses the first placeholder bucket (8)
+            text = f"Entry {i}"
+            keyword_index.index(content=text, date="2026-02-22", timestamp="t", tags=[f"t{i}"])
+            hashes.append(hashlib.sha256(text.encode()).hexdigest())
+
+        rows = keyword_index.get_by_hashes(hashes + hashes[:2] + ["", "missing"])
+        assert set(rows) == set(hashes)
+        assert rows[hashes[3]]["text"] == "Entry 3"
+        assert rows[hashes[3]]["tags"] == ["t3"]
+        assert dict(rows[hashes[0]])["event_time"] == ""
+
+    def test_hash_chunks_pad_to_buckets_within_variable_limit(self):
+        from kioku.pipeline.keyword_writer import _MAX_VARIABLES, _hash_chunks
+
+        hashes = [f"h{i}" for i in range(600)]
+        chunks = list(_hash_chunks(hashes))
+        assert [len(params) for _, params in chunks] == [512, 128]
+        assert all(p.count("?") == len(params) for p, params in chunks)
+        assert [h for _, params in chunks for h in params if h] == hashes
+        # Variables bound elsewhere in the statement shrink the chunks
+        for _, params in _hash_chunks(hashes, reserved=700):
+            assert len(params) + 700 <= _MAX_VARIABLES
+
+    def test_generation_bumps_on_insert_only(self, keyword_index):
+        start = keyword_index.generation()
+        keyword_index.index(content="Text A", date="2026-02-22", timestamp="t1")
+        keyword_index.index(content="Text A", date="2026-02-22", timestamp="t2")  # dup
+        assert keyword_index.generation() == start + 1
+        assert keyword_index.bump_generation() == start + 2
+
+    def test_generation_shared_across_connections(self, keyword_index):
+        other = KeywordIndex(keyword_index.db_path)
+        other.index(content="From another process", date="2026-02-22", timestamp="t1")
+        other.close()
+        assert keyword_index.generation() == 1
+
+    @pytest.mark.parametrize("defer_fts", [False, True])
+    def test_index_many(self, keyword_index, defer_fts):
+        first = keyword_index.index("Đi ăn phở", "2026-02-20", "2026-02-20T12:00:00+07:00")
+        entries = [
+            {"content": "Đi ăn phở", "date": "2026-02-20", "timestamp": "t1"},  # stored
+            {"content": "Sáng đi gym", "date": "2026-02-21", "timestamp": "t2", "mood": "ok"},
+            {"content": "Sáng đi gym", "date": "2026-02-21", "timestamp": "t3"},  # in batch
+            {"content": "Gọi cho mẹ", "date": "2026-02-22", "timestamp": "t4", "tags": ["mẹ"]},
+        ]
+        ids = keyword_index.index_many(entries, defer_fts=defer_fts)
+
+        assert ids[0] == ids[2] == -1
+        assert first < ids[1] < ids[3]
+        assert keyword_index.count() == 3
+        assert keyword_index.search("gym")[0].mood == "ok"
+        assert len(keyword_index.search("mẹ")) == 1
+        assert keyword_index.get_by_date("2026-02-22")[0]["tags"] == ["mẹ"]
+        assert keyword_index.generation() == 3
+        # The insert trigger is back for later single-row writes
+        keyword_index.index("Đọc sách buổi tối", "2026-02-23", "t5")
+        assert len(keyword_index.search("sách")) == 1
+
+    def test_index_many_rolls_back_on_error(self, keyword_index):
+        import sqlite3
+
+        entries = [
+            {"content": "Sáng đi gym", "date": "2026-02-21", "timestamp": "t1"},
+            {"content": None, "content_hash": "x", "date": "2026-02-21", "timestamp": "t2"},
+        ]
+        with pytest.raises(sqlite3.IntegrityError):
+            keyword_index.index_many(entries, defer_fts=True)
+        assert keyword_index.index_many([]) == []
+        assert keyword_index.count() == 0
+        # The suspended FTS trigger was restored by the rollback
+        keyword_index.index("Sáng đi gym", "2026-02-21", "t1")
+        assert len(keyword_index.search("gym")) == 1
+
+    def test_index_many_after_duplicate_index(self, keyword_index):
+        keyword_index.index(content="Same text", date="2026-02-22", timestamp="t1")
+        assert keyword_index.index(content="Same text", date="2026-02-22", timestamp="t2") == -1
+        ids = keyword_index.index_many(
+            [{"content": "Text B", "date": "2026-02-22", "timestamp": "t3"}]
+        )
+        assert ids[0] > 0
+        assert keyword_index.count() == 2
+        assert not keyword_index.conn.in_transaction
+
+
+class TestConcurrentAccess:
+    def test_wal_and_read_only_readers(self, keyword_index):
+        import sqlite3
+
+        assert keyword_index.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        with keyword_index._readers.connection() as conn, pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM memories")
+
+    def test_reads_proceed_during_open_write(self, populated_index):
+        import sqlite3
+
+        # Another process (e.g. the CLI) holds the write lock mid-transaction
+        other = sqlite3.connect(populated_index.db_path)
+        other.execute("BEGIN IMMEDIATE")
+        other.execute(
+            "INSERT INTO memories (content, date, timestamp, content_hash) "
+            "VALUES ('phở chưa commit', '2026-02-23', 't', 'h')"
+        )
+        try:
+            assert populated_index.count() == 6  # not blocked, uncommitted row invisible
+            assert len(bm25_search(populated_index, "phở")) == 1
+        finally:
+            other.commit()
+            other.close()
+        assert populated_index.count() == 7
+
+    def test_read_pool_is_bounded_and_shared_across_threads(self, tmp_path):
+        from concurrent.futures import ThreadPoolExecutor
+
+        idx = KeywordIndex(tmp_path / "pool.db", read_connections=2)
+        idx.index("Sáng đi gym", "2026-02-21", "2026-02-21T07:00:00+07:00")
+        with ThreadPoolExecutor(8) as pool:
+            counts = list(pool.map(lambda _: idx.count(), range(64)))
+        assert counts == [1] * 64
+        assert len(idx._readers._all) <= 2
+        idx.close()
+
+    def test_duplicate_insert_leaves_no_open_transaction(self, keyword_index):
+        import sqlite3
+
+        keyword_index.index(content="Same text", date="2026-02-22", timestamp="t1")
+        assert keyword_index.index(content="Same text", date="2026-02-22", timestamp="t2") == -1
+        assert not keyword_index.conn.in_transaction
+        # A second process can take the write lock straight away
+        other = sqlite3.connect(keyword_index.db_path, timeout=0)
+        other.execute("BEGIN IMMEDIATE")
+        other.rollback()
+        other.close()
+
 
 class TestBM25Search:
     def test_search_keyword_match(self, populated_index):
@@ -72,6 +209,30 @@ class TestBM25Search:
         assert len(results) >= 1
         assert "Linh" in results[0].content
 
+    def test_search_results_carry_content_hash(self, populated_index):
+        import hashlib
+
+        results = bm25_search(populated_index, "Linh")
+        assert results[0].content_hash == hashlib.sha256(results[0].content.encode()).hexdigest()
+
+    def test_search_snippet_mode(self, keyword_index):
+        body = " ".join(f"từ{i}" for i in range(100)) + " Keychron " + "cuối " * 100
+        keyword_index.index(body, "2026-03-01", "2026-03-01T09:00:00+07:00")
+
+        full = keyword_index.search("Keychron")[0]
+        snip = keyword_index.search("Keychron", snippet_tokens=8, mark=("[", "]"))[0]
+        assert full.content == body
+        assert "[Keychron]" in snip.content
+        assert len(snip.content) < 100
+        assert snip.content_hash == full.content_hash
+        assert snip.rank == full.rank
+
+    def test_bm25_search_snippet_hydrates_to_full_text(self, populated_index):
+        results = bm25_search(populated_index, "phở", snippet_tokens=3)
+        full = populated_index.get_by_hashes([results[0].content_hash])
+        assert results[0].content != full[results[0].content_hash]["text"]
+        assert "phở" in results[0].content
+
     def test_search_no_results(self, populated_index):
         results = bm25_search(populated_index, "xyznotexist123")
         assert len(results) == 0
@@ -85,3 +246,239 @@ class TestBM25Search:
     def test_search_limit(self, populated_index):
         results = bm25_search(populated_index, "cảm thấy", limit=2)
         assert len(results) <= 2
+
+    def test_search_date_range_in_sql(self, populated_index):
+        # limit=1 would return an out-of-range hit if the range were applied afterwards
+        results = bm25_search(
+            populated_index, "stressed", limit=1, date_from="2026-02-22", date_to="2026-02-22"
+        )
+        assert len(results) == 1
+        assert results[0].date == "2026-02-22"
+
+    def test_search_date_from_only(self, populated_index):
+        results = bm25_search(populated_index, "cảm thấy", date_from="2026-02-21")
+        assert results
+        assert all(r.date >= "2026-02-21" for r in results)
+
+
+class TestSchemaMigrations:
+    def _plan(self, index, sql, params=()):
+        return " | ".join(r[3] for r in index.conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+    def test_fresh_database_is_migrated_once(self, keyword_index):
+        from kioku.pipeline.keyword_writer import _MIGRATIONS
+
+        assert keyword_index.schema_version() == len(_MIGRATIONS)
+        again = KeywordIndex(keyword_index.db_path)
+        assert again.schema_version() == len(_MIGRATIONS)
+        again.close()
+
+    def test_legacy_database_gains_indexes(self, tmp_path):
+        import sqlite3
+
+        db = tmp_path / "legacy.db"
+        conn = sqlite3.connect(db)
+        conn.execute(
+            "CREATE TABLE memories (id INTEGER PRIMARY KEY AUTOINCREMENT, content TEXT NOT NULL, "
+            "date TEXT NOT NULL, mood TEXT DEFAULT '', timestamp TEXT NOT NULL, "
+            "content_hash TEXT UNIQUE NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO memories (content, date, timestamp, content_hash) "
+            "VALUES ('Đi ăn phở', '2026-02-20', '2026-02-20T12:00:00+07:00', 'h')"
+        )
+        conn.commit()
+        conn.close()
+
+        idx = KeywordIndex(db)
+        names = {
+            r[0] for r in idx.conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+        assert {
+            "idx_memories_date_ts",
+            "idx_memories_timestamp",
+            "idx_memories_event_time",
+        } <= names
+        assert idx.get_by_date("2026-02-20")[0]["text"] == "Đi ăn phở"
+        idx.close()
+
+    def test_date_access_paths_use_indexes(self, populated_index):
+        plan = self._plan(populated_index, "SELECT DISTINCT date FROM memories ORDER BY date DESC")
+        assert "COVERING INDEX idx_memories_date_ts" in plan
+
+        plan = self._plan(
+            populated_index,
+            "SELECT content, date, mood, timestamp, tags, event_time FROM memories "
+            "WHERE date = ? ORDER BY timestamp ASC",
+            ("2026-02-20",),
+        )
+        assert "USING INDEX idx_memories_date_ts (date=?)" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.parametrize(
+        ("start", "end", "sort_by", "index"),
+        [
+            (None, None, "processing_time", "idx_memories_timestamp"),
+            ("2026-02-20", "2026-02-21", "processing_time", "idx_memories_date_ts"),
+            (None, None, "event_time", "idx_memories_event_time"),
+            ("2026-02-20", None, "event_time", "idx_memories_event_time"),
+        ],
+    )
+    def test_timeline_uses_indexes(self, populated_index, start, end, sort_by, index):
+        sql, params = KeywordIndex._timeline_query(start, end, 50, sort_by)
+        plan = self._plan(populated_index, sql, params)
+        assert f"INDEX {index}" in plan
+        # Unbounded timelines walk an index in order; none may fall back to a table scan
+        assert "SCAN memories" not in plan.split(" | ")
+
+
+class TestTimelinePaging:
+    @pytest.fixture
+    def timeline_index(self, keyword_index):
+        # Pairs of entries share a timestamp, so paging must break ties on id
+        keyword_index.index_many(
+            {
+                "content": f"Ghi chú {i}",
+                "date": f"2026-01-{i // 2 + 1:02d}",
+                "timestamp": f"2026-01-{i // 2 + 1:02d}T09:00:00+07:00",
+            }
+            for i in range(11)
+        )
+        return keyword_index
+
+    def test_pages_walk_back_without_gaps(self, timeline_index):
+        seen, cursor = [], None
+        while True:
+            page, cursor = timeline_index.timeline_page(limit=3, cursor=cursor)
+            seen = [e["text"] for e in page] + seen
+            if cursor is None:
+                break
+        assert seen == [f"Ghi chú {i}" for i in range(11)]
+        assert timeline_index.get_timeline(limit=3) == timeline_index.timeline_page(limit=3)[0]
+
+    def test_cursor_unaffected_by_new_entries(self, timeline_index):
+        _, cursor = timeline_index.timeline_page(limit=4)
+        before, _ = timeline_index.timeline_page(limit=4, cursor=cursor)
+        timeline_index.index("Ghi chú mới", "2026-01-31", "2026-01-31T09:00:00+07:00")
+        after, _ = timeline_index.timeline_page(limit=4, cursor=cursor)
+        assert after == before
+
+    def test_iter_timeline_streams_oldest_first(self, timeline_index):
+        stream = timeline_index.iter_timeline(start_date="2026-01-02", batch_size=2)
+        assert [e["text"] for e in stream] == [f"Ghi chú {i}" for i in range(2, 11)]
+
+    def test_invalid_cursor(self, timeline_index):
+        with pytest.raises(ValueError):
+            timeline_index.timeline_page(cursor="garbage")
+
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_keyset_page_is_an_index_range(self, timeline_index, descending):
+        sql, params = KeywordIndex._timeline_query(
+            None, None, 50, "processing_time", after=("2026-01-03", 5), descending=descending
+        )
+        plan = " | ".join(
+            r[3] for r in timeline_index.conn.execute("EXPLAIN QUERY PLAN " + sql, params)
+        )
+        assert "SEARCH memories USING INDEX idx_memories_timestamp" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestTagsAndMoods:
+    @pytest.fixture
+    def tagged_index(self, keyword_index):
+        keyword_index.index(
+            "Họp dự án X",
+            "2026-02-20",
+            "2026-02-20T09:00",
+            mood="stressed",
+            tags=["công việc", "họp"],
+        )
+        keyword_index.index_many(
+            [
+                {
+                    "content": "Ăn phở với Linh",
+                    "date": "2026-02-20",
+                    "timestamp": "2026-02-20T19:00",
+                    "mood": "happy",
+                    "tags": ["bạn bè"],
+                },
+                {
+                    "content": "Review code dự án X",
+                    "date": "2026-02-21",
+                    "timestamp": "2026-02-21T10:00",
+                    "mood": "stressed",
+                    "tags": ["công việc"],
+                },
+                {
+                    "content": "Đi dạo một mình",
+                    "date": "2026-02-22",
+                    "timestamp": "2026-02-22T07:00",
+                },
+            ]
+        )
+        return keyword_index
+
+    def test_memory_tags_maintained_on_insert(self, tagged_index):
+        rows = tagged_index.conn.execute(
+            "SELECT tag, COUNT(*) FROM memory_tags GROUP BY tag ORDER BY tag"
+        ).fetchall()
+        assert rows == [("bạn bè", 1), ("công việc", 2), ("họp", 1)]
+
+    def test_search_filters(self, tagged_index):
+        assert [r.content for r in tagged_index.search("dự án", tags=["họp"])] == ["Họp dự án X"]
+        assert len(tagged_index.search("dự án", tags=["công việc", "bạn bè"])) == 2
+        assert tagged_index.search("dự án", tags=["bạn bè"]) == []
+        hits = bm25_search(tagged_index, "dự án", mood="stressed", date_from="2026-02-21")
+        assert [r.content for r in hits] == ["Review code dự án X"]
+
+    def test_timeline_filters(self, tagged_index):
+        entries = tagged_index.get_timeline(tags=["công việc"])
+        assert [e["text"] for e in entries] == ["Họp dự án X", "Review code dự án X"]
+        streamed = tagged_index.iter_timeline(mood="happy")
+        assert [e["text"] for e in streamed] == ["Ăn phở với Linh"]
+
+    def test_filter_hashes(self, tagged_index):
+        import hashlib
+
+        hashes = [
+            hashlib.sha256(t.encode()).hexdigest()
+            for t in ("Họp dự án X", "Ăn phở với Linh", "Đi dạo một mình")
+        ]
+        assert tagged_index.filter_hashes(hashes, tags=["họp"]) == {hashes[0]}
+        assert tagged_index.filter_hashes(hashes, mood="happy") == {hashes[1]}
+        assert tagged_index.filter_hashes(hashes) == set(hashes)
+
+    def test_facet_counts(self, tagged_index):
+        counts = tagged_index.facet_counts()
+        assert counts["tags"] == [("công việc", 2), ("bạn bè", 1), ("họp", 1)]
+        assert counts["moods"] == [("stressed", 2), ("happy", 1)]
+        ranged = tagged_index.facet_counts(start_date="2026-02-21", limit=1)
+        assert ranged == {"tags": [("công việc", 1)], "moods": [("stressed", 1)]}
+
+    def test_tag_filter_is_an_index_lookup(self, tagged_index):
+        sql, params = KeywordIndex._timeline_query(
+            None, None, 50, "processing_time", tags=["công việc"], mood="stressed"
+        )
+        plan = " | ".join(
+            r[3] for r in tagged_index.conn.execute("EXPLAIN QUERY PLAN " + sql, params)
+        )
+        assert "SEARCH memory_tags USING PRIMARY KEY (tag=?)" in plan
+
+    def test_migration_backfills_existing_tags(self, tmp_path):
+        import sqlite3
+
+        db = tmp_path / "v1.db"
+        idx = KeywordIndex(db)
+        idx.index("Họp dự án X", "2026-02-20", "t1", tags=["công việc"])
+        idx.close()
+        # Roll the file back to schema 1: no memory_tags table or triggers
+        conn = sqlite3.connect(db)
+        conn.executescript(
+            "DROP TRIGGER memories_tags_ai; DROP TRIGGER memories_tags_ad; "
+            "DROP TABLE memory_tags; PRAGMA user_version = 1;"
+        )
+        conn.close()
+
+        idx = KeywordIndex(db)
+        assert idx.facet_counts()["tags"] == [("công việc", 1)]
+        idx.close()
@@ -0,0 +1,55 @@
+"""Tests for concurrent search-leg fan-out."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kioku.search.fanout import fan_out
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=4)
+    yield pool
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class TestFanOut:
+    def test_collects_all_legs_in_order(self, executor):
+        legs = {"bm25": lambda: [1], "vector": lambda: [2], "graph": lambda: [3]}
+        results = fan_out(executor, legs)
+        assert list(results) == ["bm25", "vector", "graph"]
+        assert results == {"bm25": [1], "vector": [2], "graph": [3]}
+
+    def test_legs_run_concurrently(self, executor):
+        def slow():
+            time.sleep(0.2)
+            return ["x"]
+
+        started = time.monotonic()
+        results = fan_out(executor, {"a": slow, "b": slow, "c": slow})
+        assert time.monotonic() - started < 0.5
+        assert all(r == ["x"] for r in results.values())
+
+    def test_slow_leg_dropped(self, executor):
+        def slow():
+            time.sleep(1.0)
+            return ["late"]
+
+        started = time.monotonic()
+        results = fan_out(executor, {"fast": lambda: ["ok"], "slow": slow}, timeouts={"slow": 0.1})
+        assert time.monotonic() - started < 0.5
+        assert results == {"fast": ["ok"], "slow": []}
+
+    def test_failed_leg_dropped(self, executor):
+        def boom():
+            raise RuntimeError("backend down")
+
+        results = fan_out(executor, {"ok": lambda: ["ok"], "broken": boom})
+        assert results == {"ok": ["ok"], "broken": []}
+
+    def test_accepts_already_submitted_future(self, executor):
+        started_leg = executor.submit(lambda: ["speculative"])
+        results = fan_out(executor, {"early": started_leg, "late": lambda: ["late"]})
+        assert results == {"early": ["speculative"], "late": ["late"]}
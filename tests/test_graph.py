@@ -2,8 +2,13 @@
 
 import pytest
 from kioku.pipeline.extractor import FakeExtractor, Entity, Relationship, ExtractionResult
-from kioku.pipeline.graph_writer import InMemoryGraphStore
+from kioku.pipeline.graph_writer import (
+    CanonicalEntitySnapshot,
+    FalkorGraphStore,
+    InMemoryGraphStore,
+)
 from kioku.search.graph import graph_search
+from kioku.search.recognizer import EntityRecognizer
 
 
 @pytest.fixture
@@ -103,10 +108,62 @@ class TestInMemoryGraphStore:
         results = populated_graph.search_entities("xyznonexistent")
         assert len(results) == 0
 
+    def test_search_entities_many(self, populated_graph):
+        results = populated_graph.search_entities_many(["hùng", "Stressed", "xyz"])
+        assert [n.name for n in results["hùng"]] == ["Hùng"]
+        assert [n.name for n in results["Stressed"]] == ["stressed"]
+        assert results["xyz"] == []
+
+    def test_search_entities_word_boundary_ranking(self, graph_store):
+        graph_store.upsert(
+            ExtractionResult(entities=[Entity(name="Sinh nhật", type="EVENT")] * 3),
+            date="2026-02-22",
+            timestamp="t1",
+        )
+        graph_store.upsert(
+            ExtractionResult(entities=[Entity(name="Nhật Bản", type="PLACE")]),
+            date="2026-02-22",
+            timestamp="t1",
+        )
+        # "Sinh nhật" has more mentions but "Nhật Bản" is a word-boundary (starts-with) match
+        assert [n.name for n in graph_store.search_entities("Nhật")] == ["Nhật Bản", "Sinh nhật"]
+
     def test_traverse(self, populated_graph):
         result = populated_graph.traverse("Hùng", max_hops=2)
         assert len(result.nodes) >= 1
 
+    def test_traverse_date_range(self, graph_store):
+        for date, evidence in [("2026-01-05", "Jan"), ("2026-02-10", "Feb")]:
+            graph_store.upsert(
+                ExtractionResult(
+                    entities=[
+                        Entity(name="Hùng", type="PERSON"),
+                        Entity(name="vui", type="EMOTION"),
+                    ],
+                    relationships=[
+                        Relationship(
+                            source="Hùng", target="vui", rel_type="EMOTIONAL", evidence=evidence
+                        )
+                    ],
+                ),
+                date=date,
+                timestamp="",
+            )
+        result = graph_store.traverse("Hùng", date_from="2026-02-01", date_to="2026-02-28")
+        assert [e.evidence for e in result.edges] == ["Feb"]
+        assert result.edges[0].event_time == "2026-02-10"
+
+    def test_traverse_many_per_seed(self, populated_graph):
+        results = populated_graph.traverse_many(["Hùng", "Linh", "nobody"])
+        assert set(results) == {"Hùng", "Linh", "nobody"}
+        assert results["Hùng"].edges == populated_graph.traverse("Hùng").edges
+        assert results["nobody"].edges == []
+
+    def test_traverse_follows_aliases(self, populated_graph):
+        populated_graph.merge_entity_aliases("Hùng", ["sếp"])
+        via_alias = populated_graph.traverse("sếp")
+        assert any(e.source == "Hùng" for e in via_alias.edges)
+
     def test_find_path_connected(self, graph_store):
         extraction = ExtractionResult(
             entities=[
@@ -146,6 +203,205 @@ class TestGraphSearch:
             assert results[0].source == "graph"
             assert results[0].score > 0
 
+    def test_graph_search_single_traversal_call(self, populated_graph, monkeypatch):
+        calls = []
+        original = populated_graph.traverse_many
+
+        def counting(seeds, **kwargs):
+            calls.append(list(seeds))
+            return original(seeds, **kwargs)
+
+        monkeypatch.setattr(populated_graph, "traverse_many", counting)
+        graph_search(populated_graph, "Hùng Linh Minh stressed", limit=5)
+        assert len(calls) == 1
+        assert len(calls[0]) >= 2
+
+    def test_graph_search_single_entity_lookup(self, populated_graph, monkeypatch):
+        calls = []
+        original = populated_graph.search_entities_many
+
+        def counting(terms, **kwargs):
+            calls.append(list(terms))
+            return original(terms, **kwargs)
+
+        monkeypatch.setattr(populated_graph, "search_entities_many", counting)
+        graph_search(populated_graph, "Hùng và Linh đi ăn phở ở quận một", limit=5)
+        assert len(calls) == 1
+        assert "hùng" in calls[0] and "linh" in calls[0]
+
     def test_graph_search_empty(self, graph_store):
         results = graph_search(graph_store, "nothinghere", limit=5)
         assert len(results) == 0
+
+
+class _StubFalkorGraph:
+    """Records Cypher queries; answers the canonical-entity scan with fixed rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries: list[str] = []
+
+    def query(self, cypher, params=None):
+        self.queries.append(cypher)
+        rows = self.rows if "collect(alias.name)" in cypher else []
+        return type("Result", (), {"result_set": rows})()
+
+
+class TestCanonicalEntitySnapshot:
+    def test_top_orders_by_mentions(self):
+        snap = CanonicalEntitySnapshot()
+        snap.load(
+            [
+                {"name": "Linh", "type": "PERSON", "mentions": 2, "aliases": []},
+                {"name": "Hùng", "type": "PERSON", "mentions": 5, "aliases": []},
+            ]
+        )
+        assert [e["name"] for e in snap.top(10)] == ["Hùng", "Linh"]
+        assert [e["name"] for e in snap.top(1)] == ["Hùng"]
+
+    def test_apply_extraction(self):
+        snap = CanonicalEntitySnapshot()
+        snap.load([{"name": "Hùng", "type": "PERSON", "mentions": 1, "aliases": []}])
+        snap.apply_extraction(
+            ExtractionResult(
+                entities=[
+                    Entity(name="Hùng", type="PERSON"),
+                    Entity(name="Mai", type="PERSON"),
+                ]
+            )
+        )
+        top = {e["name"]: e["mentions"] for e in snap.top(10)}
+        assert top == {"Hùng": 2, "Mai": 1}
+
+    def test_names_differing_in_case_are_separate_nodes(self):
+        snap = CanonicalEntitySnapshot()
+        snap.load(
+            [
+                {"name": "Hùng", "type": "PERSON", "mentions": 3, "aliases": []},
+                {"name": "hùng", "type": "PERSON", "mentions": 1, "aliases": []},
+            ]
+        )
+        snap.apply_extraction(ExtractionResult(entities=[Entity(name="hùng", type="PERSON")]))
+        top = {e["name"]: e["mentions"] for e in snap.top(10)}
+        assert top == {"Hùng": 3, "hùng": 2}
+
+    def test_apply_aliases(self):
+        snap = CanonicalEntitySnapshot()
+        snap.load([{"name": "Mẹ", "type": "PERSON", "mentions": 3, "aliases": []}])
+        snap.apply_aliases("Mẹ", ["mom", "Mẹ"])
+        rows = {e["name"]: e for e in snap.top(10)}
+        assert rows["Mẹ"]["aliases"] == ["mom"]
+        assert "mom" in rows
+
+    def test_top_returns_copies(self):
+        snap = CanonicalEntitySnapshot()
+        snap.load([{"name": "A", "type": "", "mentions": 1, "aliases": []}])
+        snap.top(1)[0]["aliases"].append("x")
+        assert snap.top(1)[0]["aliases"] == []
+
+    def test_falkor_store_scans_once(self):
+        store = FalkorGraphStore()
+        stub = _StubFalkorGraph([["Hùng", "PERSON", 4, []]])
+        store._graph = stub
+
+        store.get_canonical_entities(limit=50)
+        store.get_canonical_entities(limit=10)
+        store.upsert(
+            ExtractionResult(entities=[Entity(name="Mai", type="PERSON")]),
+            date="2026-02-22",
+            timestamp="",
+        )
+        entities = store.get_canonical_entities(limit=50)
+
+        scans = [q for q in stub.queries if "collect(alias.name)" in q]
+        assert len(scans) == 1
+        assert [e["name"] for e in entities] == ["Hùng", "Mai"]
+
+
+class TestFalkorSearchEntitiesMany:
+    def test_hits_are_keyed_by_the_callers_term(self):
+        class _EchoGraph:
+            """Returns one hit per term, keyed by the term exactly as sent."""
+
+            def __init__(self):
+                self.params = None
+
+            def query(self, cypher, params=None):
+                self.params = params
+                rows = [[t, [["Đà Lạt", "PLACE", 2, "", ""]]] for t in params["terms"]]
+                return type("Result", (), {"result_set": rows})()
+
+        store = FalkorGraphStore()
+        store._graph = _EchoGraph()
+        results = store.search_entities_many(["ĐÀ LẠT", "Đà Lạt", "ĐÀ LẠT"])
+
+        assert store._graph.params["terms"] == ["ĐÀ LẠT", "Đà Lạt"]
+        assert [n.name for n in results["ĐÀ LẠT"]] == ["Đà Lạt"]
+        assert [n.name for n in results["Đà Lạt"]] == ["Đà Lạt"]
+
+
+class TestFalkorTraverseMany:
+    def test_paths_are_bounded_per_start_before_collect(self):
+        class _TraverseGraph:
+            def __init__(self):
+                self.cypher = ""
+                self.params = None
+
+            def query(self, cypher, params=None):
+                self.cypher, self.params = cypher, params
+                hit = [
+                    "Linh",
+                    "PERSON",
+                    ["KNOWS"],
+                    [0.8],
+                    ["Hùng quen Linh"],
+                    ["h1"],
+                    ["2026-02-01"],
+                ]
+                return type("Result", (), {"result_set": [["Hùng", "Hùng", "PERSON", [hit]]]})()
+
+        store = FalkorGraphStore()
+        store._graph = _TraverseGraph()
+        results = store.traverse_many(["Hùng", "Mai"], limit=7)
+
+        cypher = store._graph.cypher
+        # LIMIT applies inside the per-start subquery, so paths beyond it are never built
+        assert cypher.index("CALL {") < cypher.index("LIMIT $limit") < cypher.index("collect(hit)")
+        assert store._graph.params["limit"] == 7
+        assert [e.target for e in results["Hùng"].edges] == ["Linh"]
+        assert results["Hùng"].edges[0].source_hash == "h1"
+        assert results["Mai"].edges == []
+
+
+class TestEntityRecognizer:
+    @pytest.fixture
+    def recognizer(self):
+        return EntityRecognizer(
+            [
+                {"name": "Nhật Bản", "type": "PLACE", "aliases": ["Japan"]},
+                {"name": "Hùng", "type": "PERSON", "aliases": ["sếp Hùng"]},
+                {"name": "Sinh nhật", "type": "EVENT", "aliases": []},
+                {"name": "anh", "type": "PERSON", "aliases": []},
+            ]
+        )
+
+    def test_matches_whole_words(self, recognizer):
+        assert recognizer.match("Chuyến đi Nhật Bản năm ngoái") == ["Nhật Bản"]
+
+    def test_no_partial_word_match(self, recognizer):
+        # "Hùngg" must not match "Hùng"; bare "nhật" must not match either multi-word entity
+        assert recognizer.match("Hùngg nhật") == []
+
+    def test_alias_maps_to_canonical(self, recognizer):
+        assert recognizer.match("Japan trip with boss") == ["Nhật Bản"]
+
+    def test_longest_match_wins(self, recognizer):
+        assert recognizer.match("tiệc sinh nhật của sếp Hùng") == ["Sinh nhật", "Hùng"]
+
+    def test_decomposed_unicode(self, recognizer):
+        import unicodedata
+
+        assert recognizer.match(unicodedata.normalize("NFD", "gặp Hùng")) == ["Hùng"]
+
+    def test_stopword_entities_ignored(self, recognizer):
+        assert recognizer.match("anh ấy đâu rồi") == []
@@ -0,0 +1,76 @@
+"""Tests for search response shaping."""
+
+import json
+
+import pytest
+
+from kioku.search.output import OutputSpec, ResponseBudget, snippet, to_json, trim_to_budget
+
+
+class TestOutputSpec:
+    def test_detail_levels(self):
+        assert OutputSpec("ids").result_fields == ("id", "date", "score", "source")
+        assert "ranks" not in OutputSpec("snippet").result_fields
+        assert "ranks" in OutputSpec("full").result_fields
+
+    def test_fields_projection_keeps_detail_order(self):
+        spec = OutputSpec("full", fields=("score", "content"))
+        assert spec.result_fields == ("content", "score")
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            OutputSpec("everything")
+        with pytest.raises(ValueError):
+            OutputSpec("ids", fields=("content",))
+
+    def test_snippet_cuts_at_word_boundary(self):
+        text = "Hôm nay họp với sếp Hùng về dự án X rất lâu"
+        short = snippet(text, 20)
+        assert short == "Hôm nay họp với sếp…"
+        assert snippet("ngắn", 20) == "ngắn"
+        assert OutputSpec("full").text(text) == text
+
+
+class TestResponseBudget:
+    def test_unlimited(self):
+        budget = ResponseBudget()
+        assert all(budget.admit({"x": "y" * 1000}) for _ in range(100))
+        assert not budget.truncated
+
+    def test_stops_at_limit(self):
+        item = {"content": "phở"}
+        size = len(json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode()) + 1
+        budget = ResponseBudget(max_bytes=size * 2 + 5)
+        budget.reserve({"a": 1})  # 7 bytes
+        assert budget.admit(item)
+        assert not budget.admit(item)
+        assert budget.truncated
+        assert not budget.admit({})  # nothing is admitted after the first refusal
+
+
+class TestTrimToBudget:
+    def _response(self):
+        return {
+            "count": 3,
+            "results": [{"content": "phở " * 10} for _ in range(3)],
+            "graph_context": {"nodes": [{"name": "Hùng"}], "evidence": [{"e": "x" * 40}]},
+        }
+
+    def test_within_budget_untouched(self):
+        response = self._response()
+        assert trim_to_budget(response, 10_000) == self._response()
+        assert trim_to_budget(response, None) == self._response()
+
+    def test_drops_lowest_priority_first(self):
+        full = self._response()
+        cap = len(to_json(full).encode()) - 20
+        trimmed = trim_to_budget(self._response(), cap)
+        assert len(to_json(trimmed).encode()) <= cap
+        assert trimmed["truncated"] is True
+        assert trimmed["graph_context"]["evidence"] == []
+        assert trimmed["results"] == full["results"]  # evidence alone made room
+
+    def test_keeps_count_in_step(self):
+        trimmed = trim_to_budget(self._response(), 120)
+        assert len(to_json(trimmed).encode()) <= 120
+        assert trimmed["count"] == len(trimmed["results"]) < 3
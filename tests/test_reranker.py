@@ -1,10 +1,13 @@
 """Tests for RRF reranker."""
 
 from kioku.search.bm25 import SearchResult
+from kioku.search.fusion import fuse
 from kioku.search.reranker import rrf_rerank
 
 
-def _make_result(content: str, score: float, source: str = "bm25") -> SearchResult:
+def _make_result(
+    content: str, score: float, source: str = "bm25", content_hash: str = ""
+) -> SearchResult:
     return SearchResult(
         content=content,
         date="2026-02-22",
@@ -12,6 +15,7 @@ def _make_result(content: str, score: float, source: str = "bm25") -> SearchResu
         timestamp="2026-02-22T12:00:00+07:00",
         score=score,
         source=source,
+        content_hash=content_hash,
     )
 
 
@@ -48,3 +52,45 @@ class TestRRFRerank:
     def test_empty_input(self):
         ranked = rrf_rerank([], limit=5)
         assert ranked == []
+
+
+class TestFuse:
+    def test_merges_graph_snippet_with_full_hit_by_hash(self):
+        bm25 = [_make_result("Full memory text about Hùng", 1.0, "bm25", "h1")]
+        graph = [
+            _make_result("Other", 0.9, "graph", "h2"),
+            _make_result("Hùng → stressed", 0.8, "graph", "h1"),
+        ]
+        fused = fuse({"bm25": bm25, "graph": graph}, limit=5)
+        assert [r.content_hash for r in fused] == ["h1", "h2"]
+        assert fused[0].content == "Full memory text about Hùng"  # first leg's copy wins
+        assert fused[0].ranks == {"bm25": 1, "graph": 2}
+
+    def test_inputs_not_mutated(self):
+        bm25 = [_make_result("A", 0.9, "bm25", "a")]
+        fused = fuse({"bm25": bm25}, limit=5)
+        assert bm25[0].score == 0.9 and bm25[0].ranks == {}
+        assert fused[0] is not bm25[0]
+
+    def test_weights(self):
+        bm25 = [_make_result("A", 0.9, "bm25", "a")]
+        vector = [_make_result("B", 0.9, "vector", "b")]
+        assert fuse({"bm25": bm25, "vector": vector}, weights={"vector": 2.0})[0].content == "B"
+        only = fuse({"bm25": bm25, "vector": vector}, weights={"bm25": 0})
+        assert [r.content for r in only] == ["B"]
+
+    def test_large_candidate_lists_top_k(self):
+        legs = {
+            leg: [
+                _make_result(f"D{(i * step) % 500}", 0.0, leg, f"h{(i * step) % 500}")
+                for i in range(500)
+            ]
+            for leg, step in (("bm25", 1), ("vector", 7), ("graph", 13))
+        }
+        fused = fuse(legs, limit=10)
+        scores = {}
+        for results in legs.values():
+            for rank, r in enumerate(results, start=1):
+                scores[r.content_hash] = scores.get(r.content_hash, 0) + 1 / (60 + rank)
+        expected = sorted(scores, key=lambda h: -scores[h])[:10]
+        assert [r.content_hash for r in fused] == expected
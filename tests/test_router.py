@@ -0,0 +1,61 @@
+"""Tests for the adaptive query router."""
+
+from kioku.search.bm25 import SearchResult
+from kioku.search.router import bm25_margin, leg_hit_stats, route_query
+
+
+def _hit(score: float, content_hash: str = "", ranks: dict | None = None) -> SearchResult:
+    return SearchResult(
+        content=f"doc {content_hash}",
+        date="2026-02-22",
+        mood="",
+        timestamp="",
+        score=score,
+        source="bm25",
+        content_hash=content_hash,
+        ranks=ranks or {},
+    )
+
+
+class TestRouteQuery:
+    def test_margin(self):
+        assert bm25_margin([]) == 0.0
+        assert bm25_margin([_hit(1.0)]) == 1.0
+        assert bm25_margin([_hit(1.0), _hit(0.3)]) == 0.7
+
+    def test_entities_run_everything(self):
+        route = route_query("Hùng", [_hit(1.0)], ["Hùng"], temporal=False)
+        assert route.name == "entity"
+        assert route.legs == ("bm25", "vector", "graph")
+
+    def test_decisive_keyword_lookup(self):
+        route = route_query("Kioku v2", [_hit(1.0), _hit(0.2)], None, temporal=False)
+        assert route.name == "keyword"
+        assert route.legs == ("bm25",)
+
+    def test_single_hit_is_not_decisive(self):
+        route = route_query("keychron", [_hit(1.0)], None, temporal=False)
+        assert route.name == "full"
+        assert route.legs == ("bm25", "vector", "graph")
+
+    def test_close_scores_or_long_query_run_full(self):
+        close = route_query("phở", [_hit(1.0), _hit(0.9)], None, temporal=False)
+        long = route_query(
+            "what did I do last weekend with friends", [_hit(1.0), _hit(0.1)], None, False
+        )
+        assert close.name == long.name == "full"
+
+    def test_no_hits_falls_back(self):
+        assert route_query("cảm giác", [], None, temporal=False).name == "full"
+        assert route_query("tháng 3 năm 2024", [], None, temporal=True).legs == ("bm25", "vector")
+
+
+class TestLegHitStats:
+    def test_counts_contributions(self):
+        fused = [_hit(0.1, "a", {"bm25": 1, "vector": 2}), _hit(0.05, "b", {"vector": 1})]
+        stats = leg_hit_stats({"bm25": [_hit(1.0, "a")], "vector": fused, "graph": []}, fused)
+        assert stats == {
+            "bm25": {"hits": 1, "in_top": 1},
+            "vector": {"hits": 2, "in_top": 2},
+            "graph": {"hits": 0, "in_top": 0},
+        }
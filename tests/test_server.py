@@ -9,6 +9,7 @@ from kioku.pipeline.embedder import FakeEmbedder
 from kioku.pipeline.vector_writer import VectorStore
 from kioku.pipeline.extractor import FakeExtractor
 from kioku.pipeline.graph_writer import InMemoryGraphStore
+from kioku.search.cache import TTLCache
 
 
 @pytest.fixture(autouse=True)
@@ -62,6 +63,9 @@ def setup_test_env(tmp_path, monkeypatch):
     monkeypatch.setattr(svc, "vector_store", test_store)
     monkeypatch.setattr(svc, "graph_store", test_graph)
     monkeypatch.setattr(svc, "extractor", test_extractor)
+    monkeypatch.setattr(svc, "_query_entity_cache", TTLCache())
+    monkeypatch.setattr(svc, "_search_cache", TTLCache(maxsize=0))
+    monkeypatch.setattr(svc, "_recognizer", None)
 
     yield
 
@@ -133,6 +137,551 @@ class TestSearchWithEntitiesTool:
 from kioku import server as server_module
 
 
+class _CountingLLMExtractor(FakeExtractor):
+    """FakeExtractor plus a stub Anthropic client that answers the search prompt."""
+
+    model = "stub"
+
+    def __init__(self, answer: str):
+        self.calls = 0
+        outer = self
+
+        class _Messages:
+            def create(self, **kwargs):
+                outer.calls += 1
+                block = type("Block", (), {"text": answer})()
+                return type("Resp", (), {"content": [block]})()
+
+        self.client = type("Client", (), {"messages": _Messages()})()
+
+
+class TestQueryEntityCache:
+    @pytest.fixture(autouse=True)
+    def llm_mode(self, monkeypatch):
+        monkeypatch.setattr(server_module._svc.settings, "query_entity_mode", "llm")
+
+    def test_repeated_query_hits_cache(self, monkeypatch):
+        extractor = _CountingLLMExtractor('["Hùng"]')
+        monkeypatch.setattr(server_module._svc, "extractor", extractor)
+
+        first = search_memories("Hùng dạo này thế nào?")
+        second = search_memories("  hùng dạo này   thế nào? ")
+        assert extractor.calls == 1
+        assert first["entities_used"] == second["entities_used"] == ["Hùng"]
+
+    def test_graph_upsert_invalidates(self, monkeypatch):
+        extractor = _CountingLLMExtractor('["Hùng"]')
+        monkeypatch.setattr(server_module._svc, "extractor", extractor)
+
+        search_memories("Hùng")
+        save_memory("Hùng gọi điện hỏi dự án")  # upserts entities → graph version bump
+        search_memories("Hùng")
+        assert extractor.calls >= 2
+
+
+class TestLocalEntityRecognition:
+    def test_hybrid_local_match_skips_llm(self, monkeypatch):
+        save_memory("Hùng gọi điện hỏi dự án, stressed")
+        extractor = _CountingLLMExtractor('["Hùng"]')
+        monkeypatch.setattr(server_module._svc, "extractor", extractor)
+
+        result = search_memories("dạo này hùng thế nào")
+        assert result["entities_used"] == ["Hùng"]
+        assert extractor.calls == 0
+
+    def test_hybrid_falls_back_to_llm(self, monkeypatch):
+        extractor = _CountingLLMExtractor('["Mai"]')
+        monkeypatch.setattr(server_module._svc, "extractor", extractor)
+
+        result = search_memories("cô ấy thế nào")
+        assert result["entities_used"] == ["Mai"]
+        assert extractor.calls == 1
+
+    def test_local_mode_never_calls_llm(self, monkeypatch):
+        extractor = _CountingLLMExtractor('["Mai"]')
+        monkeypatch.setattr(server_module._svc, "extractor", extractor)
+        monkeypatch.setattr(server_module._svc.settings, "query_entity_mode", "local")
+
+        result = search_memories("cô ấy thế nào")
+        assert result["entities_used"] == []
+        assert extractor.calls == 0
+
+
+class TestSpeculativeLegs:
+    def test_vector_leg_overlaps_extraction_and_is_reused(self, monkeypatch):
+        import time
+
+        svc = server_module._svc
+        save_memory("Hùng làm tôi stressed vì deadline")
+        events = []
+
+        class _SlowExtractor(_CountingLLMExtractor):
+            def __init__(self):
+                super().__init__('["Hùng"]')
+                create = self.client.messages.create
+
+                def slow_create(**kwargs):
+                    time.sleep(0.2)
+                    events.append("llm")
+                    return create(**kwargs)
+
+                self.client.messages.create = slow_create
+
+        monkeypatch.setattr(svc, "extractor", _SlowExtractor())
+        monkeypatch.setattr(svc.settings, "query_entity_mode", "llm")
+        original = svc.vector_store.search
+
+        def recording_search(*args, **kwargs):
+            events.append("vector")
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(svc.vector_store, "search", recording_search)
+
+        result = search_memories("anh ấy dạo này thế nào")
+        assert result["entities_used"] == ["Hùng"]
+        assert events == ["vector", "llm"]  # one vector search, started before extraction returned
+
+    def test_disabled_waits_for_extraction(self, monkeypatch):
+        svc = server_module._svc
+        monkeypatch.setattr(svc.settings, "search_speculative", False)
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        result = search_memories("phở")
+        assert result["count"] >= 1
+
+
+class TestSearchDeadline:
+    def test_no_deadline_reports_nothing(self):
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        assert "skipped" not in search_memories("phở")
+
+    def test_spent_budget_degrades_to_bm25(self):
+        save_memory("Hùng làm tôi stressed vì deadline")
+        result = search_memories("Hùng deadline", entities=["Hùng"], deadline_ms=0)
+        assert result["count"] >= 1
+        assert all(r["source"] == "bm25" for r in result["results"])
+        assert result["skipped"] == ["vector", "graph", "graph_context"]
+        assert "graph_context" not in result
+
+    def test_slow_extraction_cut_short(self, monkeypatch):
+        import time
+
+        svc = server_module._svc
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        extractor = _CountingLLMExtractor('["Minh"]')
+        create = extractor.client.messages.create
+        extractor.client.messages.create = lambda **kw: time.sleep(0.5) or create(**kw)
+        monkeypatch.setattr(svc, "extractor", extractor)
+        monkeypatch.setattr(svc.settings, "query_entity_mode", "llm")
+
+        started = time.monotonic()
+        result = search_memories("phở", deadline_ms=200)
+        assert time.monotonic() - started < 0.45
+        assert "entity_extraction" in result["skipped"]
+        assert result["entities_used"] == []
+        assert result["count"] >= 1
+
+    def test_generous_budget_skips_nothing(self):
+        save_memory("Hùng làm tôi stressed vì deadline")
+        result = search_memories("Hùng", entities=["Hùng"], deadline_ms=60_000)
+        assert result["skipped"] == []
+        assert "graph_context" in result
+
+
+class TestSingleFlightTools:
+    def test_concurrent_identical_searches_coalesce(self, monkeypatch):
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        svc = server_module._svc
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        calls = []
+        original = svc.search_memories
+
+        def slow_search(*args, **kwargs):
+            calls.append(1)
+            time.sleep(0.2)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(svc, "search_memories", slow_search)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: search_memories("phở"), range(4)))
+        assert len(calls) == 1
+        assert all(r["count"] == results[0]["count"] >= 1 for r in results)
+
+
+class TestSearchMemoriesMany:
+    def test_batch_matches_single_searches(self):
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        save_memory("Họp team buổi sáng về sprint mới")
+        queries = ["phở", "sprint"]
+        batch = server_module.search_memories_many(queries, limit=5)
+        assert batch["count"] == 2
+        for query, result in zip(queries, batch["searches"]):
+            single = search_memories(query, limit=5)
+            assert result["query"] == query
+            assert [r["content"] for r in result["results"]] == [
+                r["content"] for r in single["results"]
+            ]
+
+    def test_one_embedding_and_hydration_pass(self, monkeypatch):
+        svc = server_module._svc
+        save_memory("Hùng làm tôi stressed vì deadline")
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        embeds, hydrations = [], []
+        embedder = svc.vector_store.embedder
+        original_batch, original_hydrate = embedder.embed_batch, svc.keyword_index.get_by_hashes
+        monkeypatch.setattr(
+            embedder, "embed_batch", lambda t: embeds.append(t) or original_batch(t)
+        )
+        monkeypatch.setattr(svc.vector_store, "search", lambda *a, **k: pytest.fail("unbatched"))
+        monkeypatch.setattr(
+            svc.keyword_index,
+            "get_by_hashes",
+            lambda h: hydrations.append(h) or original_hydrate(h),
+        )
+
+        batch = svc.search_memories_many(["Hùng", "phở", "deadline"])
+        assert len(embeds) == 1 and len(hydrations) == 1
+        assert batch["searches"][0]["entities_used"] == ["Hùng"]
+        assert "graph_context" in batch["searches"][0]
+
+    def test_entities_resolved_concurrently(self, monkeypatch):
+        import threading
+
+        svc = server_module._svc
+        queries = ["Hùng", "phở", "deadline"]
+        # Passes only if every query's resolution is in flight at the same time
+        barrier = threading.Barrier(len(queries), timeout=5)
+        resolved = []
+
+        def resolve(query):
+            barrier.wait()
+            resolved.append(query)
+            return None
+
+        monkeypatch.setattr(svc, "_resolve_query_entities", resolve)
+        batch = svc.search_memories_many(queries)
+        assert batch["count"] == 3
+        assert sorted(resolved) == sorted(queries)
+
+    def test_empty_queries(self):
+        assert server_module.search_memories_many(["", "  "]) == {"count": 0, "searches": []}
+
+
+class TestSearchRouter:
+    @pytest.fixture(autouse=True)
+    def router_on(self, monkeypatch):
+        monkeypatch.setattr(server_module._svc.settings, "search_router", True)
+
+    def test_keyword_lookup_skips_vector_and_graph(self, monkeypatch):
+        svc = server_module._svc
+        save_memory("Mua bàn phím keychron mới: keychron K2, switch keychron brown")
+        save_memory(
+            "Hôm nay đi làm, họp cả ngày, tối về đi chợ mua rau, dọn nhà, gọi cho mẹ, "
+            "xem phim, nhắc mua keychron cho em trai, rồi đi ngủ sớm"
+        )
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        monkeypatch.setattr(svc.vector_store, "search", lambda *a, **k: pytest.fail("vector ran"))
+        monkeypatch.setattr(
+            svc.graph_store, "traverse_many", lambda *a, **k: pytest.fail("graph ran")
+        )
+
+        result = search_memories("keychron")
+        assert result["route"] == "keyword"
+        assert "keychron" in result["results"][0]["content"]
+
+    def test_single_incidental_hit_runs_all_legs(self):
+        save_memory("Hôm nay mua bàn phím keychron mới")
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        result = search_memories("keychron")
+        assert result["route"] == "full"
+
+    def test_entity_query_runs_all_legs(self):
+        save_memory("Hùng làm tôi stressed vì deadline")
+        result = search_memories("Hùng", entities=["Hùng"])
+        assert result["route"] == "entity"
+        assert "graph_context" in result
+
+
+class TestResolveAndSearch:
+    def test_returns_only_used_entities(self, monkeypatch):
+        save_memory("Hùng làm tôi stressed vì deadline")
+        save_memory("Đi ăn phở với Minh")
+        extractor = _CountingLLMExtractor('["Minh"]')
+        monkeypatch.setattr(server_module._svc, "extractor", extractor)
+
+        result = server_module.resolve_and_search("dạo này hùng thế nào")
+        assert extractor.calls == 0  # resolved by the local matcher
+        assert result["entities_used"] == ["Hùng"]
+        assert [e["name"] for e in result["entities"]] == ["Hùng"]
+        assert result["entities"][0]["mentions"] >= 1
+        assert "graph_context" in result
+
+    def test_no_entities(self, monkeypatch):
+        monkeypatch.setattr(server_module._svc.settings, "query_entity_mode", "local")
+        save_memory("Đi ăn phở với bạn ở quận 1")
+        result = server_module.resolve_and_search("phở")
+        assert result["entities"] == []
+        assert result["count"] >= 1
+
+
+class TestSearchOutputShaping:
+    def test_ids_skip_hydration_and_graph_context(self, monkeypatch):
+        svc = server_module._svc
+        save_memory("Hùng làm tôi stressed vì deadline")
+        monkeypatch.setattr(svc.keyword_index, "get_by_hashes", lambda h: pytest.fail("hydrated"))
+        result = search_memories("Hùng", entities=["Hùng"], detail="ids")
+        assert result["count"] >= 1
+        assert set(result["results"][0]) == {"id", "date", "score", "source"}
+        assert "graph_context" not in result
+
+    def test_snippet_and_fields(self, monkeypatch):
+        monkeypatch.setattr(server_module._svc.settings, "search_snippet_chars", 20)
+        save_memory("Đi ăn phở với bạn Minh ở quận 1, trời mưa nhưng vẫn vui")
+        result = search_memories("phở", detail="snippet", fields=["content"])
+        assert result["results"][0] == {"content": "Đi ăn phở với bạn…"}
+
+    def test_max_bytes_enforced(self):
+        import json
+
+        for i in range(10):
+            save_memory(f"Ghi chú số {i} về chuyện đi ăn phở cùng đồng nghiệp " + "x" * 200)
+        full = search_memories("phở", limit=10)
+        capped = search_memories("phở", limit=10, max_bytes=1200)
+        assert capped["truncated"] is True
+        assert 0 < capped["count"] < full["count"]
+        assert len(json.dumps(capped, ensure_ascii=False).encode()) <= 1200
+        assert [r["id"] for r in capped["results"]] == [
+            r["id"] for r in full["results"][: capped["count"]]
+        ]
+
+    def test_max_bytes_covers_keys_added_after_assembly(self):
+        from kioku.search.output import to_json
+
+        for i in range(8):
+            save_memory(f"Hùng rủ đi ăn phở lần {i}, kể chuyện dự án " + "x" * 150)
+        for cap in range(400, 2000, 150):
+            responses = [
+                search_memories("Hùng phở", max_bytes=cap, deadline_ms=60_000),
+                search_memories("Hùng phở", max_bytes=cap, paginate=True),
+                server_module.resolve_and_search("dạo này hùng thế nào", max_bytes=cap),
+            ]
+            for response in responses:
+                assert len(to_json(response).encode()) <= cap
+                assert response["count"] == len(response["results"])
+
+
+class TestBm25SnippetLeg:
+    def test_results_carry_full_text(self, monkeypatch):
+        svc = server_module._svc
+        monkeypatch.setattr(svc.settings, "search_bm25_snippet_tokens", 4)
+        body = "Sáng nay " + "trời rất đẹp " * 40 + "và tôi mua bàn phím cơ mới"
+        save_memory(body)
+        seen = []
+        original = svc.keyword_index.search
+        monkeypatch.setattr(
+            svc.keyword_index,
+            "search",
+            lambda *a, **kw: seen.append(kw.get("snippet_tokens")) or original(*a, **kw),
+        )
+        result = search_memories("bàn phím")
+        assert seen and all(t == 4 for t in seen)
+        assert result["results"][0]["content"] == body
+
+
+class TestPagedSearch:
+    def _save_many(self, n=12):
+        for i in range(n):
+            save_memory(f"Ghi chú {i}: đi ăn phở với đồng nghiệp ở quán số {i}")
+
+    def test_pages_cover_ranking_without_rerunning_legs(self, monkeypatch):
+        svc = server_module._svc
+        self._save_many()
+        first = search_memories("phở", limit=5, paginate=True)
+        assert first["count"] == 5 and first["next_cursor"]
+
+        monkeypatch.setattr(
+            svc.keyword_index, "search", lambda *a, **kw: pytest.fail("legs re-ran")
+        )
+        seen = [r["id"] for r in first["results"]]
+        cursor = first["next_cursor"]
+        while cursor:
+            page = search_memories("phở", limit=5, cursor=cursor)
+            assert "graph_context" not in page
+            seen += [r["id"] for r in page["results"]]
+            cursor = page["next_cursor"]
+        assert len(seen) == len(set(seen)) >= 12
+
+    def test_first_page_matches_plain_search(self):
+        self._save_many()
+        plain = search_memories("phở", limit=5)
+        paged = search_memories("phở", limit=5, paginate=True)
+        assert [r["id"] for r in paged["results"]] == [r["id"] for r in plain["results"]]
+
+    def test_cursor_is_stable_across_writes(self):
+        self._save_many()
+        first = search_memories("phở", limit=5, paginate=True)
+        before = search_memories("phở", limit=5, cursor=first["next_cursor"])
+        save_memory("Một bát phở mới toanh hôm nay")
+        after = search_memories("phở", limit=5, cursor=first["next_cursor"])
+        assert [r["id"] for r in after["results"]] == [r["id"] for r in before["results"]]
+
+    def test_max_bytes_resumes_after_last_returned(self):
+        self._save_many()
+        full = search_memories("phở", limit=10, paginate=True)
+        capped = search_memories("phở", limit=10, paginate=True, max_bytes=900)
+        assert capped["truncated"] and 0 < capped["count"] < 10
+        nxt = search_memories("phở", limit=1, cursor=capped["next_cursor"])
+        assert nxt["results"][0]["id"] == full["results"][capped["count"]]["id"]
+
+    def test_unknown_cursor(self):
+        with pytest.raises(ValueError):
+            search_memories("phở", cursor="nope.5")
+
+
+class TestTagAndMoodFilters:
+    def _save(self):
+        save_memory("Linh rủ đi ăn phở cuối tuần", mood="happy", tags=["bạn bè"])
+        save_memory("Linh trình bày dự án trong buổi họp", mood="stressed", tags=["công việc"])
+        save_memory("Linh gửi báo cáo dự án", mood="focused", tags=["công việc"])
+
+    def test_save_indexes_tags_in_sqlite(self):
+        self._save()
+        svc = server_module._svc
+        assert svc.keyword_index.facet_counts()["tags"] == [("công việc", 2), ("bạn bè", 1)]
+
+    def test_search_filters_every_leg_and_graph_evidence(self):
+        self._save()
+        result = search_memories("Linh", entities=["Linh"], tags=["công việc"])
+        texts = [r["content"] for r in result["results"]]
+        assert texts and all("phở" not in t for t in texts)
+        evidence = result.get("graph_context", {}).get("evidence", [])
+        assert all("phở" not in e["evidence"] for e in evidence)
+
+        by_mood = search_memories("dự án", mood="focused")
+        assert [r["content"] for r in by_mood["results"]] == ["Linh gửi báo cáo dự án"]
+
+    def test_timeline_and_facets_tools(self):
+        self._save()
+        timeline = server_module.get_timeline(tags=["bạn bè"])
+        assert [e["text"] for e in timeline["timeline"]] == ["Linh rủ đi ăn phở cuối tuần"]
+
+        facets = server_module.list_facets()
+        assert facets["tags"][0] == {"tag": "công việc", "count": 2}
+        assert {m["mood"] for m in facets["moods"]} == {"happy", "stressed", "focused"}
+
+
+class TestSearchContextMemo:
+    def test_enrichment_reuses_graph_leg_traversal(self, monkeypatch):
+        save_memory("Hùng làm tôi stressed vì deadline")
+        graph = server_module._svc.graph_store
+        calls = []
+        original = graph.traverse_many
+
+        def counting(seeds, **kwargs):
+            calls.append(list(seeds))
+            return original(seeds, **kwargs)
+
+        monkeypatch.setattr(graph, "traverse_many", counting)
+        result = search_memories("Hùng", entities=["Hùng"])
+        assert len(calls) == 1
+        assert result["graph_context"]["nodes"]
+
+    @pytest.mark.parametrize("limit", [2, 10])
+    def test_temporal_enrichment_reuses_dated_traversal(self, monkeypatch, limit):
+        save_memory("Hùng làm tôi stressed vì deadline")
+        graph = server_module._svc.graph_store
+        calls = []
+        original = graph.traverse_many
+
+        def counting(seeds, **kwargs):
+            calls.append(kwargs)
+            return original(seeds, **kwargs)
+
+        monkeypatch.setattr(graph, "traverse_many", counting)
+        search_memories("Hùng năm 2026", entities=["Hùng"], limit=limit)
+        assert len(calls) == 1
+        assert (calls[0]["date_from"], calls[0]["date_to"]) == ("2026-01-01", "2026-12-31")
+
+    def test_entity_search_hydrates_once(self, monkeypatch):
+        save_memory("Hùng làm tôi stressed vì deadline")
+        save_memory("Hùng mời đi ăn trưa, happy")
+        index = server_module._svc.keyword_index
+        calls = []
+        original = index.get_by_hashes
+        monkeypatch.setattr(index, "get_by_hashes", lambda h: calls.append(h) or original(h))
+
+        result = search_memories("Hùng", entities=["Hùng"])
+        assert result["count"] >= 1
+        assert len(calls) == 1
+
+    def test_hydration_skips_known_hashes(self, monkeypatch):
+        from kioku.search.context import SearchContext
+
+        save_memory("Đi ăn phở với bạn Minh")
+        index = server_module._svc.keyword_index
+        row = index.conn.execute("SELECT content_hash FROM memories LIMIT 1").fetchone()
+        ctx = SearchContext(server_module._svc.graph_store, index)
+        calls = []
+        original = index.get_by_hashes
+        monkeypatch.setattr(index, "get_by_hashes", lambda h: calls.append(h) or original(h))
+
+        first = ctx.get_by_hashes([row[0], "missing"])
+        second = ctx.get_by_hashes([row[0], "missing"])
+        assert first == second and row[0] in first
+        assert calls == [[row[0], "missing"]]
+
+
+class TestSearchResponseCache:
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, monkeypatch):
+        svc = server_module._svc
+        monkeypatch.setattr(svc, "_search_cache", TTLCache(maxsize=16, ttl=60))
+        self.calls = 0
+        original = svc._search_memories
+
+        def counting(*args, **kwargs):
+            self.calls += 1
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(svc, "_search_memories", counting)
+
+    def test_repeated_search_served_from_cache(self):
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        first = search_memories("phở")
+        first["results"].clear()  # callers get a copy, not the cached object
+        second = search_memories("phở")
+        assert self.calls == 1
+        assert second["count"] >= 1 and second["results"]
+
+    def test_budgeted_and_unbudgeted_searches_cached_separately(self):
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        budgeted = search_memories("phở", deadline_ms=60_000)
+        plain = search_memories("phở")
+        assert self.calls == 2
+        assert budgeted["skipped"] == []
+        assert "skipped" not in plain
+        assert search_memories("phở", deadline_ms=30_000)["skipped"] == []
+        assert self.calls == 2
+
+    def test_save_invalidates(self):
+        save_memory("Đi ăn phở với bạn Minh ở quận 1")
+        search_memories("phở")
+        save_memory("Phở bò buổi sáng")
+        result = search_memories("phở")
+        assert self.calls == 2
+        assert result["count"] >= 2
+
+    def test_write_from_other_process_invalidates(self):
+        svc = server_module._svc
+        search_memories("phở")
+        other = KeywordIndex(svc.settings.sqlite_path)  # e.g. the CLI
+        other.index(content="Phở gà", date="2026-02-22", timestamp="t1")
+        other.close()
+        search_memories("phở")
+        assert self.calls == 2
+
+
 class TestTimelineAndPatternsTools:
     def test_get_timeline(self, setup_test_env):
         server_module.save_memory("First event", mood="neutral", tags=["test1"])
@@ -148,6 +697,19 @@ class TestTimelineAndPatternsTools:
         # Phase 7: event_time field should be present
         assert "event_time" in timeline[-1]
 
+    def test_get_timeline_cursor(self, setup_test_env):
+        for i in range(5):
+            server_module.save_memory(f"Event {i}")
+
+        first = server_module.get_timeline(limit=3)
+        assert [e["text"] for e in first["timeline"]] == ["Event 2", "Event 3", "Event 4"]
+        older = server_module.get_timeline(limit=3, cursor=first["next_cursor"])
+        assert [e["text"] for e in older["timeline"]] == ["Event 0", "Event 1"]
+        assert older["next_cursor"] is None
+
+        streamed = list(server_module._svc.iter_timeline())
+        assert [e["text"] for e in streamed] == [f"Event {i}" for i in range(5)]
+
     def test_get_timeline_sort_by_event_time(self, setup_test_env):
         """Timeline can be sorted by event_time instead of processing_time."""
         # Save entries — FakeExtractor doesn't produce event_time, so field will be empty
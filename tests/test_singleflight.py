@@ -0,0 +1,59 @@
+"""Tests for singleflight coalescing of concurrent identical calls."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kioku.singleflight import SingleFlight
+
+
+def _burst(flight, key, fn, n=5):
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(flight.do, key, fn) for _ in range(n)]
+        return [f.result() for f in futures]
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"results": [1, 2]}
+
+        results = _burst(flight, "k", slow)
+        assert len(calls) == 1
+        assert all(r == {"results": [1, 2]} for r in results)
+        assert len({id(r) for r in results}) == len(results)  # callers get their own copy
+        assert len(flight) == 0
+
+    def test_different_keys_run_separately(self):
+        flight = SingleFlight()
+        calls = []
+        barrier = threading.Barrier(2, timeout=2)
+
+        def fn(key):
+            calls.append(key)
+            barrier.wait()  # both must be running at once
+            return key
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            a = pool.submit(flight.do, "a", lambda: fn("a"))
+            b = pool.submit(flight.do, "b", lambda: fn("b"))
+            assert (a.result(), b.result()) == ("a", "b")
+        assert sorted(calls) == ["a", "b"]
+
+    def test_error_shared_and_not_remembered(self):
+        flight = SingleFlight()
+
+        def boom():
+            time.sleep(0.1)
+            raise RuntimeError("backend down")
+
+        with pytest.raises(RuntimeError):
+            _burst(flight, "k", boom)
+        assert flight.do("k", lambda: "ok") == "ok"
@@ -4,7 +4,7 @@ import uuid
 import pytest
 from kioku.pipeline.embedder import FakeEmbedder
 from kioku.pipeline.vector_writer import VectorStore
-from kioku.search.semantic import vector_search
+from kioku.search.semantic import vector_search, vector_search_many
 
 
 @pytest.fixture
@@ -89,6 +89,120 @@ class TestVectorStore:
     def test_count(self, populated_store):
         assert populated_store.count() == 6
 
+    def test_search_date_range(self, populated_store):
+        results = populated_store.search(
+            "dự án", limit=10, date_from="2026-02-21", date_to="2026-02-21"
+        )
+        assert len(results) == 2
+        assert all(r["date"] == "2026-02-21" for r in results)
+
+    def test_search_date_to_only(self, populated_store):
+        results = populated_store.search("dự án", limit=10, date_to="2026-02-20")
+        assert {r["date"] for r in results} == {"2026-02-20"}
+
+    def test_search_many_one_embed_batch(self, populated_store, monkeypatch):
+        calls = []
+        original = populated_store.embedder.embed_batch
+        monkeypatch.setattr(
+            populated_store.embedder, "embed_batch", lambda t: calls.append(t) or original(t)
+        )
+        queries = ["phở Linh", "gym tập", "dự án"]
+        batched = populated_store.search_many(queries, limit=3, date_from="2026-02-21")
+        assert calls == [queries]
+        assert len(batched) == 3
+        for query, hits in zip(queries, batched):
+            single = populated_store.search(query, limit=3, date_from="2026-02-21")
+            assert [h["content_hash"] for h in hits] == [h["content_hash"] for h in single]
+
+
+class TestVectorFacetFilters:
+    @pytest.fixture
+    def tagged_store(self, store):
+        store.add("Họp dự án X", "2026-02-20", "t1", mood="stressed", tags=["công việc", "họp"])
+        store.add("Ăn phở với Linh", "2026-02-20", "t2", mood="happy", tags=["bạn bè"])
+        store.add("Review code dự án X", "2026-02-21", "t3", mood="focused", tags=["công việc"])
+        return store
+
+    def test_tag_filter(self, tagged_store):
+        hits = tagged_store.search("dự án", limit=10, tags=["công việc"])
+        assert {h["content"] for h in hits} == {"Họp dự án X", "Review code dự án X"}
+        hits = tagged_store.search("dự án", limit=10, tags=["họp", "bạn bè"])
+        assert {h["content"] for h in hits} == {"Họp dự án X", "Ăn phở với Linh"}
+
+    def test_mood_and_date_combined(self, tagged_store):
+        hits = tagged_store.search(
+            "dự án", limit=10, tags=["công việc"], mood="focused", date_from="2026-02-21"
+        )
+        assert [h["content"] for h in hits] == ["Review code dự án X"]
+
+
+class TestMetadataBackfill:
+    def test_legacy_vectors_match_date_filters_after_reopen(self, embedder, tmp_path):
+        store = VectorStore(embedder=embedder, collection_name="legacy", persist_dir=tmp_path)
+        # A vector written before date_num existed
+        store.collection.add(
+            ids=["old"],
+            embeddings=[embedder.embed("Đi Đà Lạt")],
+            documents=["Đi Đà Lạt"],
+            metadatas=[{"date": "2025-05-01", "timestamp": "t", "mood": "", "tags": ""}],
+        )
+        assert store.search("Đà Lạt", date_from="2025-01-01", date_to="2025-12-31") == []
+
+        reopened = VectorStore(embedder=embedder, collection_name="legacy", persist_dir=tmp_path)
+        hits = reopened.search("Đà Lạt", date_from="2025-01-01", date_to="2025-12-31")
+        assert [h["content"] for h in hits] == ["Đi Đà Lạt"]
+        assert reopened._backfill_metadata() == 0  # already current
+
+    def test_legacy_vectors_match_tag_filters_after_reopen(self, embedder, tmp_path):
+        store = VectorStore(embedder=embedder, collection_name="legacy", persist_dir=tmp_path)
+        # Written after date_num but before per-tag flags existed
+        store.collection.add(
+            ids=["old"],
+            embeddings=[embedder.embed("Tập gym buổi sáng")],
+            documents=["Tập gym buổi sáng"],
+            metadatas=[
+                {
+                    "date": "2025-05-01",
+                    "date_num": 20250501,
+                    "meta_version": 1,
+                    "tags": "health,gym",
+                    "mood": "",
+                }
+            ],
+        )
+        assert store.search("gym", tags=["gym"]) == []
+
+        reopened = VectorStore(embedder=embedder, collection_name="legacy", persist_dir=tmp_path)
+        assert [h["content"] for h in reopened.search("gym", tags=["gym"])] == ["Tập gym buổi sáng"]
+        assert reopened.search("gym", tags=["work"]) == []
+        meta = reopened.collection.get(ids=["old"])["metadatas"][0]
+        assert meta["tags"] == "health,gym"  # stored fields are kept
+
+    def test_new_vectors_need_no_backfill(self, populated_store, monkeypatch):
+        calls = []
+        original = populated_store.collection.get
+        monkeypatch.setattr(
+            populated_store.collection, "get", lambda **k: calls.append(k) or original(**k)
+        )
+        assert populated_store._backfill_metadata() == 0
+        # A current collection costs one bounded probe, not a scan of every id
+        assert [k.get("limit") for k in calls] == [1]
+
+    def test_backfill_pages_through_stale_vectors(self, store, embedder, monkeypatch):
+        import kioku.pipeline.vector_writer as vector_writer
+
+        store.collection.add(
+            ids=[f"old{i}" for i in range(5)],
+            embeddings=[embedder.embed(f"Ngày {i}") for i in range(5)],
+            metadatas=[{"date": f"2025-05-0{i + 1}", "tags": "gym"} for i in range(5)],
+        )
+        monkeypatch.setattr(vector_writer, "_BACKFILL_BATCH", 2)
+        assert store._backfill_metadata() == 5
+        assert store._backfill_metadata() == 0
+        metas = store.collection.get(include=["metadatas"])["metadatas"]
+        assert sorted(m["date_num"] for m in metas) == [20250501 + i for i in range(5)]
+        assert all(m["tag_gym"] for m in metas)
+
 
 class TestSemanticSearch:
     def test_returns_search_results(self, populated_store):
@@ -101,3 +215,4 @@ class TestSemanticSearch:
         empty = VectorStore(embedder=embedder, collection_name=f"empty_{uuid.uuid4().hex[:8]}")
         results = vector_search(empty, "anything", limit=5)
         assert len(results) == 0
+        assert vector_search_many(empty, ["a", "b"], limit=5) == [[], []]